@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import io
 import re
 import json
 import base64
@@ -14,12 +15,17 @@ import yaml
 class AssetManager:
     """Handles asset discovery, processing, and embedding"""
     
-    def __init__(self, config, build_dir):
+    def __init__(self, config, output, source, transcode_cache=None, progress=print):
         self.config = config
-        self.build_dir = build_dir
+        # output/source are build_fs trees (on disk or in memory)
+        self.output = output
+        self.source = source
+        self.transcode_cache = transcode_cache
+        self.log = progress
         self.assets_collected = []
     
-    def process_slide_assets(self, slide_content, slide_file, output_mode='bundle'):
+    def process_slide_assets(self, slide_content, slide_file, output_mode='bundle',
+                             bundle_dir=Path("presentation_bundle")):
         """Find and process all assets referenced in a slide"""
         slide_assets = []
         
@@ -33,17 +39,22 @@ class AssetManager:
         for pattern, asset_type in patterns:
             for match in re.finditer(pattern, slide_content, re.IGNORECASE):
                 original_path_str = match.group(1)
+
+                # Remote and inline references are left alone
+                if '://' in original_path_str or original_path_str.startswith('data:'):
+                    continue
                 
                 # Resolve relative path from slide location
                 if original_path_str.startswith('/'):
-                    original_path = Path(original_path_str)
+                    original_path = self.source.resolve(original_path_str)
                 else:
-                    original_path = (slide_file.parent / original_path_str).resolve()
+                    original_path = self.source.resolve(slide_file.parent / original_path_str)
                 
-                if original_path.exists():
+                if self.source.exists(original_path):
                     # Process the asset
                     local_name = self._generate_asset_name(original_path, asset_type)
-                    processed_path = self._process_asset(original_path, local_name, asset_type, output_mode)
+                    processed_path = self._process_asset(original_path, local_name, asset_type, output_mode,
+                                                         bundle_dir)
                     
                     # Track asset info
                     asset_info = {
@@ -67,7 +78,7 @@ class AssetManager:
                             match.group(0).replace(original_path_str, new_ref)
                         )
                 else:
-                    print(f"   ⚠️  Asset not found: {original_path}")
+                    self.log(f"   ⚠️  Asset not found: {original_path}")
         
         return slide_content, slide_assets
     
@@ -95,58 +106,79 @@ class AssetManager:
         
         return base_name
     
-    def _process_asset(self, original_path, local_name, asset_type, output_mode):
+    def _process_asset(self, original_path, local_name, asset_type, output_mode,
+                       bundle_dir=Path("presentation_bundle")):
         """Process and copy an asset to the assets directory"""
         if output_mode == 'single':
             # For single file mode, we still need to process assets for embedding
             # but write to a temp location
-            temp_dir = self.build_dir / "temp_assets"
-            temp_dir.mkdir(parents=True, exist_ok=True)
-            output_path = temp_dir / local_name
+            output_path = Path("temp_assets") / local_name
         else:
-            assets_dir = self.build_dir / "presentation_bundle" / "assets"
-            assets_dir.mkdir(parents=True, exist_ok=True)
-            output_path = assets_dir / local_name
+            output_path = Path(bundle_dir) / "assets" / local_name
+
+        data = self.source.read_bytes(original_path)
         
         if asset_type == 'image':
             # Convert to WebP with optimization
             try:
-                with Image.open(original_path) as img:
-                    # Convert RGBA to RGB if necessary
-                    if img.mode in ('RGBA', 'LA', 'P'):
-                        background = Image.new('RGB', img.size, (255, 255, 255))
-                        if img.mode == 'P':
-                            img = img.convert('RGBA')
-                        background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
-                        img = background
-                    elif img.mode != 'RGB':
-                        img = img.convert('RGB')
-                    
-                    # Resize if too large
-                    max_width = self.config['build']['max_image_width']
-                    if img.width > max_width:
-                        height = int((max_width / img.width) * img.height)
-                        img = img.resize((max_width, height), Image.Resampling.LANCZOS)
-                        print(f"   🔄 Resized {original_path.name}: {img.width}x{img.height}")
-                    
-                    # Save as WebP
-                    img.save(output_path, 'WebP', quality=self.config['build']['webp_quality'], optimize=True)
-                    
-                    # Calculate compression ratio
-                    original_size = original_path.stat().st_size
-                    new_size = output_path.stat().st_size
-                    ratio = (1 - new_size/original_size) * 100
-                    print(f"   📸 {original_path.name} → {output_path.name} ({ratio:.1f}% smaller)")
-                    
+                if self.transcode_cache is not None:
+                    build_config = self.config['build']
+                    key = self.transcode_cache.key(
+                        data,
+                        webp_quality=build_config['webp_quality'],
+                        max_image_width=build_config['max_image_width']
+                    )
+                    webp_data, hit = self.transcode_cache.get_or_create(
+                        key, lambda: self._convert_to_webp(data, original_path)
+                    )
+                else:
+                    webp_data, hit = self._convert_to_webp(data, original_path), False
+
+                self.output.write_bytes(output_path, webp_data)
+                if hit:
+                    self.log(f"   ♻️  {original_path.name} → {output_path.name} (cached)")
+                else:
+                    ratio = (1 - len(webp_data)/len(data)) * 100
+                    self.log(f"   📸 {original_path.name} → {output_path.name} ({ratio:.1f}% smaller)")
             except Exception as e:
-                print(f"   ❌ Error processing {original_path}: {e}")
-                shutil.copy2(original_path, output_path.with_suffix(original_path.suffix))
+                self.log(f"   ❌ Error processing {original_path}: {e}")
+                self.output.write_bytes(output_path.with_suffix(original_path.suffix), data)
                 return output_path.with_suffix(original_path.suffix)
         else:
             # Copy data files as-is
-            shutil.copy2(original_path, output_path)
+            self.output.write_bytes(output_path, data)
             
         return output_path
+
+    @staticmethod
+    def flatten(img):
+        """RGB copy of an image, with any transparency composited onto white"""
+        if img.mode in ('RGBA', 'LA', 'P'):
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            if img.mode == 'P':
+                img = img.convert('RGBA')
+            background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
+            return background
+        if img.mode != 'RGB':
+            return img.convert('RGB')
+        return img
+
+    def _convert_to_webp(self, data, original_path):
+        """Convert image bytes to resized, optimized WebP bytes"""
+        with Image.open(io.BytesIO(data)) as img:
+            img = self.flatten(img)
+
+            # Resize if too large
+            max_width = self.config['build']['max_image_width']
+            if img.width > max_width:
+                height = int((max_width / img.width) * img.height)
+                img = img.resize((max_width, height), Image.Resampling.LANCZOS)
+                self.log(f"   🔄 Resized {original_path.name}: {img.width}x{img.height}")
+
+            # Save as WebP
+            buffer = io.BytesIO()
+            img.save(buffer, 'WebP', quality=self.config['build']['webp_quality'], optimize=True)
+            return buffer.getvalue()
     
     def embed_as_base64(self, template, assets):
         """Embed all assets as base64 data URLs"""
@@ -155,10 +187,9 @@ class AssetManager:
         for asset in assets:
             if asset['type'] == 'image' and asset['processed']:
                 processed_path = Path(asset['processed'])
-                if processed_path.exists():
+                if self.output.exists(processed_path):
                     try:
-                        with open(processed_path, 'rb') as f:
-                            image_data = f.read()
+                        image_data = self.output.read_bytes(processed_path)
                         b64_data = base64.b64encode(image_data).decode('utf-8')
                         data_url = f"data:image/webp;base64,{b64_data}"
 
@@ -181,9 +212,9 @@ class AssetManager:
 
                         new_result_len = len(result)
                         if new_result_len != old_result_len:
-                            print(f"   🔗 Embedded {processed_path.name} as base64 (+{new_result_len - old_result_len} bytes)")
+                            self.log(f"   🔗 Embedded {processed_path.name} as base64 (+{new_result_len - old_result_len} bytes)")
 
                     except Exception as e:
-                        print(f"   ❌ Failed to embed {processed_path}: {e}")
+                        self.log(f"   ❌ Failed to embed {processed_path}: {e}")
         
         return result
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Batch Builder for Presentation Build System
+Builds many decks concurrently, sharing one transcode cache between them
+"""
+
+import os
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from transcode_cache import TranscodeCache
+
+
+def resolve_deck(spec, out_root=None):
+    """Turn a config file or deck directory into (config_path, root, output_dir, name)"""
+    spec = Path(spec)
+    if spec.is_dir():
+        root = spec
+        config_path = spec / "config.yaml"
+        name = spec.resolve().name
+    else:
+        root = spec.parent
+        config_path = spec
+        # config.yaml takes its deck's directory name; config_talk.yaml keeps its own
+        name = root.resolve().name if spec.name == "config.yaml" else spec.stem
+
+    if out_root:
+        output_dir = Path(out_root) / name
+    elif spec.is_dir() or spec.name == "config.yaml":
+        output_dir = root / "docs"
+    else:
+        # Several configs can share a directory, so each gets its own docs-<name> beside docs/
+        # (not inside it, where the config.yaml deck's build would prune it as stale output)
+        output_dir = root / f"docs-{name}"
+    return config_path, root, output_dir, name
+
+
+def _build_deck(config_path, root, output_dir, cache_dir, perf_hud=False, only=None):
+    """Worker entry point - build one deck in its own process"""
+    from presentation_builder import PresentationBuilder
+
+    builder = PresentationBuilder(
+        config_path, root=root, output_dir=output_dir,
+        transcode_cache=TranscodeCache(cache_dir)
+    )
+    if perf_hud:
+        builder.config['build']['perf_hud'] = True
+    if only:
+        builder.select(only=only)
+    builder.build_all()
+    return builder.asset_manager.transcode_cache.hits, builder.asset_manager.transcode_cache.misses
+
+
+def build_batch(deck_specs, out_root=None, workers=None, cache_dir=".build_cache/transcode",
+                perf_hud=False, only=None):
+    """Build every deck across a process pool; returns the number of failed decks
+
+    perf_hud and only apply to every deck, as build.py's --perf-hud and --only do for one.
+    """
+    decks = [resolve_deck(spec, out_root) for spec in deck_specs]
+
+    # Decks sharing an output directory would also share its staging directory and race on it
+    by_output = {}
+    for _, _, output_dir, name in decks:
+        by_output.setdefault(output_dir.resolve(), []).append(name)
+    shared = [f"{output_dir} ({', '.join(names)})" for output_dir, names in by_output.items() if len(names) > 1]
+    if shared:
+        raise ValueError(f"Decks would share an output directory: {'; '.join(shared)}")
+
+    workers = workers or min(len(decks), os.cpu_count() or 1)
+    print(f"🔨 Building {len(decks)} decks with {workers} workers (cache: {cache_dir})")
+
+    failed = 0
+    hits = misses = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_build_deck, config_path, root, output_dir, cache_dir, perf_hud, only): (name, output_dir)
+            for config_path, root, output_dir, name in decks
+        }
+        for future in as_completed(futures):
+            name, output_dir = futures[future]
+            try:
+                deck_hits, deck_misses = future.result()
+                hits += deck_hits
+                misses += deck_misses
+                print(f"✅ {name} → {output_dir}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {name} failed: {e}")
+
+    print(f"\n📊 Batch Summary: {len(decks) - failed}/{len(decks)} decks built, "
+          f"{misses} images encoded, {hits} served from cache")
+    return failed
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for Presentation Build System
+Times the vectorized helpers against the naive Python loops they replace
+"""
+
+import sys
+import math
+import colorsys
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from collections import deque
+
+import numpy as np
+
+import circstats
+import circstream
+import geo_centroid
+import hue_lut
+import photo_scheduler
+import tz_tables
+from periodic import PeriodicArray
+
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register a benchmark under a name usable on the command line"""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def best_time(func, repeat=3):
+    """Best wall time of several runs, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func):
+    """Peak bytes allocated while func runs (NumPy buffers are traced too)"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def compare(rows, name, naive, vectorized, repeat=3):
+    """Append a (name, naive seconds, vectorized seconds) row"""
+    rows.append((name, best_time(naive, 1), best_time(vectorized, repeat)))
+
+
+def print_rows(title, rows):
+    print(f"\n⏱️  {title}")
+    print(f"   {'Benchmark':<34} {'Python':>10} {'NumPy':>10} {'Speedup':>9}")
+    for name, naive, vectorized in rows:
+        print(f"   {name:<34} {naive * 1000:>8.1f}ms {vectorized * 1000:>8.2f}ms {naive / vectorized:>8.0f}x")
+
+
+def _naive_mean(angles, k=1, weights=None):
+    sx = sy = total = 0.0
+    for i, t in enumerate(angles):
+        w = 1.0 if weights is None else weights[i]
+        sx += w * math.cos(k * t)
+        sy += w * math.sin(k * t)
+        total += w
+    return math.atan2(sy, sx) / k, math.hypot(sx, sy) / total
+
+
+def _naive_wrapped_diff(a, b):
+    out = []
+    for x, y in zip(a, b):
+        d = x - y
+        while d >= math.pi:
+            d -= 2 * math.pi
+        while d < -math.pi:
+            d += 2 * math.pi
+        out.append(d)
+    return out
+
+
+def _naive_unwrap(angles):
+    out = [angles[0]]
+    offset = 0.0
+    for prev, t in zip(angles, angles[1:]):
+        d = t - prev
+        if d > math.pi:
+            offset -= 2 * math.pi
+        elif d < -math.pi:
+            offset += 2 * math.pi
+        out.append(t + offset)
+    return out
+
+
+@benchmark('circstats')
+def bench_circstats(size, large):
+    rng = np.random.default_rng(0)
+    angles = rng.vonmises(0.5, 2.0, size)
+    other = rng.uniform(-np.pi, np.pi, size)
+    weights = rng.uniform(0, 1, size)
+    walk = circstats.wrap(np.cumsum(rng.normal(0, 0.4, size)))
+    as_list, other_list, walk_list, weight_list = angles.tolist(), other.tolist(), walk.tolist(), weights.tolist()
+
+    rows = []
+    compare(rows, "circular_mean", lambda: _naive_mean(as_list), lambda: circstats.circular_mean(angles))
+    compare(rows, "circular_mean (weighted)",
+            lambda: _naive_mean(as_list, weights=weight_list),
+            lambda: circstats.circular_mean(angles, weights=weights))
+    compare(rows, "harmonic_mean (k=2)", lambda: _naive_mean(as_list, 2), lambda: circstats.harmonic_mean(angles, 2))
+    compare(rows, "circular_std", lambda: math.sqrt(-2 * math.log(_naive_mean(as_list)[1])),
+            lambda: circstats.circular_std(angles))
+    compare(rows, "wrapped_diff", lambda: _naive_wrapped_diff(as_list, other_list),
+            lambda: circstats.wrapped_diff(angles, other))
+    compare(rows, "unwrap", lambda: _naive_unwrap(walk_list), lambda: circstats.unwrap(walk))
+    print_rows(f"circstats on {size:,} headings", rows)
+
+    # Large inputs: reductions stream through fixed-size scratch buffers
+    print(f"\n⏱️  circstats on {large:,} headings")
+    for dtype in (np.float32, np.float64):
+        big = rng.uniform(-np.pi, np.pi, large).astype(dtype)
+        big[::1000] = np.nan
+        seconds = best_time(lambda: circstats.circular_mean(big), 1)
+        peak = peak_memory(lambda: circstats.circular_mean(big))
+        print(f"   circular_mean {np.dtype(dtype).name:<8} {seconds * 1000:>8.0f}ms "
+              f"{large / seconds / 1e6:>7.0f}M angles/s   peak scratch {peak / 1e6:.1f}MB "
+              f"(input {big.nbytes / 1e6:.0f}MB)")
+
+
+def _naive_rolling_mean(angles, window):
+    window_cos, window_sin = deque(), deque()
+    sx = sy = 0.0
+    means = []
+    for t in angles:
+        c, s = math.cos(t), math.sin(t)
+        window_cos.append(c)
+        window_sin.append(s)
+        sx += c
+        sy += s
+        if len(window_cos) > window:
+            sx -= window_cos.popleft()
+            sy -= window_sin.popleft()
+        if len(window_cos) == window:
+            means.append(math.atan2(sy, sx))
+    return means
+
+
+@benchmark('circstream')
+def bench_circstream(size, large):
+    rng = np.random.default_rng(0)
+    headings = circstats.wrap(np.cumsum(rng.normal(0, 0.05, size)))
+    as_list = headings.tolist()
+    window = 1000
+
+    rows = []
+    compare(rows, f"rolling mean (window {window})", lambda: _naive_rolling_mean(as_list, window),
+            lambda: circstream.collect(circstream.rolling_circular_stats(
+                circstream.read_chunks(headings), window)))
+    print_rows(f"circstream on {size:,} headings", rows)
+
+    # A memory-mapped float32 log, aggregated to one row per window
+    print(f"\n⏱️  circstream on a {large:,} sample log")
+    with tempfile.TemporaryDirectory() as tmp:
+        log = Path(tmp) / "headings.npy"
+        np.save(log, circstats.wrap(np.cumsum(rng.normal(0, 0.05, large))).astype(np.float32))
+        seconds = best_time(lambda: circstream.aggregate_log(log, window), 1)
+        peak = peak_memory(lambda: circstream.aggregate_log(log, window))
+        print(f"   aggregate_log (window {window}) {seconds * 1000:>8.0f}ms "
+              f"{large / seconds / 1e6:>7.0f}M samples/s   peak memory {peak / 1e6:.1f}MB "
+              f"(log {log.stat().st_size / 1e6:.0f}MB)")
+
+
+def _slide_latlon_to_cartesian(lat, lon):
+    # As shown on slides/12-gis-demo.html
+    lat_rad = np.radians(lat)
+    lon_rad = np.radians(lon)
+    return np.array([np.cos(lat_rad) * np.cos(lon_rad), np.cos(lat_rad) * np.sin(lon_rad), np.sin(lat_rad)])
+
+
+def _slide_geographic_centroid(lat_lon_pairs):
+    cartesian_points = [_slide_latlon_to_cartesian(lat, lon) for lat, lon in lat_lon_pairs]
+    mean_cartesian = np.mean(cartesian_points, axis=0)
+    mean_cartesian /= np.linalg.norm(mean_cartesian)
+    return np.degrees(np.arcsin(mean_cartesian[2])), np.degrees(np.arctan2(mean_cartesian[1], mean_cartesian[0]))
+
+
+def _slide_group_centroids(lat, lon, groups):
+    by_group = {}
+    for la, lo, g in zip(lat, lon, groups):
+        by_group.setdefault(g, []).append((la, lo))
+    return {g: _slide_geographic_centroid(pairs) for g, pairs in by_group.items()}
+
+
+def _field_polygons(rng, size, groups):
+    """Points around field centers, a share of them straddling the antimeridian"""
+    group = rng.integers(0, groups, size)
+    center_lat = rng.uniform(-70, 70, groups)
+    center_lon = np.where(rng.random(groups) < 0.2, 180.0, rng.uniform(-180, 180, groups))
+    lat = center_lat[group] + rng.normal(0, 0.05, size)
+    lon = circstats.wrap(center_lon[group] + rng.normal(0, 0.05, size), -180, 360)
+    return lat, lon, group
+
+
+@benchmark('geo_centroid')
+def bench_geo_centroid(size, large):
+    rng = np.random.default_rng(0)
+    lat, lon, group = _field_polygons(rng, size, 1000)
+    lat_list, lon_list, group_list = lat.tolist(), lon.tolist(), group.tolist()
+
+    rows = []
+    compare(rows, "group centroids (1000 groups)", lambda: _slide_group_centroids(lat_list, lon_list, group_list),
+            lambda: geo_centroid.group_centroids(lat, lon, group))
+    print_rows(f"geo_centroid on {size:,} points (slide list comprehension vs vectorized)", rows)
+
+    print(f"\n⏱️  geo_centroid on a {large:,} row memory-mapped table")
+    with tempfile.TemporaryDirectory() as tmp:
+        table = np.zeros(large, dtype=[('lat', 'f4'), ('lon', 'f4'), ('group', 'i4')])
+        table['lat'], table['lon'], table['group'] = _field_polygons(rng, large, 100_000)
+        path = Path(tmp) / "fields.npy"
+        np.save(path, table)
+        del table
+        seconds = best_time(lambda: geo_centroid.centroids_from_log(path), 1)
+        peak = peak_memory(lambda: geo_centroid.centroids_from_log(path))
+        print(f"   centroids_from_log (100k groups) {seconds * 1000:>8.0f}ms "
+              f"{large / seconds / 1e6:>7.1f}M rows/s   peak memory {peak / 1e6:.1f}MB "
+              f"(table {path.stat().st_size / 1e6:.0f}MB)")
+
+
+@benchmark('periodic')
+def bench_periodic(size, large):
+    rng = np.random.default_rng(0)
+    departures = rng.uniform(0, 24, size)
+    durations = rng.uniform(0, 30, size)
+    longitudes = rng.uniform(-180, 180, size)
+    dep_list, dur_list, lon_list = departures.tolist(), durations.tolist(), longitudes.tolist()
+
+    def naive_arrivals():
+        return [(d + t) % 24 for d, t in zip(dep_list, dur_list)]
+
+    def naive_gaps():
+        out = []
+        for a, b in zip(lon_list, lon_list[1:]):
+            d = (a - b + 180) % 360 - 180
+            out.append(d)
+        return out
+
+    def naive_interp():
+        out = []
+        for a, b in zip(lon_list, lon_list[1:]):
+            d = (b - a + 180) % 360 - 180
+            out.append((a + 0.5 * d + 180) % 360 - 180)
+        return out
+
+    times = PeriodicArray.time_of_day(departures)
+    lons = PeriodicArray.longitude(longitudes)
+    rows = []
+    compare(rows, "time of day + duration", naive_arrivals, lambda: times + durations)
+    compare(rows, "longitude steps", naive_gaps, lambda: lons.diff())
+    compare(rows, "longitude midpoints", naive_interp, lambda: lons[:-1].interp(lons[1:], 0.5))
+    compare(rows, "mean time of day", lambda: _naive_mean([t * math.pi / 12 for t in dep_list]),
+            lambda: times.mean())
+    print_rows(f"PeriodicArray on {size:,} values", rows)
+
+
+@benchmark('hue_lut')
+def bench_hue_lut(size, large):
+    rng = np.random.default_rng(0)
+    hues = rng.uniform(0, 360, size)
+    temperatures = rng.uniform(10, 45, size)
+    hue_list, temp_list = hues.tolist(), temperatures.tolist()
+    table = hue_lut.hue_lut(360)
+    thermal = hue_lut.colormap()
+
+    def naive_hsl():
+        return [colorsys.hls_to_rgb(h / 360, 0.5, 1.0) for h in hue_list]
+
+    def lut_hsl():
+        return table[np.rint(hues).astype(np.intp) % 360]
+
+    def naive_thermal():
+        # Per-pixel OKLCH conversion, no gamut mapping (cheaper than the real thing)
+        out = []
+        for value in temp_list:
+            t = (value - 10) / 35
+            h = math.radians(260 + t * 160)
+            l, c = 0.25 + 0.7 * t, 0.14
+            a, b = c * math.cos(h), c * math.sin(h)
+            l_ = (l + 0.3963377774 * a + 0.2158037573 * b) ** 3
+            m_ = (l - 0.1055613458 * a - 0.0638541728 * b) ** 3
+            s_ = (l - 0.0894841775 * a - 1.2914855480 * b) ** 3
+            out.append((4.0767416621 * l_ - 3.3077115913 * m_ + 0.2309699292 * s_,
+                        -1.2684380046 * l_ + 2.6097574011 * m_ - 0.3413193965 * s_,
+                        -0.0041960863 * l_ - 0.7034186147 * m_ + 1.7076147010 * s_))
+        return out
+
+    rows = []
+    compare(rows, "hsl per pixel vs LUT", naive_hsl, lut_hsl)
+    compare(rows, "thermal colormap", naive_thermal, lambda: hue_lut.apply_colormap(temperatures, thermal, 10, 45))
+    compare(rows, "360 x 256 oklch gradients",
+            lambda: [hue_lut.gradient(h, h + 180, 256, "oklch") for h in range(360)],
+            lambda: hue_lut.gradient(np.arange(360), np.arange(360) + 180, 256, "oklch"), repeat=1)
+    print_rows(f"Hue tables on {size:,} pixels", rows)
+
+
+def _slide_find_optimal_window(arrival, windows):
+    """findOptimalWindow() from js/flight-photo-window.js for one flight"""
+    def embed(hours):
+        theta = 2 * math.pi * hours / 24 - math.pi / 2
+        return math.cos(theta), math.sin(theta)
+
+    best, shortest = None, 24
+    naive, naive_wait = None, 24
+    for i, (start, end) in enumerate(windows):
+        center = (start + end) / 2
+        if center > arrival and center - arrival < naive_wait:
+            naive, naive_wait = i, center - arrival
+    if naive is None:
+        naive, naive_wait = 0, (windows[0][0] + windows[0][1]) / 2 + 24 - arrival
+    for i, (start, end) in enumerate(windows):
+        (x1, y1), (x2, y2) = embed(arrival), embed((start + end) / 2)
+        distance = math.acos(max(-1, min(1, x1 * x2 + y1 * y2))) * 12 / math.pi
+        if distance < shortest:
+            best, shortest = i, distance
+    return best, shortest, naive, naive_wait
+
+
+@benchmark('photo_scheduler')
+def bench_photo_scheduler(size, large):
+    rng = np.random.default_rng(0)
+    arrivals = rng.uniform(0, 24, size)
+    starts = np.sort(rng.uniform(0, 20, (500, 6)), axis=1)
+    ends = starts + rng.uniform(0.5, 3, starts.shape)
+    sites = rng.integers(0, len(starts), size)
+    arrival_list, site_list = arrivals.tolist(), sites.tolist()
+    site_windows = [list(zip(s, e)) for s, e in zip(starts.tolist(), ends.tolist())]
+    shared = site_windows[0]
+
+    rows = []
+    compare(rows, "shared windows, per flight", lambda: [_slide_find_optimal_window(a, shared) for a in arrival_list],
+            lambda: photo_scheduler.schedule(arrivals, starts[0], ends[0]))
+    compare(rows, "per-site windows, per flight",
+            lambda: [_slide_find_optimal_window(a, site_windows[s]) for a, s in zip(arrival_list, site_list)],
+            lambda: photo_scheduler.schedule(arrivals, starts, ends, sites))
+    print_rows(f"Photo windows for {size:,} flights x 6 windows", rows)
+
+
+@benchmark('tz_tables')
+def bench_tz_tables(size, large):
+    from datetime import datetime
+    from zoneinfo import ZoneInfo
+
+    rng = np.random.default_rng(0)
+    start, end = datetime(2000, 1, 1).timestamp(), datetime(2040, 1, 1).timestamp()
+    utc = rng.integers(start, end, size)
+    utc_list = utc.tolist()
+    sydney, san_francisco = ZoneInfo("Australia/Sydney"), ZoneInfo("America/Los_Angeles")
+    tz_tables.zone_table("Australia/Sydney")
+    tz_tables.zone_table("America/Los_Angeles")
+
+    def naive_local():
+        return [datetime.fromtimestamp(t, sydney).replace(tzinfo=None) for t in utc_list]
+
+    def naive_convert():
+        return [datetime.fromtimestamp(t, sydney).replace(tzinfo=None).replace(tzinfo=sydney)
+                .astimezone(san_francisco).replace(tzinfo=None) for t in utc_list]
+
+    local = tz_tables.utc_to_local(utc, "Australia/Sydney")
+    rows = []
+    compare(rows, "UTC -> Sydney wall clock", naive_local, lambda: tz_tables.utc_to_local(utc, "Australia/Sydney"))
+    compare(rows, "Sydney -> San Francisco clocks", naive_convert,
+            lambda: tz_tables.convert(local, "Australia/Sydney", "America/Los_Angeles"))
+    print_rows(f"Time zone tables on {size:,} timestamps", rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized helpers")
+    parser.add_argument("names", nargs="*", metavar="NAME",
+                        help=f"Benchmarks to run (default all): {', '.join(sorted(BENCHMARKS))}")
+    parser.add_argument("--size", type=int, default=200_000, help="Elements for the loop comparisons")
+    parser.add_argument("--large", type=int, default=20_000_000, help="Elements for the large-array runs")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark: {', '.join(unknown)}")
+
+    for name in args.names or sorted(BENCHMARKS):
+        BENCHMARKS[name](args.size, args.large)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
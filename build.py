@@ -1,15 +1,75 @@
 import sys
+import json
+import argparse
+from pathlib import Path
 from presentation_builder import PresentationBuilder
+from batch_builder import build_batch
+from payload_report import BudgetExceededError
+from slide_processor import SlideSelectionError
+from runtime_report import RuntimeReport, TelemetryError
+from template_engine import TemplateError
+from tile_pack import TilePackError
 
 def main():
     """Main entry point for presentation builder"""
-    # Get config file from command line argument, default to config.yaml
-    config_file = sys.argv[1] if len(sys.argv) > 1 else "config.yaml"
+    parser = argparse.ArgumentParser(description="Build the presentation")
+    # Config file, default to config.yaml
+    parser.add_argument("config", nargs="?", default="config.yaml")
+    parser.add_argument("--batch", nargs="+", metavar="DECK",
+                        help="Build many decks concurrently (config files or deck directories)")
+    parser.add_argument("--out-root", help="Batch output root; each deck builds into OUT_ROOT/<deck name>")
+    parser.add_argument("--workers", type=int, help="Number of parallel deck builds")
+    parser.add_argument("--cache-dir", default=".build_cache/transcode",
+                        help="Transcode cache shared by all decks in a batch")
+    parser.add_argument("--perf-hud", action="store_true",
+                        help="Inject the runtime perf HUD (P key) and telemetry export, as build.perf_hud")
+    parser.add_argument("--slides", metavar="SELECTION",
+                        help="Build only these slides: positions, ranges or file names, e.g. 12-14 or "
+                             "18-flight-photo-window.html")
+    parser.add_argument("--only", nargs="+", choices=["single", "bundle", "demos"],
+                        help="Build only these outputs; other files in the output directory are kept")
+    parser.add_argument("--telemetry", nargs="+", metavar="FILE",
+                        help="Rank slides by the perf HUD telemetry JSON files instead of building")
+    parser.add_argument("--telemetry-out", metavar="FILE", help="Also write the aggregated telemetry report as JSON")
+    args = parser.parse_args()
+
+    if args.telemetry:
+        manifest = Path(args.config).parent / "docs" / "assets_manifest.json"
+        try:
+            report = RuntimeReport.from_files(args.telemetry, manifest)
+        except TelemetryError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        report.print_table(human_size=PresentationBuilder._human_size)
+        if args.telemetry_out:
+            Path(args.telemetry_out).write_text(json.dumps(report.to_json(), indent=2))
+            print(f"📋 Wrote {args.telemetry_out}")
+        return
+
+    if args.batch:
+        # Slide positions and file names belong to one deck, so a selection cannot apply to many
+        if args.slides:
+            parser.error("--slides selects slides of a single deck and cannot be combined with --batch")
+        try:
+            failed = build_batch(args.batch, out_root=args.out_root, workers=args.workers,
+                                 cache_dir=args.cache_dir, perf_hud=args.perf_hud, only=args.only)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        sys.exit(1 if failed else 0)
 
     # Build presentation using the full-featured builder with asset management
-    builder = PresentationBuilder(config_file)
-    builder.build_all()
+    builder = PresentationBuilder(args.config)
+    if args.perf_hud:
+        builder.config['build']['perf_hud'] = True
+    try:
+        if args.slides or args.only:
+            builder.select(slides=args.slides, only=args.only)
+        builder.build_all()
+    except (BudgetExceededError, TemplateError, SlideSelectionError, TilePackError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+In-Memory Build API for Presentation Build System
+Builds a deck from a directory or a virtual file mapping without writing to disk
+
+Usage:
+    from build_api import build_presentation
+
+    result = build_presentation(config, files={"slides/01-title.html": "<div class='slide'>...</div>"})
+    html_bytes = result.single_file
+    zip_bytes = result.bundle_zip
+"""
+
+import io
+import json
+import copy
+from build_fs import DiskFS, MemoryFS
+from transcode_cache import MemoryTranscodeCache
+from presentation_builder import PresentationBuilder
+
+
+# Shared by every call that doesn't bring its own cache; thread-safe and size-bounded
+_shared_transcode_cache = MemoryTranscodeCache()
+
+
+class BuildResult:
+    """Files produced by an in-memory build"""
+
+    def __init__(self, output):
+        # POSIX path (relative to the output root) -> bytes
+        self.files = dict(output.files_by_path)
+
+    @property
+    def single_file(self):
+        """The single-file HTML deck, or None if single_file is disabled"""
+        return self.files.get("index.html")
+
+    @property
+    def bundle_zip(self):
+        """presentation_bundle.zip, or None if bundle_folder is disabled"""
+        return self.files.get("presentation_bundle.zip")
+
+    @property
+    def bundle_files(self):
+        """Bundle folder contents keyed by their path inside the bundle"""
+        prefix = "presentation_bundle/"
+        return {path[len(prefix):]: data for path, data in self.files.items() if path.startswith(prefix)}
+
+    @property
+    def manifest(self):
+        data = self.files.get("assets_manifest.json")
+        return json.loads(data) if data else None
+
+    def open(self, path):
+        """Stream one output file"""
+        return io.BytesIO(self.files[path])
+
+
+def build_presentation(config, root=None, files=None, progress=None, transcode_cache=None):
+    """Build a deck entirely in memory and return a BuildResult
+
+    Pass either root (a deck directory: slides/, js/, styles.css ...) or files
+    (a mapping of relative path -> str/bytes). config is the parsed config.yaml
+    dict. Progress messages go to progress(message) instead of stdout. Safe to
+    call concurrently from several threads.
+    """
+    if (root is None) == (files is None):
+        raise ValueError("Pass exactly one of root or files")
+
+    source = DiskFS(root) if root is not None else MemoryFS(files)
+    output = MemoryFS()
+
+    builder = PresentationBuilder(
+        config=copy.deepcopy(config),
+        root=root if root is not None else ".",
+        source=source,
+        output=output,
+        transcode_cache=transcode_cache or _shared_transcode_cache,
+        progress=progress or (lambda message: None)
+    )
+    builder.build_all()
+    return BuildResult(output)
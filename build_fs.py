@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Build File Trees for Presentation Build System
+Lets the builder read sources and write outputs on disk or entirely in memory
+"""
+
+import fnmatch
+import posixpath
+from pathlib import Path, PurePosixPath
+
+
+class DiskFS:
+    """File tree rooted at a directory on disk"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def _path(self, path):
+        # Absolute paths (e.g. images referenced from outside the deck) pass straight through
+        return self.root / path
+
+    def resolve(self, path):
+        """Normalize a path so '..' segments are collapsed"""
+        return self._path(path).resolve()
+
+    def exists(self, path):
+        return self._path(path).is_file()
+
+    def read_bytes(self, path):
+        return self._path(path).read_bytes()
+
+    def read_text(self, path):
+        return self._path(path).read_text(encoding='utf-8')
+
+    def write_bytes(self, path, data):
+        full_path = self._path(path)
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_bytes(data)
+
+    def write_text(self, path, text):
+        self.write_bytes(path, text.encode('utf-8'))
+
+    def size(self, path):
+        return self._path(path).stat().st_size
+
+    def remove(self, path):
+        self._path(path).unlink()
+
+    def glob(self, directory, pattern):
+        """Files directly inside directory matching pattern"""
+        full_dir = self._path(directory)
+        if not full_dir.is_dir():
+            return []
+        return sorted(Path(directory) / p.name for p in full_dir.glob(pattern) if p.is_file())
+
+    def files(self, directory="."):
+        """All files below directory, recursively"""
+        full_dir = self._path(directory)
+        if not full_dir.is_dir():
+            return []
+        return sorted(Path(directory) / p.relative_to(full_dir) for p in full_dir.rglob('*') if p.is_file())
+
+
+class MemoryFS:
+    """File tree held in a dict of POSIX path -> bytes; nothing touches the disk"""
+
+    def __init__(self, files=None):
+        self.files_by_path = {}
+        for path, data in (files or {}).items():
+            if isinstance(data, str):
+                data = data.encode('utf-8')
+            self.write_bytes(path, data)
+
+    @staticmethod
+    def _key(path):
+        return posixpath.normpath(PurePosixPath(path).as_posix())
+
+    def resolve(self, path):
+        """Normalize a path so '..' segments are collapsed"""
+        return PurePosixPath(self._key(path))
+
+    def exists(self, path):
+        return self._key(path) in self.files_by_path
+
+    def read_bytes(self, path):
+        try:
+            return self.files_by_path[self._key(path)]
+        except KeyError:
+            raise FileNotFoundError(str(path)) from None
+
+    def read_text(self, path):
+        return self.read_bytes(path).decode('utf-8')
+
+    def write_bytes(self, path, data):
+        self.files_by_path[self._key(path)] = bytes(data)
+
+    def write_text(self, path, text):
+        self.write_bytes(path, text.encode('utf-8'))
+
+    def size(self, path):
+        return len(self.read_bytes(path))
+
+    def remove(self, path):
+        self.files_by_path.pop(self._key(path), None)
+
+    def glob(self, directory, pattern):
+        """Files directly inside directory matching pattern"""
+        prefix = self._key(directory) + '/'
+        return sorted(
+            PurePosixPath(key) for key in self.files_by_path
+            if key.startswith(prefix) and '/' not in key[len(prefix):]
+            and fnmatch.fnmatch(key[len(prefix):], pattern)
+        )
+
+    def files(self, directory="."):
+        """All files below directory, recursively"""
+        prefix = self._key(directory)
+        if prefix == '.':
+            return sorted(PurePosixPath(key) for key in self.files_by_path)
+        return sorted(PurePosixPath(key) for key in self.files_by_path if key.startswith(prefix + '/'))
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Bundle Packager for Presentation Build System
+Zips the bundle folder and optionally writes .gz/.br siblings for static hosting
+"""
+
+import io
+import os
+import gzip
+import struct
+import hashlib
+import zlib
+import zipfile
+from pathlib import PurePosixPath
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Formats that are already compressed - deflating them again only burns CPU
+STORED_SUFFIXES = {
+    '.webp', '.png', '.jpg', '.jpeg', '.gif', '.zip', '.gz', '.br',
+    '.woff', '.woff2', '.mp4', '.webm', '.mbtiles'
+}
+
+# Text formats that get .gz/.br siblings when precompression is enabled
+PRECOMPRESS_SUFFIXES = {'.html', '.js', '.css', '.json', '.svg', '.txt', '.md', '.csv'}
+
+# Fixed member timestamp so identical inputs always produce an identical archive
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# ZIP record layouts (APPNOTE 4.3.7, 4.3.12, 4.3.16)
+LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+END_RECORD = struct.Struct('<IHHHHIIH')
+ZIP_VERSION = 20
+# Made by Unix, so external_attr carries the file mode
+ZIP_MADE_BY = (3 << 8) | ZIP_VERSION
+UTF8_FLAG = 0x800
+ZIP32_LIMIT = 0xFFFFFFFF
+
+
+class BundlePackager:
+    """Builds presentation_bundle.zip with per-type compression and member reuse"""
+
+    def __init__(self, config, progress=print):
+        self.log = progress
+        build_config = config.get('build', {})
+        self.compress_level = build_config.get('zip_compress_level', 9)
+        self.workers = build_config.get('zip_workers') or min(8, os.cpu_count() or 1)
+        self.precompress = build_config.get('precompress') or []
+
+    def package(self, fs, bundle_dir, zip_path, previous_zip=None):
+        """Zip bundle_dir of a build_fs tree into zip_path
+
+        previous_zip holds the bytes of the last archive; members whose content
+        hash is unchanged are copied from it without recompressing.
+        """
+        files = [
+            f for f in fs.files(bundle_dir)
+            if PurePosixPath(f).suffix not in ('.gz', '.br')
+        ]
+        previous = self._read_previous_members(previous_zip)
+
+        # zlib and brotli release the GIL, so threads compress in parallel
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            members = list(pool.map(
+                lambda f: self._prepare_member(fs, f, bundle_dir, previous, previous_zip), files
+            ))
+
+        fs.write_bytes(zip_path, self._write_archive(members))
+
+        stored = sum(1 for m in members if m['info'].compress_type == zipfile.ZIP_STORED)
+        reused = sum(1 for m in members if m['reused'])
+        self.log(f"   🗜️  Zipped {len(members)} files ({stored} stored, {reused} reused from previous ZIP)")
+
+        if self.precompress:
+            self._write_precompressed(fs, members)
+
+        return zip_path
+
+    def _read_previous_members(self, previous_zip):
+        """Index the previous archive's members by name"""
+        if not previous_zip:
+            return {}
+        try:
+            with zipfile.ZipFile(io.BytesIO(previous_zip)) as zf:
+                return {info.filename: info for info in zf.infolist()}
+        except zipfile.BadZipFile:
+            return {}
+
+    def _prepare_member(self, fs, file, bundle_dir, previous, previous_zip):
+        """Compress (or reuse) one bundle file into a raw ZIP member"""
+        data = fs.read_bytes(file)
+        digest = hashlib.sha256(data).hexdigest()
+        arcname = PurePosixPath(file).relative_to(PurePosixPath(bundle_dir)).as_posix()
+
+        info = zipfile.ZipInfo(arcname, ZIP_DATE_TIME)
+        info.external_attr = 0o644 << 16
+        info.file_size = len(data)
+        stored_type = PurePosixPath(file).suffix.lower() in STORED_SUFFIXES
+        # The content hash and compression settings ride along in the member comment for
+        # the next build, so a changed zip_compress_level recompresses instead of reusing
+        level = 'stored' if stored_type else f"deflate-{self.compress_level}"
+        info.comment = f"{digest} {level}".encode('ascii')
+        member = {'info': info, 'path': file, 'data': data, 'reused': False}
+
+        old = previous.get(arcname)
+        if (old is not None and old.comment == info.comment and old.file_size == len(data)
+                and old.compress_type in ((zipfile.ZIP_STORED,) if stored_type
+                                          else (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED))):
+            info.compress_type = old.compress_type
+            info.CRC = old.CRC
+            info.compress_size = old.compress_size
+            member['raw'] = self._read_raw_member(previous_zip, old)
+            member['reused'] = True
+            return member
+
+        info.CRC = zlib.crc32(data)
+        raw = None
+        if not stored_type:
+            compressor = zlib.compressobj(self.compress_level, zlib.DEFLATED, -15)
+            raw = compressor.compress(data) + compressor.flush()
+            if len(raw) >= len(data):
+                raw = None
+
+        if raw is None:
+            info.compress_type = zipfile.ZIP_STORED
+            raw = data
+        else:
+            info.compress_type = zipfile.ZIP_DEFLATED
+        info.compress_size = len(raw)
+        member['raw'] = raw
+        return member
+
+    @staticmethod
+    def _read_raw_member(zip_data, info):
+        """Slice a member's compressed bytes out of the archive without decompressing them"""
+        offset = info.header_offset
+        name_len, extra_len = struct.unpack('<HH', zip_data[offset + 26:offset + 30])
+        start = offset + LOCAL_HEADER.size + name_len + extra_len
+        return zip_data[start:start + info.compress_size]
+
+    def _write_archive(self, members):
+        """Archive bytes from already-compressed members, written record by record"""
+        if (len(members) > 0xFFFF
+                or sum(len(m['raw']) + LOCAL_HEADER.size + 2 * len(m['info'].filename.encode('utf-8'))
+                       + CENTRAL_HEADER.size + len(m['info'].comment) for m in members) > ZIP32_LIMIT):
+            # Past ZIP32 limits: let zipfile write ZIP64 records, recompressing at the same level
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, 'w') as zf:
+                for member in members:
+                    info = member['info']
+                    zf.writestr(info, member['data'], compress_type=info.compress_type,
+                                compresslevel=self.compress_level)
+            return buffer.getvalue()
+
+        d = ZIP_DATE_TIME
+        dos_time = d[3] << 11 | d[4] << 5 | d[5] // 2
+        dos_date = (d[0] - 1980) << 9 | d[1] << 5 | d[2]
+        out = io.BytesIO()
+        central = []
+        for member in members:
+            info = member['info']
+            name = info.filename.encode('utf-8')
+            flags = UTF8_FLAG if not info.filename.isascii() else 0
+            offset = out.tell()
+            out.write(LOCAL_HEADER.pack(0x04034b50, ZIP_VERSION, flags, info.compress_type, dos_time, dos_date,
+                                        info.CRC, info.compress_size, info.file_size, len(name), 0))
+            out.write(name)
+            out.write(member['raw'])
+            central.append(CENTRAL_HEADER.pack(
+                0x02014b50, ZIP_MADE_BY, ZIP_VERSION, flags, info.compress_type, dos_time, dos_date,
+                info.CRC, info.compress_size, info.file_size, len(name), 0, len(info.comment),
+                0, 0, info.external_attr, offset) + name + info.comment)
+
+        central_offset = out.tell()
+        for record in central:
+            out.write(record)
+        out.write(END_RECORD.pack(0x06054b50, 0, 0, len(central), len(central),
+                                  out.tell() - central_offset, central_offset, 0))
+        return out.getvalue()
+
+    def _write_precompressed(self, fs, members):
+        """Write .gz/.br siblings next to text files in the bundle"""
+        text_members = [
+            m for m in members if PurePosixPath(m['path']).suffix.lower() in PRECOMPRESS_SUFFIXES
+        ]
+        written = 0
+
+        if 'gzip' in self.precompress:
+            for member in text_members:
+                fs.write_bytes(f"{member['path']}.gz", self._gzip_from_member(member))
+                written += 1
+
+        if 'brotli' in self.precompress:
+            if brotli is None:
+                self.log("   ⚠️  brotli not installed - skipping .br files (pip install brotli)")
+            else:
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    compressed = pool.map(lambda m: brotli.compress(m['data'], quality=11), text_members)
+                    for member, data in zip(text_members, compressed):
+                        fs.write_bytes(f"{member['path']}.br", data)
+                        written += 1
+
+        if written > 0:
+            self.log(f"   🗜️  Wrote {written} precompressed files for static hosting")
+
+    @staticmethod
+    def _gzip_from_member(member):
+        """Wrap a deflated ZIP member as a gzip stream instead of compressing twice"""
+        info = member['info']
+        if info.compress_type != zipfile.ZIP_DEFLATED:
+            return gzip.compress(member['data'], mtime=0)
+        header = b'\x1f\x8b\x08\x00' + struct.pack('<I', 0) + b'\x02\xff'
+        trailer = struct.pack('<II', info.CRC, info.file_size & 0xffffffff)
+        return header + member['raw'] + trailer
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Circular Statistics for Presentation Build System
+Vectorized, axis-aware, weighted and NaN-tolerant versions of the functions the slides teach
+"""
+
+import numpy as np
+
+
+TAU = 2 * np.pi
+
+# Below this mean resultant length the mean direction is undefined (same cutoff as the demos)
+UNDEFINED_R = 1e-6
+
+# Elements per scratch buffer; reductions stream through the input in chunks of this size
+CHUNK_SIZE = 1 << 18
+
+
+def _as_float(a):
+    """Float view of the input; integers are promoted, float32 stays float32"""
+    a = np.asarray(a)
+    return a if np.issubdtype(a.dtype, np.floating) else a.astype(np.float64)
+
+
+def wrap(a, low=-np.pi, period=TAU, out=None):
+    """Wrap values into [low, low + period)"""
+    a = _as_float(a)
+    out = np.asarray(np.subtract(a, low, out=out))
+    np.mod(out, period, out=out)
+    # mod of a tiny negative number can round up to exactly period
+    np.subtract(out, period, out=out, where=out >= period)
+    out += low
+    return out[()] if out.ndim == 0 else out
+
+
+def wrapped_diff(a, b, period=TAU, out=None):
+    """Shortest signed difference a - b, in [-period/2, period/2)"""
+    out = np.asarray(np.subtract(_as_float(a), b, out=out))
+    return wrap(out, -period / 2, period, out=out)
+
+
+def angular_derivatives(series, dt=1.0, axis=-1, period=TAU):
+    """Rate of change of an angle series, taking the short way across the wrap"""
+    steps = np.diff(_as_float(series), axis=axis)
+    wrap(steps, -period / 2, period, out=steps)
+    steps /= dt
+    return steps
+
+
+def unwrap(a, axis=-1, period=TAU):
+    """Remove period jumps so the series is continuous; NaN gaps are bridged and kept as NaN"""
+    a = _as_float(a)
+    x = np.moveaxis(a, axis, -1)
+
+    missing = np.isnan(x)
+    if missing.any():
+        # Measure each step from the last valid sample so a gap does not reset the unwrap
+        index = np.where(missing, 0, np.arange(x.shape[-1]))
+        np.maximum.accumulate(index, axis=-1, out=index)
+        x = np.take_along_axis(x, index, axis=-1)
+
+    # Correction per step is -period * sign(step) * ceil((|step| - period/2) / period), built in
+    # one buffer: a step of exactly +-period/2 is kept either way, as np.unwrap keeps it
+    correction = np.diff(x, axis=-1)
+    falling = correction < 0
+    np.abs(correction, out=correction)
+    correction -= period / 2
+    correction /= period
+    np.ceil(correction, out=correction)
+    correction *= -period
+    np.negative(correction, out=correction, where=falling)
+    np.nan_to_num(correction, copy=False)
+    np.cumsum(correction, axis=-1, out=correction)
+
+    out = np.array(np.moveaxis(a, axis, -1))
+    out[..., 1:] += correction
+    return np.moveaxis(out, -1, axis)
+
+
+def _resultant_sums(a, axis=None, weights=None, k=1, period=TAU, nan_policy='omit', chunk_size=CHUNK_SIZE):
+    """Weighted sums of cos(k*theta), sin(k*theta) and the weights, streamed in chunks"""
+    if nan_policy not in ('omit', 'propagate'):
+        raise ValueError(f"nan_policy must be 'omit' or 'propagate', not {nan_policy!r}")
+
+    a = _as_float(a)
+    if weights is not None:
+        weights = np.broadcast_to(np.asarray(weights, dtype=a.dtype), a.shape)
+    if axis is None:
+        a = a.reshape(-1)
+        weights = weights.reshape(-1) if weights is not None else None
+        axis = 0
+
+    x = np.moveaxis(a, axis, -1)
+    w = np.moveaxis(weights, axis, -1) if weights is not None else None
+    outer, n = x.shape[:-1], x.shape[-1]
+    step = max(1, chunk_size // max(1, int(np.prod(outer))))
+
+    sum_cos = np.zeros(outer)
+    sum_sin = np.zeros(outer)
+    total = np.zeros(outer)
+    scale = k * TAU / period
+
+    # Two scratch buffers and a mask are reused for every chunk; nothing input-sized is allocated
+    theta_buffer = np.empty(outer + (min(step, n),), dtype=x.dtype)
+    trig_buffer = np.empty_like(theta_buffer)
+    mask_buffer = np.empty(theta_buffer.shape, dtype=bool)
+
+    for start in range(0, n, step):
+        chunk = x[..., start:start + step]
+        m = chunk.shape[-1]
+        theta, trig, mask = theta_buffer[..., :m], trig_buffer[..., :m], mask_buffer[..., :m]
+        weight = w[..., start:start + m] if w is not None else None
+
+        np.multiply(chunk, scale, out=theta)
+        omit = nan_policy == 'omit'
+        if omit:
+            np.isnan(theta, out=mask)
+            if weight is not None:
+                mask |= np.isnan(weight)
+
+        for func, acc in ((np.cos, sum_cos), (np.sin, sum_sin)):
+            func(theta, out=trig)
+            if weight is not None:
+                trig *= weight
+            if omit:
+                np.copyto(trig, 0, where=mask)
+            acc += trig.sum(axis=-1, dtype=np.float64)
+
+        if weight is None:
+            total += m - mask.sum(axis=-1) if omit else m
+        else:
+            np.copyto(trig, weight)
+            if omit:
+                np.copyto(trig, 0, where=mask)
+            total += trig.sum(axis=-1, dtype=np.float64)
+
+    return sum_cos, sum_sin, total
+
+
+def resultant_length(a, axis=None, weights=None, k=1, period=TAU, nan_policy='omit', chunk_size=CHUNK_SIZE):
+    """Mean resultant length R in [0, 1]: 1 when all angles agree, near 0 when they cancel"""
+    sum_cos, sum_sin, total = _resultant_sums(a, axis, weights, k, period, nan_policy, chunk_size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (np.hypot(sum_cos, sum_sin) / total)[()]
+
+
+def _mean_direction(a, axis, weights, k, period, low, nan_policy, chunk_size):
+    sum_cos, sum_sin, total = _resultant_sums(a, axis, weights, k, period, nan_policy, chunk_size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r = np.hypot(sum_cos, sum_sin) / total
+    mean = np.arctan2(sum_sin, sum_cos) * (period / TAU / k)
+    mean = wrap(mean, -period / 2 if low is None else low, period)
+    # Undefined means (R ~ 0, or no valid samples) are NaN rather than an arbitrary angle
+    return np.where(r >= UNDEFINED_R, mean, np.nan)[()]
+
+
+def circular_mean(a, axis=None, weights=None, period=TAU, low=None, nan_policy='omit', chunk_size=CHUNK_SIZE):
+    """Mean direction, wrapped into [low, low + period) (default [-period/2, period/2))"""
+    return _mean_direction(a, axis, weights, 1, period, low, nan_policy, chunk_size)
+
+
+def harmonic_mean(a, k=2, axis=None, weights=None, period=TAU, low=None, nan_policy='omit', chunk_size=CHUNK_SIZE):
+    """k-harmonic mean direction: atan2 of the k-th trigonometric moment, divided by k
+
+    Treats angles period / k apart as equivalent, e.g. k=2 for axial data like lane
+    directions; the result is one of the k equivalent directions.
+    """
+    return _mean_direction(a, axis, weights, k, period, low, nan_policy, chunk_size)
+
+
+def circular_variance(a, axis=None, weights=None, period=TAU, nan_policy='omit', chunk_size=CHUNK_SIZE):
+    """1 - R, from 0 (identical angles) to 1 (uniformly spread)"""
+    return (1 - resultant_length(a, axis, weights, 1, period, nan_policy, chunk_size))[()]
+
+
+def circular_std(a, axis=None, weights=None, period=TAU, nan_policy='omit', chunk_size=CHUNK_SIZE):
+    """Circular standard deviation sqrt(-2 ln R), in the same units as the input"""
+    r = resultant_length(a, axis, weights, 1, period, nan_policy, chunk_size)
+    with np.errstate(divide='ignore'):
+        return (np.sqrt(-2 * np.log(r)) * (period / TAU))[()]
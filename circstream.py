@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Streaming Circular Statistics for Presentation Build System
+Sliding-window circular mean, variance and angular velocity over arbitrarily long heading logs
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+from circstats import TAU, UNDEFINED_R, wrap
+
+
+# Samples per chunk when reading logs; also bounds the per-chunk scratch memory
+CHUNK_SAMPLES = 1 << 16
+
+
+def read_chunks(source, chunk_samples=CHUNK_SAMPLES, dtype=None, offset=0, column=None):
+    """Yield 1-D chunks from an array, a .npy file, a raw binary file or an iterable of arrays
+
+    Files are memory-mapped, so only the chunk being processed is paged in. Raw files
+    need a dtype (float32 when omitted); offset skips a header in bytes. column picks one
+    column of a 2-D log.
+    """
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if path.suffix == '.npy':
+            data = np.load(path, mmap_mode='r')
+        else:
+            data = np.memmap(path, dtype=dtype or np.float32, mode='r', offset=offset)
+    elif isinstance(source, np.ndarray):
+        data = source
+    else:
+        # Already chunked (e.g. another generator)
+        for chunk in source:
+            chunk = np.asarray(chunk)
+            yield chunk[:, column] if column is not None else chunk
+        return
+
+    if column is not None:
+        data = data[:, column]
+    for start in range(0, len(data), chunk_samples):
+        yield data[start:start + chunk_samples]
+
+
+class _RollingSum:
+    """Sliding-window sums from prefix sums that are rebased to zero every chunk"""
+
+    def __init__(self, window):
+        self.window = window
+        # Prefix sums at the last `window` positions seen so far
+        self.prefix = np.zeros(window)
+
+    def push(self, values, selected):
+        """Window sums ending at the selected positions of this chunk"""
+        n, window = len(values), self.window
+        prefix = np.empty(window + n)
+        prefix[:window] = self.prefix
+        np.cumsum(values, out=prefix[window:])
+        prefix[window:] += prefix[window - 1]
+        # Rebasing keeps the magnitudes bounded by one window, however long the log is
+        self.prefix = prefix[n:] - prefix[n]
+        return prefix[window:][selected] - prefix[:n][selected]
+
+
+def rolling_circular_stats(chunks, window, step=1, period=TAU, dt=1.0):
+    """Generator of per-chunk blocks of sliding-window statistics
+
+    Each block is a dict of equal-length arrays for the windows ending in that chunk:
+    index (sample index of the window's last sample), mean, resultant_length, variance
+    and angular_velocity (mean wrapped step per dt). Only every step-th full window is
+    emitted. Running resultant sums make each window O(1) and memory is bounded by the
+    chunk and window sizes. NaN samples are skipped, and windows without a defined mean
+    report NaN.
+    """
+    if window < 2:
+        raise ValueError("window must be at least 2 samples")
+    scale = TAU / period
+    sums = {name: _RollingSum(window) for name in ('cos', 'sin', 'count')}
+    step_sums = {name: _RollingSum(window - 1) for name in ('step', 'step_count')}
+    last_value = np.nan
+    consumed = 0
+
+    for chunk in chunks:
+        x = np.asarray(chunk, dtype=np.float64)
+        n = len(x)
+        if not n:
+            continue
+
+        # First full window in this chunk, then every step-th one after it
+        first = max(0, window - 1 - consumed)
+        first += -(consumed + first - (window - 1)) % step
+        selected = slice(first, n, step)
+        index = np.arange(consumed + first, consumed + n, step)
+
+        missing = np.isnan(x)
+        theta = x * scale
+        trig = np.cos(theta)
+        trig[missing] = 0
+        sum_cos = sums['cos'].push(trig, selected)
+        np.sin(theta, out=trig)
+        trig[missing] = 0
+        sum_sin = sums['sin'].push(trig, selected)
+        np.logical_not(missing, out=missing)
+        count = sums['count'].push(missing, selected)
+
+        # Wrapped step from the previous sample (across the chunk boundary too)
+        steps = np.empty(n)
+        steps[0] = x[0] - last_value
+        np.subtract(x[1:], x[:-1], out=steps[1:])
+        wrap(steps, -period / 2, period, out=steps)
+        np.isnan(steps, out=missing)
+        steps[missing] = 0
+        step_total = step_sums['step'].push(steps, selected)
+        np.logical_not(missing, out=missing)
+        step_count = step_sums['step_count'].push(missing, selected)
+
+        consumed += n
+        last_value = x[-1]
+        if not len(index):
+            continue
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            r = np.hypot(sum_cos, sum_sin) / count
+            velocity = step_total / (step_count * dt)
+        mean = np.arctan2(sum_sin, sum_cos) / scale
+        mean[~(r >= UNDEFINED_R)] = np.nan
+
+        yield {
+            'index': index,
+            'mean': mean,
+            'resultant_length': r,
+            'variance': 1 - r,
+            'angular_velocity': velocity,
+        }
+
+
+def collect(blocks):
+    """Concatenate streamed blocks into one compact series"""
+    series = {}
+    for block in blocks:
+        for name, values in block.items():
+            series.setdefault(name, []).append(values)
+    return {name: np.concatenate(parts) for name, parts in series.items()}
+
+
+def aggregate_log(source, window, step=None, period=TAU, dt=1.0, **read_options):
+    """Pre-aggregate a heading log into one sample per step (default: one per window)"""
+    chunks = read_chunks(source, **read_options)
+    return collect(rolling_circular_stats(chunks, window, step or window, period, dt))
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Demo Module Registry for Presentation Build System
+Which js/ module each slide needs, keyed by the element showSlide() looks for
+"""
+
+import re
+
+
+# UTC <-> local conversion over the build's offset tables (tz_tables.py); embedded only for
+# slides that load it
+TIMEZONES_MODULE = 'timezones.js'
+
+# js/ modules only the new_pages/ demos load (as ../js/<name>); the deck never ships them
+PAGE_MODULES = ['demo-compute.js']
+
+# Mirrors the checks in initDemos() in templates.NAVIGATION. These modules are split out of
+# the deck and loaded when a slide first needs them, after the js/ modules they require
+DEMO_MODULES = [
+    {'module': 'hue-drag-wheel.js', 'element_id': 'dwSVG', 'init': 'initHueDragWheel',
+     'libraries': [], 'requires': []},
+    {'module': 'vector-calculator.js', 'element_id': 'vector-demo', 'init': 'initVectorCalculator',
+     'libraries': [], 'requires': []},
+    {'module': 'timeseries-analyzer.js', 'element_id': 'timeseries-demo', 'init': 'initTimeseriesAnalyzer',
+     'libraries': [], 'requires': []},
+    {'module': 'interactive-demo.js', 'element_id': 'angle1', 'init': 'initInteractiveDemo',
+     'libraries': [], 'requires': []},
+    {'module': 'gis-demo.js', 'element_id': 'map', 'init': 'initGISDemo',
+     'libraries': ['leaflet'], 'requires': ['tile-pack.js']},
+    {'module': 'flight-photo-window.js', 'element_id': 'departure-time', 'init': 'initFlightPhotoWindow',
+     'libraries': [], 'requires': []},
+    {'module': 'flight-vs-now.js', 'element_id': 'syd-date', 'init': 'initFlightVsNow',
+     'libraries': [], 'requires': [TIMEZONES_MODULE]},
+]
+
+# CDN libraries the deck shell loads, and the slide markup that depends on them
+LIBRARY_MARKERS = [
+    ('d3+d3fc', re.compile(r'<svg\b', re.IGNORECASE)),
+    ('mathjax', re.compile(r'\$\$|\\\(|\\\[|(?<![\w$])\$[^$\s][^$]*\$')),
+    ('highlight.js', re.compile(r'<pre><code', re.IGNORECASE)),
+]
+
+
+def element_ids(content):
+    """All id attributes in a chunk of slide HTML"""
+    return set(re.findall(r'\bid=["\']([^"\']+)["\']', content))
+
+
+def modules_for_slide(content, available=None):
+    """Registry entries whose trigger element appears in the slide"""
+    ids = element_ids(content)
+    return [
+        entry for entry in DEMO_MODULES
+        if entry['element_id'] in ids and (available is None or entry['module'] in available)
+    ]
+
+
+def lazy_modules(available):
+    """js/ modules loaded on first use: the registry's demos and every module one requires
+
+    A required module never loads up front, even when the demo requiring it is not built;
+    no slide then lists it, so it is never loaded at all.
+    """
+    lazy = set()
+    for entry in DEMO_MODULES:
+        lazy.update(module for module in [entry['module']] + entry['requires'] if module in available)
+    return lazy
+
+
+def slide_modules(content, available):
+    """Modules a slide loads before its demos start, each after the modules it requires"""
+    modules = []
+    for entry in modules_for_slide(content, available):
+        for module in entry['requires'] + [entry['module']]:
+            if module in available and module not in modules:
+                modules.append(module)
+    return modules
+
+
+def libraries_for_slide(content, available=None):
+    """Names of the CDN runtime libraries a slide relies on"""
+    libraries = [name for name, marker in LIBRARY_MARKERS if marker.search(content)]
+    for entry in modules_for_slide(content, available):
+        libraries.extend(lib for lib in entry['libraries'] if lib not in libraries)
+    return libraries
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Demo Page Builder for Presentation Build System
+Builds the standalone pages in new_pages/ with a shared, deduplicated runtime
+"""
+
+import re
+import hashlib
+import urllib.request
+from pathlib import Path, PurePosixPath
+
+from geometry_buffers import GeometryBufferBuilder
+
+
+SCRIPT_BLOCK_RE = re.compile(r'(<script\b([^>]*)>)(.*?)(</script>)', re.IGNORECASE | re.DOTALL)
+SCRIPT_SRC_RE = re.compile(r'(<script\b[^>]*\bsrc=["\'])(https?://[^"\']+)(["\'])', re.IGNORECASE)
+MODULE_IMPORT_RE = re.compile(r'(\bfrom\s+["\'])(https?://[^"\']+)(["\'])')
+# Deck runtime modules a page loads straight from the source tree, e.g. ../js/demo-scheduler.js
+DECK_MODULE_RE = re.compile(r'(<script\b[^>]*\bsrc=["\'])\.\./js/([\w.-]+\.js)(["\'])', re.IGNORECASE)
+
+# CDN URL layouts we know how to name: cdnjs and npm-style (unpkg, jsdelivr)
+CDNJS_RE = re.compile(r'/ajax/libs/([^/]+)/([^/]+)/(?:.*/)?([^/]+)$')
+NPM_RE = re.compile(r'/(?:npm/)?((?:@[^/]+/)?[^/@]+)@([^/]+)/(?:.*/)?([^/]+)$')
+
+
+def _top_level_functions(script):
+    """(name, start, end) of every function declaration at brace depth 0"""
+    functions = []
+    depth = 0
+    i = 0
+    n = len(script)
+    current = None
+    while i < n:
+        ch = script[i]
+        if ch in '"\'`':
+            # Skip string and template literals
+            quote = ch
+            i += 1
+            while i < n and script[i] != quote:
+                i += 2 if script[i] == '\\' else 1
+        elif script.startswith('//', i):
+            i = script.find('\n', i)
+            if i < 0:
+                break
+        elif script.startswith('/*', i):
+            i = script.find('*/', i + 2) + 1
+            if i <= 0:
+                break
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0 and current is not None:
+                functions.append((current[0], current[1], i + 1))
+                current = None
+        elif depth == 0 and current is None and script.startswith('function', i):
+            match = re.match(r'function\s+([A-Za-z_$][\w$]*)\s*\(', script[i:])
+            line_start = script.rfind('\n', 0, i) + 1
+            if match and not script[line_start:i].strip():
+                current = (match.group(1), i)
+        i += 1
+    return functions
+
+
+def _strip_comments(script):
+    """Script source without // and /* */ comments; string and template literals are kept"""
+    out = []
+    i = 0
+    n = len(script)
+    while i < n:
+        ch = script[i]
+        if ch in '"\'`':
+            end = i + 1
+            while end < n and script[end] != ch:
+                end += 2 if script[end] == '\\' else 1
+            out.append(script[i:end + 1])
+            i = end + 1
+        elif script.startswith('//', i):
+            end = script.find('\n', i)
+            i = n if end < 0 else end
+        elif script.startswith('/*', i):
+            end = script.find('*/', i + 2)
+            out.append(' ')
+            i = n if end < 0 else end + 2
+        else:
+            out.append(ch)
+            i += 1
+    return ''.join(out)
+
+
+def _normalize(source):
+    """Whitespace- and comment-insensitive form used to decide whether two helpers are identical"""
+    return re.sub(r'\s+', ' ', _strip_comments(source)).strip()
+
+
+class DemoPageBuilder:
+    """Builds new_pages/ demos into docs/demos/ sharing helpers and vendored libraries"""
+
+    def __init__(self, config, source, output, asset_manager, vendor_cache_dir=None, progress=print,
+                 templates=None):
+        self.config = config
+        self.source = source
+        self.output = output
+        self.asset_manager = asset_manager
+        self.vendor_cache_dir = Path(vendor_cache_dir) if vendor_cache_dir else None
+        self.log = progress
+        self.geometry_buffers = GeometryBufferBuilder(config, progress, templates)
+
+        demo_config = config.get('demo_pages') or {}
+        self.pages_dir = Path(demo_config.get('source_dir', 'new_pages'))
+        self.pages = demo_config.get('pages') or [p.name for p in source.glob(self.pages_dir, '*.html')]
+        self.vendor = demo_config.get('vendor', True)
+        self.out_dir = Path("demos")
+        self.report = {}
+
+    def build(self):
+        """Build every configured demo page"""
+        pages = {}
+        for page in self.pages:
+            page_path = self.pages_dir / page
+            if not self.source.exists(page_path):
+                self.log(f"   ❌ Demo page not found: {page}")
+                continue
+            pages[page] = self.source.read_text(page_path)
+
+        if not pages:
+            return {}
+
+        self.log(f"🧪 Building {len(pages)} demo pages from {self.pages_dir}/")
+        shared_functions = self._find_shared_functions(pages)
+        shared_path = self._write_shared_module(shared_functions)
+        vendored = {}
+        deck_modules = {}
+
+        for page, content in pages.items():
+            hoisted = []
+            if shared_path:
+                content, hoisted = self._hoist_shared_functions(content, shared_functions)
+                if hoisted:
+                    content = self._insert_before_first_script(
+                        content, f'<script src="{shared_path.relative_to(self.out_dir).as_posix()}"></script>\n'
+                    )
+
+            content = self._link_deck_modules(content, deck_modules)
+            if self.vendor:
+                content = self._vendor_libraries(content, vendored)
+
+            content, buffers = self.geometry_buffers.embed(page, content)
+
+            # Same asset pipeline as slides; assets land in demos/assets/
+            content, page_assets = self.asset_manager.process_slide_assets(
+                content, self.pages_dir / page, 'bundle', bundle_dir=self.out_dir
+            )
+            self.asset_manager.assets_collected.extend(page_assets)
+
+            self.output.write_text(self.out_dir / page, content)
+            self.report[page] = {
+                'shared_helpers': hoisted,
+                'vendor': sorted(str(v) for url, v in vendored.items() if v and url in pages[page]),
+            }
+            if buffers:
+                self.report[page]['precomputed'] = buffers
+            self.log(f"   🧪 {page}: {len(hoisted)} shared helpers hoisted"
+                     + (f", {', '.join(buffers['buffers'])} precomputed" if buffers else ""))
+
+        return self.report
+
+    def _find_shared_functions(self, pages):
+        """Top-level helpers whose source is identical on two or more pages"""
+        seen = {}
+        for page, content in pages.items():
+            for source in self._classic_scripts(content):
+                for name, start, end in _top_level_functions(source):
+                    key = (name, _normalize(source[start:end]))
+                    seen.setdefault(key, {'source': source[start:end], 'pages': set()})['pages'].add(page)
+
+        shared = {key: info['source'] for key, info in seen.items() if len(info['pages']) > 1}
+        # Only hoist one variant per name so the shared module never redeclares a helper
+        by_name = {}
+        for (name, normalized), source in sorted(shared.items()):
+            by_name.setdefault(name, (normalized, source))
+        return by_name
+
+    def _write_shared_module(self, shared_functions):
+        """Emit the shared helpers as one content-hashed, long-cacheable script"""
+        if not shared_functions:
+            return None
+        body = "// Helpers shared by the demo pages (extracted at build time)\n\n"
+        body += "\n\n".join(source.strip() for _, source in shared_functions.values()) + "\n"
+        digest = hashlib.sha256(body.encode('utf-8')).hexdigest()[:10]
+        path = self.out_dir / "shared" / f"demo-helpers.{digest}.js"
+        self.output.write_text(path, body)
+        self.log(f"   🧩 Shared helpers: {', '.join(shared_functions)} → {path.name}")
+        return path
+
+    def _link_deck_modules(self, content, linked):
+        """Point ../js/ script tags at content-hashed copies in demos/shared/"""
+        def replace(match):
+            name = match.group(2)
+            if name not in linked:
+                module_path = Path("js") / name
+                if not self.source.exists(module_path):
+                    self.log(f"   ⚠️ Module {module_path} not found")
+                    linked[name] = None
+                else:
+                    data = self.source.read_bytes(module_path)
+                    digest = hashlib.sha256(data).hexdigest()[:10]
+                    linked[name] = self.out_dir / "shared" / f"{Path(name).stem}.{digest}.js"
+                    self.output.write_bytes(linked[name], data)
+            if linked[name] is None:
+                return match.group(0)
+            return match.group(1) + linked[name].relative_to(self.out_dir).as_posix() + match.group(3)
+
+        return DECK_MODULE_RE.sub(replace, content)
+
+    def _classic_scripts(self, content):
+        """Inline, non-module script bodies"""
+        return [
+            match.group(3) for match in SCRIPT_BLOCK_RE.finditer(content)
+            if 'src=' not in match.group(2) and 'module' not in match.group(2)
+        ]
+
+    def _hoist_shared_functions(self, content, shared_functions):
+        """Remove shared helpers from a page's inline scripts"""
+        hoisted = []
+
+        def strip_helpers(match):
+            attrs, body = match.group(2), match.group(3)
+            if 'src=' in attrs or 'module' in attrs:
+                return match.group(0)
+            # Remove back to front so earlier offsets stay valid
+            for name, start, end in reversed(_top_level_functions(body)):
+                if name in shared_functions and _normalize(body[start:end]) == shared_functions[name][0]:
+                    body = body[:start] + f"/* {name}() → shared helpers */" + body[end:]
+                    hoisted.append(name)
+            return match.group(1) + body + match.group(4)
+
+        content = SCRIPT_BLOCK_RE.sub(strip_helpers, content)
+        return content, sorted(hoisted)
+
+    @staticmethod
+    def _insert_before_first_script(content, tag):
+        index = content.lower().find('<script')
+        if index < 0:
+            index = content.lower().find('</body>')
+        return content[:index] + tag + content[index:]
+
+    def _vendor_libraries(self, content, vendored):
+        """Point CDN script tags and module imports at one shared local copy per URL"""
+        def replace(match, module_import=False):
+            url = match.group(2)
+            if url not in vendored:
+                vendored[url] = self._vendor(url)
+            local = vendored[url]
+            if local is None:
+                return match.group(0)
+            ref = local.relative_to(self.out_dir).as_posix()
+            return match.group(1) + ("./" + ref if module_import else ref) + match.group(3)
+
+        content = SCRIPT_SRC_RE.sub(replace, content)
+        return MODULE_IMPORT_RE.sub(lambda m: replace(m, module_import=True), content)
+
+    def _vendor(self, url):
+        """Local copy of a CDN file: from vendor/ in the deck, the cache, or the network"""
+        name = self._vendor_name(url)
+        local = self.out_dir / "vendor" / name
+        if self.output.exists(local):
+            return local
+
+        data = None
+        checked_in = Path("vendor") / name
+        cached = self.vendor_cache_dir / name if self.vendor_cache_dir else None
+        if self.source.exists(checked_in):
+            data = self.source.read_bytes(checked_in)
+        elif cached is not None and cached.is_file():
+            data = cached.read_bytes()
+        elif cached is not None:
+            try:
+                with urllib.request.urlopen(url, timeout=20) as response:
+                    data = response.read()
+                cached.parent.mkdir(parents=True, exist_ok=True)
+                cached.write_bytes(data)
+            except OSError as e:
+                self.log(f"   ⚠️  Could not vendor {url} ({e}) - keeping CDN link")
+                return None
+        else:
+            return None
+
+        self.output.write_bytes(local, data)
+        self.log(f"   📦 Vendored {url} → {local}")
+        return local
+
+    @staticmethod
+    def _vendor_name(url):
+        """Stable local name like three.js@r128/three.min.js"""
+        path = PurePosixPath(url.split('?')[0].split('://', 1)[1])
+        path_str = '/' + '/'.join(path.parts[1:])
+        for pattern in (CDNJS_RE, NPM_RE):
+            match = pattern.search(path_str)
+            if match:
+                lib, version, filename = match.groups()
+                return f"{lib.replace('/', '_')}@{version}/{filename}"
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()[:10]
+        return f"{digest}/{path.name}"
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Geographic Centroids for Presentation Build System
+Vectorized, antimeridian-safe group-by centroids via the unit-vector embedding from the GIS slide
+"""
+
+import numpy as np
+
+from circstream import read_chunks, CHUNK_SAMPLES
+
+
+# Mean resultant length below which a centroid is undefined (points spread around the globe)
+MIN_RESULTANT = 1e-9
+
+# Non-negative integer group ids below this are summed into a dense table without sorting
+DENSE_GROUP_LIMIT = 1 << 20
+# ...when the chunk has at least one point per this many table rows; a chunk's length bounds
+# its distinct ids, so sparse large ids (flight or site numbers) are sorted into codes instead
+DENSE_ROWS_PER_POINT = 4
+
+
+def latlon_to_cartesian(lat, lon):
+    """Unit vectors (..., 3) for latitudes/longitudes in degrees"""
+    lat_rad = np.radians(lat)
+    lon_rad = np.radians(lon)
+    cos_lat = np.cos(lat_rad)
+    return np.stack([cos_lat * np.cos(lon_rad), cos_lat * np.sin(lon_rad), np.sin(lat_rad)], axis=-1)
+
+
+def cartesian_to_latlon(x, y, z, min_resultant=MIN_RESULTANT, total=1.0):
+    """Latitude/longitude in degrees of summed vectors; NaN where the resultant is degenerate"""
+    norm = np.sqrt(x * x + y * y + z * z)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        degenerate = ~(norm / total >= min_resultant)
+        lat = np.degrees(np.arcsin(np.clip(z / norm, -1, 1)))
+    lon = np.degrees(np.arctan2(y, x))
+    lat = np.where(degenerate, np.nan, lat)
+    lon = np.where(degenerate, np.nan, lon)
+    return lat[()], lon[()]
+
+
+def geographic_centroid(lat, lon, weights=None):
+    """(lat, lon) of the normalized mean unit vector; works across +/-180 and near the poles"""
+    xyz = latlon_to_cartesian(np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64))
+    if weights is not None:
+        xyz *= np.asarray(weights, dtype=np.float64)[..., None]
+        total = np.sum(weights)
+    else:
+        total = len(xyz)
+    x, y, z = xyz.sum(axis=0)
+    return cartesian_to_latlon(x, y, z, total=total)
+
+
+class CentroidAccumulator:
+    """Per-group vector sums accumulated chunk by chunk; groups need not be known up front"""
+
+    def __init__(self, min_resultant=MIN_RESULTANT):
+        self.min_resultant = min_resultant
+        self.groups = np.zeros(0, dtype=np.int64)
+        # Columns: sum x, sum y, sum z, total weight, count
+        self.sums = np.zeros((0, 5))
+        # Small integer ids index this table directly (row = group id)
+        self.dense = np.zeros((0, 5))
+
+    def add(self, lat, lon, groups, weights=None):
+        """Fold one chunk of points into the per-group sums; NaN coordinates are skipped"""
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        groups = np.asarray(groups)
+        valid = ~(np.isnan(lat) | np.isnan(lon))
+        if not valid.all():
+            lat, lon, groups = lat[valid], lon[valid], groups[valid]
+            weights = np.asarray(weights)[valid] if weights is not None else None
+        if not len(lat):
+            return self
+
+        dense = (groups.dtype.kind in 'iu' and groups.min() >= 0
+                 and groups.max() < min(DENSE_GROUP_LIMIT, DENSE_ROWS_PER_POINT * len(groups)))
+        if dense:
+            codes, size = groups, int(groups.max()) + 1
+        else:
+            # Sort-based segment reduction: unique sorts the keys, bincount sums each segment
+            keys, codes = np.unique(groups, return_inverse=True)
+            size = len(keys)
+
+        lat_rad = np.radians(lat)
+        lon_rad = np.radians(lon)
+        cos_lat = np.cos(lat_rad)
+        w = np.ones(len(lat)) if weights is None else np.asarray(weights, dtype=np.float64)
+        chunk_sums = np.stack([
+            np.bincount(codes, w * cos_lat * np.cos(lon_rad), size),
+            np.bincount(codes, w * cos_lat * np.sin(lon_rad), size),
+            np.bincount(codes, w * np.sin(lat_rad), size),
+            np.bincount(codes, w, size),
+            np.bincount(codes, minlength=size).astype(np.float64),
+        ], axis=1)
+
+        if dense:
+            if size > len(self.dense):
+                self.dense = np.concatenate([self.dense, np.zeros((size - len(self.dense), 5))])
+            self.dense[:size] += chunk_sums
+        else:
+            self._merge(keys, chunk_sums)
+        return self
+
+    def _merge(self, keys, chunk_sums):
+        """Add per-key sums into the running (sorted) group table"""
+        merged = np.union1d(self.groups, keys)
+        sums = np.zeros((len(merged), 5))
+        sums[np.searchsorted(merged, self.groups)] += self.sums
+        sums[np.searchsorted(merged, keys)] += chunk_sums
+        self.groups, self.sums = merged, sums
+
+    def result(self):
+        """dict of arrays: group, lat, lon, count, resultant_length (0..1)"""
+        if len(self.dense):
+            present = np.flatnonzero(self.dense[:, 4])
+            self._merge(present, self.dense[present])
+            self.dense = np.zeros((0, 5))
+        x, y, z, total, count = self.sums.T
+        lat, lon = cartesian_to_latlon(x, y, z, self.min_resultant, total)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            resultant = np.sqrt(x * x + y * y + z * z) / total
+        return {
+            'group': self.groups,
+            'lat': np.atleast_1d(lat),
+            'lon': np.atleast_1d(lon),
+            'count': count.astype(np.int64),
+            'resultant_length': resultant,
+        }
+
+
+def group_centroids(lat, lon, groups, weights=None, min_resultant=MIN_RESULTANT):
+    """Centroid of every group in one pass over (lat, lon, group) rows"""
+    return CentroidAccumulator(min_resultant).add(lat, lon, groups, weights).result()
+
+
+def _column(chunk, key):
+    """Field of a structured array, or column of a 2-D array"""
+    return chunk[key] if chunk.dtype.names else chunk[:, key]
+
+
+def centroids_from_log(source, lat='lat', lon='lon', group='group', weight=None,
+                       chunk_samples=CHUNK_SAMPLES, min_resultant=MIN_RESULTANT):
+    """Group centroids of a memory-mapped .npy (structured or N x 3) or in-memory table, in chunks
+
+    lat/lon/group/weight name fields of a structured array, or are column numbers for a
+    2-D array (e.g. lat=0, lon=1, group=2).
+    """
+    accumulator = CentroidAccumulator(min_resultant)
+    for chunk in read_chunks(source, chunk_samples):
+        accumulator.add(
+            _column(chunk, lat), _column(chunk, lon), _column(chunk, group),
+            _column(chunk, weight) if weight is not None else None,
+        )
+    return accumulator.result()
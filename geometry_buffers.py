@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Geometry Buffers for Presentation Build System
+Precomputes the atan2 demo meshes and fields with NumPy and embeds them as typed arrays
+"""
+
+import json
+import base64
+import math
+
+try:
+    import numpy as np
+    import circstats
+except ImportError:
+    np = None
+
+from template_engine import TemplateSet
+
+
+def _hsl_to_rgb(h, s, l):
+    """Vectorized THREE.Color.setHSL (r128, no color management)"""
+    h = np.mod(h, 1.0)
+    p = l * (1 + s) if l <= 0.5 else l + s - l * s
+    q = 2 * l - p
+
+    def hue2rgb(t):
+        t = np.where(t < 0, t + 1, t)
+        t = np.where(t > 1, t - 1, t)
+        return np.select(
+            [t < 1 / 6, t < 1 / 2, t < 2 / 3],
+            [q + (p - q) * 6 * t, p, q + (p - q) * 6 * (2 / 3 - t)],
+            default=q,
+        )
+
+    return np.stack([hue2rgb(h + 1 / 3), hue2rgb(h), hue2rgb(h - 1 / 3)], axis=-1)
+
+
+def _vertex_normals(position, index):
+    """Same result as BufferGeometry.computeVertexNormals() for an indexed mesh"""
+    pos = position.astype(np.float64)
+    tri = index.reshape(-1, 3)
+    a, b, c = pos[tri[:, 0]], pos[tri[:, 1]], pos[tri[:, 2]]
+    face = np.cross(c - b, a - b)
+    normals = np.zeros_like(pos)
+    for k in range(3):
+        np.add.at(normals, tri[:, k], face)
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, length, out=normals, where=length > 0)
+    return normals.astype(np.float32)
+
+
+def _index_array(index, vertex_count):
+    """Uint16 when it fits, like BufferGeometry.setIndex() picks"""
+    return index.astype(np.uint32 if vertex_count > 65535 else np.uint16)
+
+
+def atan2_surface(resolution=60, size=4):
+    """Mesh for createSurface() in atan2-3d-surface.html: z = atan2(y, x) / pi, HSL colored"""
+    steps = np.arange(resolution + 1) / resolution
+    # Vertex a = i * (resolution + 1) + j with x from i and y from j
+    x, y = np.meshgrid((steps - 0.5) * size, (steps - 0.5) * size, indexing='ij')
+    angle = np.arctan2(y, x)
+    position = np.stack([x, y, angle / math.pi], axis=-1).reshape(-1, 3).astype(np.float32)
+    color = _hsl_to_rgb((angle + math.pi) / (2 * math.pi), 0.7, 0.5).reshape(-1, 3).astype(np.float32)
+
+    # Quads a-b / c-d, skipping any whose corners straddle the branch cut
+    grid = np.arange((resolution + 1) ** 2).reshape(resolution + 1, resolution + 1)
+    a, b = grid[:-1, :-1].ravel(), grid[:-1, 1:].ravel()
+    c, d = grid[1:, :-1].ravel(), grid[1:, 1:].ravel()
+    flat = angle.ravel()
+    keep = ((np.abs(flat[b] - flat[a]) < math.pi) & (np.abs(flat[c] - flat[a]) < math.pi)
+            & (np.abs(flat[d] - flat[b]) < math.pi) & (np.abs(flat[d] - flat[c]) < math.pi))
+    a, b, c, d = a[keep], b[keep], c[keep], d[keep]
+    index = np.stack([a, c, b, b, c, d], axis=-1).ravel()
+
+    return {
+        'position': position,
+        'color': color,
+        'normal': _vertex_normals(position, index),
+        'index': _index_array(index, len(position)),
+    }
+
+
+def atan2_viewer_grid(resolution=64, size=6):
+    """Grid, angles and open-seam index for createAtan2Geometry() in atan2-unit-circle-viewer.html"""
+    segments = resolution - 1
+    # THREE.PlaneGeometry vertex layout: rows top to bottom, stored as float32
+    coords = (np.arange(resolution) * (size / segments) - size / 2).astype(np.float32)
+    x, y = np.meshgrid(coords, -coords)
+    angle = np.arctan2(y.astype(np.float64), x.astype(np.float64)).astype(np.float32).ravel()
+    position = np.stack([x.ravel(), y.ravel(), angle.astype(np.float64) * 0.01 * (180 / math.pi)], axis=-1)
+
+    row = resolution
+    ix, iy = np.meshgrid(np.arange(segments), np.arange(segments))
+    a = (ix + row * iy).ravel()
+    b = (ix + row * (iy + 1)).ravel()
+    c = (ix + 1 + row * (iy + 1)).ravel()
+    d = (ix + 1 + row * iy).ravel()
+    tri = np.stack([np.stack([a, b, d], -1), np.stack([b, c, d], -1)], axis=1).reshape(-1, 3)
+
+    # Same two branch-cut tests as the page: straddling the negative x axis, or spanning +/-pi
+    tx, ty, ta = position[tri, 0], position[tri, 1], angle[tri]
+    crosses_negative_x = (tx < 0).any(axis=1) & (ty > 0).any(axis=1) & (ty < 0).any(axis=1)
+    crosses_by_angle = (ta > 2.5).any(axis=1) & (ta < -2.5).any(axis=1)
+    keep = ~crosses_negative_x & ~crosses_by_angle
+
+    # Seam vertices: on a removed triangle and on a kept one, in first-seen order
+    removed = tri[~keep].ravel()
+    seen, first = np.unique(removed, return_index=True)
+    seam = seen[np.argsort(first)]
+    seam = seam[np.isin(seam, tri[keep])]
+
+    return {
+        'position': position.astype(np.float32),
+        'angle': angle,
+        'index': _index_array(tri.ravel(), len(angle)),
+        'openIndex': _index_array(tri[keep].ravel(), len(angle)),
+        'seamVertices': seam.astype(np.uint32),
+    }
+
+
+def atan2_field(n=160, m=160, extent=1.5):
+    """Row- then column-unwrapped atan2 field seeding the contour worker in circular-average-playground.html"""
+    xs = np.linspace(-extent, extent, n)
+    ys = np.linspace(-extent, extent, m)
+    th = np.arctan2(ys[:, None], xs[None, :])
+    th = circstats.unwrap(circstats.unwrap(th, axis=1), axis=0)
+    return {
+        'xs': xs.astype(np.float32),
+        'ys': ys.astype(np.float32),
+        'th': th.astype(np.float32),
+    }
+
+
+# Buffers each demo page can pick up through window.DEMO_BUFFERS[name]
+PAGE_BUFFERS = {
+    'atan2-3d-surface.html': {'atan2-surface': atan2_surface},
+    'atan2-unit-circle-viewer.html': {'atan2-viewer': atan2_viewer_grid},
+    'circular-average-playground.html': {'atan2-field': atan2_field},
+}
+
+
+def pack_buffers(buffers):
+    """One little-endian blob plus a {name: {attr: [type, offset, length, shape]}} layout"""
+    blob = bytearray()
+    layout = {}
+    for name, arrays in buffers.items():
+        layout[name] = {}
+        for attr, array in arrays.items():
+            array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder('<'))
+            # Typed array views need offsets aligned to their element size
+            blob.extend(b'\0' * (-len(blob) % max(4, array.itemsize)))
+            layout[name][attr] = [_js_array_type(array.dtype), len(blob), array.size, list(array.shape)]
+            blob.extend(array.tobytes())
+    return bytes(blob), layout
+
+
+def _js_array_type(dtype):
+    return {
+        'float32': 'Float32Array', 'float64': 'Float64Array', 'uint16': 'Uint16Array',
+        'uint32': 'Uint32Array', 'int32': 'Int32Array', 'uint8': 'Uint8Array',
+    }[dtype.name]
+
+
+class GeometryBufferBuilder:
+    """Builds the precomputed buffers a demo page uses and embeds them in the page"""
+
+    def __init__(self, config, progress=print, templates=None):
+        demo_config = config.get('demo_pages') or {}
+        self.settings = demo_config.get('precompute', {})
+        self.log = progress
+        self.templates = templates or TemplateSet(progress=progress)
+
+    def buffers_for_page(self, page):
+        """Computed arrays for every buffer the page knows how to load"""
+        if self.settings is False or np is None:
+            return {}
+        buffers = {}
+        for name, produce in PAGE_BUFFERS.get(page, {}).items():
+            options = (self.settings or {}).get(name) or {}
+            buffers[name] = produce(**options)
+        return buffers
+
+    def embed(self, page, content):
+        """Insert a script defining window.DEMO_BUFFERS ahead of the page's own scripts"""
+        if page in PAGE_BUFFERS and np is None:
+            self.log(f"   ⚠️  NumPy not installed - {page} computes its geometry in the browser")
+            return content, {}
+
+        buffers = self.buffers_for_page(page)
+        if not buffers:
+            return content, {}
+
+        blob, layout = pack_buffers(buffers)
+        script = self.templates.render('DEMO_BUFFERS',
+                                       LAYOUT_JSON=json.dumps(layout, separators=(',', ':')),
+                                       BUFFER_BASE64=base64.b64encode(blob).decode('ascii'))
+
+        index = content.lower().find('<script')
+        if index < 0:
+            index = content.lower().find('</body>')
+        content = content[:index] + f"<script>\n{script}</script>\n" + content[index:]
+        return content, {'buffers': sorted(buffers), 'bytes': len(blob)}
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Hue Lookup Tables for Presentation Build System
+Shortest-arc hue interpolation, hue LUTs and baked gradients in HSL, HSV and OKLCH
+"""
+
+import numpy as np
+
+from periodic import PeriodicArray
+
+
+SPACES = ('hsl', 'hsv', 'oklch')
+
+# Default channel values per space: HSL/HSV saturation and lightness/value in percent,
+# OKLCH lightness in 0..1 and chroma (reduced per hue to stay inside sRGB)
+DEFAULTS = {
+    'hsl': {'s': 100.0, 'l': 50.0},
+    'hsv': {'s': 100.0, 'v': 100.0},
+    'oklch': {'l': 0.7, 'c': 0.15},
+}
+
+
+def hsl_to_rgb(h, s, l):
+    """HSL (degrees, percent, percent) to sRGB floats in [0, 1], same formula as CSS hsl()"""
+    h = np.asarray(h, dtype=np.float64)
+    s = np.asarray(s, dtype=np.float64) / 100
+    l = np.asarray(l, dtype=np.float64) / 100
+    a = s * np.minimum(l, 1 - l)
+
+    def channel(n):
+        k = np.mod(n + h / 30, 12)
+        return l - a * np.clip(np.minimum(k - 3, 9 - k), -1, 1)
+
+    return np.stack([channel(0), channel(8), channel(4)], axis=-1)
+
+
+def hsv_to_rgb(h, s, v):
+    """HSV (degrees, percent, percent) to sRGB floats in [0, 1]"""
+    h = np.asarray(h, dtype=np.float64)
+    s = np.asarray(s, dtype=np.float64) / 100
+    v = np.asarray(v, dtype=np.float64) / 100
+
+    def channel(n):
+        k = np.mod(n + h / 60, 6)
+        return v - v * s * np.clip(np.minimum(k, 4 - k), 0, 1)
+
+    return np.stack([channel(5), channel(3), channel(1)], axis=-1)
+
+
+def _oklab_to_linear_srgb(l, a, b):
+    l_ = (l + 0.3963377774 * a + 0.2158037573 * b) ** 3
+    m_ = (l - 0.1055613458 * a - 0.0638541728 * b) ** 3
+    s_ = (l - 0.0894841775 * a - 1.2914855480 * b) ** 3
+    return np.stack([
+        4.0767416621 * l_ - 3.3077115913 * m_ + 0.2309699292 * s_,
+        -1.2684380046 * l_ + 2.6097574011 * m_ - 0.3413193965 * s_,
+        -0.0041960863 * l_ - 0.7034186147 * m_ + 1.7076147010 * s_,
+    ], axis=-1)
+
+
+def _srgb_gamma(linear):
+    linear = np.clip(linear, 0, 1)
+    return np.where(linear <= 0.0031308, 12.92 * linear, 1.055 * np.power(linear, 1 / 2.4) - 0.055)
+
+
+def oklch_to_rgb(l, c, h, gamut_steps=24):
+    """OKLCH (0..1, chroma, degrees) to sRGB floats, reducing chroma per color to fit the gamut"""
+    l, c, h = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (l, c, h)))
+    h_rad = np.radians(h)
+    cos_h, sin_h = np.cos(h_rad), np.sin(h_rad)
+
+    def in_gamut(chroma):
+        rgb = _oklab_to_linear_srgb(l, chroma * cos_h, chroma * sin_h)
+        return np.all((rgb >= -1e-6) & (rgb <= 1 + 1e-6), axis=-1)
+
+    # Vectorized bisection on chroma, keeping hue and lightness exact
+    fits = in_gamut(c)
+    low, high = np.zeros_like(c), c.copy()
+    for _ in range(gamut_steps):
+        mid = (low + high) / 2
+        ok = in_gamut(mid)
+        low = np.where(ok, mid, low)
+        high = np.where(ok, high, mid)
+    chroma = np.where(fits, c, low)
+    return _srgb_gamma(_oklab_to_linear_srgb(l, chroma * cos_h, chroma * sin_h))
+
+
+def to_rgb(hue, space='hsl', **channels):
+    """sRGB floats for hues in any supported space; other channels default per DEFAULTS"""
+    if space not in SPACES:
+        raise ValueError(f"Unknown color space {space!r}, expected one of {', '.join(SPACES)}")
+    values = dict(DEFAULTS[space], **channels)
+    if space == 'hsl':
+        return hsl_to_rgb(hue, values['s'], values['l'])
+    if space == 'hsv':
+        return hsv_to_rgb(hue, values['s'], values['v'])
+    return oklch_to_rgb(values['l'], values['c'], hue)
+
+
+def to_uint8(rgb):
+    return np.clip(np.round(np.asarray(rgb) * 255), 0, 255).astype(np.uint8)
+
+
+def hue_lut(size=360, space='hsl', **channels):
+    """(size, 3) uint8 table; entry i is the color of hue i * 360 / size"""
+    return to_uint8(to_rgb(np.arange(size) * (360.0 / size), space, **channels))
+
+
+def interpolate_hues(h1, h2, t):
+    """Hues a fraction t along the shortest arc from h1 to h2 (all broadcast together)"""
+    return PeriodicArray.hue(h1).interp(PeriodicArray.hue(h2), t).data
+
+
+def gradient(h1, h2, steps=256, space='hsl', **channels):
+    """(..., steps, 3) uint8 shortest-arc gradients between hue pairs"""
+    t = np.linspace(0, 1, steps)
+    h1 = np.asarray(h1, dtype=np.float64)[..., None]
+    h2 = np.asarray(h2, dtype=np.float64)[..., None]
+    return to_uint8(to_rgb(interpolate_hues(h1, h2, t), space, **channels))
+
+
+def colormap(hue_start=260.0, hue_end=60.0, size=256, lightness=(0.25, 0.95), chroma=0.14):
+    """Perceptual OKLCH colormap: lightness ramps linearly while hue takes the shortest arc
+
+    Suited to thermal imagery: equal steps in value look like equal steps in color.
+    """
+    t = np.linspace(0, 1, size)
+    hue = interpolate_hues(hue_start, hue_end, t)
+    l = lightness[0] + (lightness[1] - lightness[0]) * t
+    return to_uint8(oklch_to_rgb(l, chroma, hue))
+
+
+def apply_colormap(values, lut, vmin=None, vmax=None):
+    """Map a scalar image (e.g. temperatures) through a (n, 3) LUT into an (..., 3) uint8 image"""
+    values = np.asarray(values, dtype=np.float64)
+    vmin = np.nanmin(values) if vmin is None else vmin
+    vmax = np.nanmax(values) if vmax is None else vmax
+    scale = (len(lut) - 1) / max(vmax - vmin, np.finfo(float).tiny)
+    index = np.clip((values - vmin) * scale, 0, len(lut) - 1)
+    return lut[np.nan_to_num(index).astype(np.intp)]
+
+
+def save_colormap(path, lut, height=16):
+    """Write a LUT as a .npy array or a gradient strip image (PNG/WebP via Pillow)"""
+    if str(path).endswith('.npy'):
+        np.save(path, lut)
+        return
+    from PIL import Image
+    Image.fromarray(np.repeat(lut[None, :, :], height, axis=0)).save(path)
+
+
+# Tables baked into the deck: only the ones hueColor() in hue-drag-wheel.js reads, at its S and L
+DECK_TABLES = {
+    'hsl': ('hsl', {'s': 100, 'l': 50}),
+    'hsl_handle': ('hsl', {'s': 100, 'l': 70}),
+}
+
+
+def deck_tables(size=360):
+    """LUTs embedded in the deck, keyed as window.DEMO_BUFFERS['hue-lut'][name]
+
+    Each table comes with name + '_channels', the channel values it was baked at in order
+    (s, l for HSL), so hueColor() can tell when its own constants no longer match.
+    """
+    tables = {}
+    for name, (space, channels) in DECK_TABLES.items():
+        tables[name] = hue_lut(size, space, **channels)
+        tables[f"{name}_channels"] = np.array(list(channels.values()), dtype=np.uint8)
+    return tables
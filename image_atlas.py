@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Image Atlas for Presentation Build System
+Packs small bundle images into WebP atlases and draws them as background-position sprites
+"""
+
+import io
+import re
+import json
+import hashlib
+from pathlib import Path
+from PIL import Image
+
+from asset_manager import AssetManager
+
+
+# 1x1 transparent GIF: sprites keep their <img> element, the atlas is its background
+TRANSPARENT_PIXEL = "data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
+
+IMG_TAG_RE = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+# An attribute by name (not data-src for src), and its quoted value
+ATTR_RE = r'(?<![\w-]){}\s*=\s*(["\'])(.*?)\1'
+# A width or height declaration in an inline style (not max-width or line-height)
+STYLE_SIZE_RE = r'(?:^|;)\s*{}\s*:'
+
+
+def shelf_pack(sizes, atlas_size=2048, padding=2):
+    """Place (width, height) boxes on shelves, tallest first
+
+    Returns (placements, atlas extents): placements[i] is (atlas, x, y) for sizes[i], and
+    each atlas is cropped to the (width, height) its boxes use. A box that does not fit in
+    the current atlas starts the next one.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0], i))
+    placements = [None] * len(sizes)
+    extents = []
+    atlas = -1
+    x = y = shelf_height = atlas_size  # forces a new atlas for the first box
+
+    for i in order:
+        width, height = sizes[i]
+        if x + width > atlas_size:
+            # Next shelf
+            x, y = 0, y + shelf_height + padding
+            shelf_height = 0
+        if y + height > atlas_size:
+            atlas += 1
+            extents.append([0, 0])
+            x = y = shelf_height = 0
+        placements[i] = (atlas, x, y)
+        extents[atlas][0] = max(extents[atlas][0], x + width)
+        extents[atlas][1] = max(extents[atlas][1], y + height)
+        shelf_height = max(shelf_height, height)
+        x += width + padding
+
+    return placements, [tuple(extent) for extent in extents]
+
+
+def _extrude(atlas, x, y, width, height, pixels):
+    """Copy a sprite's edge pixels one pixel outwards so scaled sprites do not bleed"""
+    if y:
+        atlas.paste(pixels.crop((0, 0, width, 1)), (x, y - 1))
+    atlas.paste(pixels.crop((0, height - 1, width, height)), (x, y + height))
+    if x:
+        atlas.paste(pixels.crop((0, 0, 1, height)), (x - 1, y))
+    atlas.paste(pixels.crop((width - 1, 0, width, height)), (x + width, y))
+
+
+def _percent(value):
+    return f"{value:.4f}".rstrip('0').rstrip('.') + '%'
+
+
+class ImageAtlas:
+    """Bundle-mode stage that merges images up to build.image_atlas.max_size pixels into atlases"""
+
+    def __init__(self, config, source, output, transcode_cache=None, progress=print):
+        build_config = config.get('build', {})
+        atlas_config = build_config.get('image_atlas')
+        self.enabled = bool(atlas_config)
+        atlas_config = atlas_config if isinstance(atlas_config, dict) else {}
+        self.atlas_size = atlas_config.get('atlas_size', 2048)
+        self.max_size = min(atlas_config.get('max_size', 128), self.atlas_size)
+        self.padding = atlas_config.get('padding', 2)
+        self.quality = build_config.get('webp_quality', 90)
+        self.source = source
+        self.output = output
+        self.transcode_cache = transcode_cache
+        self.log = progress
+        # Atlas layout for assets_manifest.json
+        self.report = None
+
+    def pack(self, slides_content, bundle_dir=Path("presentation_bundle")):
+        """Rewrite small <img> references in slides_content to atlas sprites, in place"""
+        if not self.enabled:
+            return slides_content
+
+        sprites = self._candidates(slides_content)
+        if len(sprites) < 2:
+            return slides_content
+
+        names = sorted(sprites)
+        placements, extents = shelf_pack([sprites[name]['size'] for name in names],
+                                         self.atlas_size, self.padding)
+        # An atlas holding a single image saves nothing
+        counts = [sum(1 for atlas, _, _ in placements if atlas == n) for n in range(len(extents))]
+
+        atlases = []
+        layout = {}
+        for n, extent in enumerate(extents):
+            if counts[n] < 2:
+                continue
+            members = [(name, placement) for name, placement in zip(names, placements) if placement[0] == n]
+            atlas_path = Path(bundle_dir) / "assets" / f"atlas-{len(atlases)}.webp"
+            data = self._render(extent, [(sprites[name], x, y) for name, (_, x, y) in members])
+            self.output.write_bytes(atlas_path, data)
+            entry = {'file': f"assets/{atlas_path.name}", 'width': extent[0], 'height': extent[1],
+                     'bytes': len(data), 'sprites': {}}
+            for name, (_, x, y) in members:
+                width, height = sprites[name]['size']
+                entry['sprites'][name] = {'x': x, 'y': y, 'width': width, 'height': height}
+                layout[name] = (entry['file'], extent, x, y, width, height)
+            atlases.append(entry)
+
+        if not layout:
+            return slides_content
+
+        rewritten = 0
+        for slide in slides_content:
+            slide['content'], count = self._rewrite(slide['content'], layout)
+            rewritten += count
+
+        # Files only ever shown through the atlas are dropped from the bundle
+        removed = []
+        for name in layout:
+            ref = f"assets/{name}"
+            marker = f'data-atlas-src="{ref}"'
+            if not any(ref in slide['content'].replace(marker, '') for slide in slides_content):
+                self.output.remove(Path(bundle_dir) / "assets" / name)
+                removed.append(name)
+
+        self.report = {'max_size': self.max_size, 'atlases': atlases,
+                       'images': len(layout), 'img_tags': rewritten, 'files_removed': removed}
+        self.log(f"   🧩 Packed {len(layout)} small images into {len(atlases)} atlas"
+                 f"{'es' if len(atlases) != 1 else ''} ({rewritten} <img> tags, "
+                 f"{len(layout)} image requests → {len(atlases)})")
+        return slides_content
+
+    def _candidates(self, slides_content):
+        """Bundle images no larger than max_size that some slide shows with an <img> tag"""
+        sprites = {}
+        for slide in slides_content:
+            img_sources = {self._attr(tag, 'src') for tag in IMG_TAG_RE.findall(slide['content'])
+                           if self._spriteable(tag)}
+            for asset in slide['assets']:
+                if asset['type'] != 'image' or not asset['processed']:
+                    continue
+                name = Path(asset['processed']).name
+                if name in sprites or f"assets/{name}" not in img_sources or Path(name).suffix != '.webp':
+                    continue
+                data = self.source.read_bytes(asset['original'])
+                with Image.open(io.BytesIO(data)) as img:
+                    if getattr(img, 'n_frames', 1) > 1 or max(img.size) > self.max_size:
+                        continue
+                    sprites[name] = {'size': img.size, 'data': data,
+                                     'pixels': AssetManager.flatten(img).copy()}
+        return sprites
+
+    def _render(self, extent, members):
+        """WebP bytes of one atlas, through the transcode cache when there is one"""
+        def produce():
+            atlas = Image.new('RGB', extent, (255, 255, 255))
+            for sprite, x, y in members:
+                width, height = sprite['size']
+                atlas.paste(sprite['pixels'], (x, y))
+                if self.padding:
+                    _extrude(atlas, x, y, width, height, sprite['pixels'])
+            buffer = io.BytesIO()
+            atlas.save(buffer, 'WebP', quality=self.quality)
+            return buffer.getvalue()
+
+        if self.transcode_cache is None:
+            return produce()
+        digest = hashlib.sha256()
+        for sprite, x, y in members:
+            digest.update(hashlib.sha256(sprite['data']).digest())
+        layout = json.dumps([[x, y] for _, x, y in members])
+        key = self.transcode_cache.key(digest.digest(), atlas=layout, extent=list(extent),
+                                       padding=self.padding, webp_quality=self.quality)
+        return self.transcode_cache.get_or_create(key, produce)[0]
+
+    def _rewrite(self, content, layout):
+        """(content, tags rewritten): atlas images become sprites on a transparent pixel"""
+        count = 0
+
+        def sprite_tag(match):
+            nonlocal count
+            tag = match.group(0)
+            src = self._attr(tag, 'src')
+            name = src[len("assets/"):] if src and src.startswith("assets/") else None
+            if name not in layout or not self._spriteable(tag):
+                return tag
+            atlas_file, (atlas_width, atlas_height), x, y, width, height = layout[name]
+            # Percentages keep the sprite right at whatever size the slide's CSS gives the image
+            style = (f"background-image:url({atlas_file});"
+                     f"background-size:{_percent(atlas_width / width * 100)} {_percent(atlas_height / height * 100)};"
+                     f"background-position:{_percent(x / (atlas_width - width) * 100 if atlas_width > width else 0)} "
+                     f"{_percent(y / (atlas_height - height) * 100 if atlas_height > height else 0)};"
+                     f"background-repeat:no-repeat;aspect-ratio:{width}/{height}")
+            # The transparent pixel has no proportions of its own: a side the inline style leaves
+            # unsized follows aspect-ratio instead of the width/height attributes below
+            sized = self._style_sizes(tag)
+            if sized == {'width'}:
+                style += ";height:auto"
+            elif sized == {'height'}:
+                style += ";width:auto"
+
+            tag = re.sub(ATTR_RE.format('src'), lambda m: f'src="{TRANSPARENT_PIXEL}" data-atlas-src="{src}"',
+                         tag, count=1, flags=re.IGNORECASE)
+            existing = self._attr(tag, 'style')
+            if existing is None:
+                tag = re.sub(r'^<img\b', lambda m: f'<img style="{style}"', tag, flags=re.IGNORECASE)
+            else:
+                merged = existing.rstrip().rstrip(';') + (';' if existing.strip() else '') + style
+                tag = re.sub(ATTR_RE.format('style'), lambda m: f'style={m.group(1)}{merged}{m.group(1)}',
+                             tag, count=1, flags=re.IGNORECASE | re.DOTALL)
+            # Width and height give the placeholder the image's size and aspect ratio
+            if self._attr(tag, 'width') is None and self._attr(tag, 'height') is None:
+                tag = re.sub(r'^<img\b', f'<img width="{width}" height="{height}"', tag, flags=re.IGNORECASE)
+            count += 1
+            return tag
+
+        return IMG_TAG_RE.sub(sprite_tag, content), count
+
+    @classmethod
+    def _spriteable(cls, tag):
+        """Whether the sprite keeps the tag's proportions
+
+        A class may size one side of the image from the stylesheet, which the build does not
+        read, so classed tags stay plain images unless their inline style sets both sides.
+        """
+        return cls._attr(tag, 'class') is None or cls._style_sizes(tag) == {'width', 'height'}
+
+    @classmethod
+    def _style_sizes(cls, tag):
+        """{'width', 'height'} or the subset the tag's inline style sets"""
+        style = cls._attr(tag, 'style') or ''
+        return {side for side in ('width', 'height')
+                if re.search(STYLE_SIZE_RE.format(side), style, re.IGNORECASE)}
+
+    @staticmethod
+    def _attr(tag, name):
+        match = re.search(ATTR_RE.format(name), tag, re.IGNORECASE | re.DOTALL)
+        return match.group(2) if match else None
@@ -48,93 +48,24 @@ function initFlightVsNow() {
     let sfNowInstant = null; // UTC instant for SF "now"
     let sydFlightInstant = null; // UTC instant for Sydney flight
 
-    // Helper to get timezone offset in hours for a specific instant and timezone
-    function getTimezoneOffsetHours(epochMs, timeZone) {
-      const date = new Date(epochMs);
-      const formatter = new Intl.DateTimeFormat("en-US", {
-        timeZone,
-        year: "numeric",
-        month: "2-digit",
-        day: "2-digit",
-        hour: "2-digit",
-        minute: "2-digit",
-        second: "2-digit",
-        timeZoneName: "longOffset",
-      });
+    const SYDNEY = "Australia/Sydney";
+    const SAN_FRANCISCO = "America/Los_Angeles";
 
-      const formatted = formatter.format(date);
-      const offsetMatch = formatted.match(/GMT([+-]\d{1,2}):?(\d{2})?/);
-      if (offsetMatch) {
-        const hours = parseInt(offsetMatch[1]);
-        const minutes = offsetMatch[2] ? parseInt(offsetMatch[2]) : 0;
-        return hours + (hours < 0 ? -minutes / 60 : minutes / 60);
-      }
-      return 0;
+    // Offsets and local<->UTC come from TimeZones (js/timezones.js), which binary-searches
+    // the transition tables embedded at build time instead of scanning with Intl
+    function getTimezoneOffsetHours(epochMs, timeZone) {
+      return TimeZones.offsetAt(timeZone, epochMs) / 3600000;
     }
 
     // Convert local Sydney date/time to UTC instant, handling DST gaps and folds
     function localSydneyToInstant(dateStr, timeStr) {
-      const [year, month, day] = dateStr.split("-").map(Number);
-      const [hour, minute] = timeStr.split(":").map(Number);
-      const searchStart = Date.UTC(year, month - 1, day - 1, 0, 0);
-      const searchEnd = Date.UTC(year, month - 1, day + 2, 0, 0);
-      const matches = [];
-
-      for (let utc = searchStart; utc <= searchEnd; utc += 15 * 60 * 1000) {
-        const formatter = new Intl.DateTimeFormat("en-AU", {
-          timeZone: "Australia/Sydney",
-          year: "numeric",
-          month: "2-digit",
-          day: "2-digit",
-          hour: "2-digit",
-          minute: "2-digit",
-          hour12: false,
-        });
-        const parts = formatter.formatToParts(new Date(utc));
-        const formatted = {};
-        parts.forEach((p) => (formatted[p.type] = p.value));
-        if (
-          `${formatted.year}-${formatted.month}-${formatted.day}` === dateStr &&
-          `${formatted.hour}:${formatted.minute}` === timeStr
-        ) {
-          matches.push(utc);
-        }
-      }
-
-      if (matches.length === 0) {
-        // Spring-forward gap
-        for (let utc = searchStart; utc <= searchEnd; utc += 15 * 60 * 1000) {
-          const formatter = new Intl.DateTimeFormat("en-AU", {
-            timeZone: "Australia/Sydney",
-            year: "numeric",
-            month: "2-digit",
-            day: "2-digit",
-            hour: "2-digit",
-            minute: "2-digit",
-            hour12: false,
-          });
-          const parts = formatter.formatToParts(new Date(utc));
-          const formatted = {};
-          parts.forEach((p) => (formatted[p.type] = p.value));
-          if (
-            `${formatted.year}-${formatted.month}-${formatted.day}` ===
-              dateStr &&
-            `${formatted.hour}:${formatted.minute}` > timeStr
-          ) {
-            return {
-              instant: utc,
-              status: "gap",
-              adjustedTime: `${formatted.hour}:${formatted.minute}`,
-            };
-          }
-        }
-        return { instant: null, status: "gap" };
-      } else if (matches.length === 1) {
-        return { instant: matches[0], status: "valid" };
-      } else {
-        // Fall-back fold
-        return { instant: matches[0], status: "fold" };
+      const result = TimeZones.fromLocal(SYDNEY, TimeZones.localMs(dateStr, timeStr));
+      if (result.status === "gap") {
+        // Spring-forward gap: the time is moved forward by the skipped hour
+        return { instant: result.instant, status: "gap", adjustedTime: TimeZones.formatLocalTime(result.adjusted) };
       }
+      // Fall-back fold: the earlier of the two instants
+      return { instant: result.instant, status: result.status };
     }
 
     function formatDuration(milliseconds) {
@@ -146,42 +77,33 @@ function initFlightVsNow() {
       return `${sign}${hours}h ${minutes}m`;
     }
 
+    // One formatter per zone for the readouts (building them is the expensive part)
+    const readoutFormatters = new Map();
+
     function formatLocalTime(epochMs, timeZone) {
       if (!epochMs) return "Invalid";
-      const date = new Date(epochMs);
-      const formatter = new Intl.DateTimeFormat("en-US", {
-        timeZone,
-        year: "numeric",
-        month: "2-digit",
-        day: "2-digit",
-        hour: "2-digit",
-        minute: "2-digit",
-        timeZoneName: "short",
-      });
+      let formatter = readoutFormatters.get(timeZone);
+      if (!formatter) {
+        formatter = new Intl.DateTimeFormat("en-US", {
+          timeZone,
+          year: "numeric",
+          month: "2-digit",
+          day: "2-digit",
+          hour: "2-digit",
+          minute: "2-digit",
+          timeZoneName: "short",
+        });
+        readoutFormatters.set(timeZone, formatter);
+      }
       const offset = getTimezoneOffsetHours(epochMs, timeZone);
       const offsetStr = offset >= 0 ? `+${offset}` : `${offset}`;
-      return `${formatter.format(date)}, UTC${offsetStr}`;
+      return `${formatter.format(new Date(epochMs))}, UTC${offsetStr}`;
     }
 
+    // Naive: subtract the two wall-clock readings as if both were on the same clock
     function calculateNaiveDelta(sydDateStr, sydTimeStr, sfEpochMs) {
-      const sfDate = new Date(sfEpochMs);
-      const sfFormatter = new Intl.DateTimeFormat("en-US", {
-        timeZone: "America/Los_Angeles",
-        year: "numeric",
-        month: "2-digit",
-        day: "2-digit",
-        hour: "2-digit",
-        minute: "2-digit",
-        hour12: false,
-      });
-      const sfParts = sfFormatter.formatToParts(sfDate);
-      const sfFormatted = {};
-      sfParts.forEach((p) => (sfFormatted[p.type] = p.value));
-      const sydLocal = new Date(`${sydDateStr}T${sydTimeStr}:00`);
-      const sfLocal = new Date(
-        `${sfFormatted.year}-${sfFormatted.month}-${sfFormatted.day}T${sfFormatted.hour}:${sfFormatted.minute}:00`
-      );
-      return sfLocal.getTime() - sydLocal.getTime();
+      const sfLocal = Math.floor(TimeZones.toLocal(SAN_FRANCISCO, sfEpochMs) / 60000) * 60000;
+      return sfLocal - TimeZones.localMs(sydDateStr, sydTimeStr);
     }
 
     function drawTimeline(sydInstant, sfInstant) {
@@ -343,27 +265,15 @@ function initFlightVsNow() {
         calculateNaiveDelta(sydDateStr, sydTimeStr, sfNowInstant)
       );
 
-      const sydOffset = getTimezoneOffsetHours(
-        sydFlightInstant,
-        "Australia/Sydney"
-      );
-      const sfOffset = getTimezoneOffsetHours(
-        sfNowInstant,
-        "America/Los_Angeles"
-      );
+      const sydOffset = getTimezoneOffsetHours(sydFlightInstant, SYDNEY);
+      const sfOffset = getTimezoneOffsetHours(sfNowInstant, SAN_FRANCISCO);
       const offsetDifference = sfOffset - sydOffset;
       offsetDiff.textContent = `(${sfOffset}h) - (${sydOffset}h) = ${offsetDifference.toFixed(
         2
       )}h`;
 
-      sydReadout.textContent = `Sydney: ${formatLocalTime(
-        sydFlightInstant,
-        "Australia/Sydney"
-      )}`;
-      sfReadout.textContent = `San Francisco: ${formatLocalTime(
-        sfNowInstant,
-        "America/Los_Angeles"
-      )}`;
+      sydReadout.textContent = `Sydney: ${formatLocalTime(sydFlightInstant, SYDNEY)}`;
+      sfReadout.textContent = `San Francisco: ${formatLocalTime(sfNowInstant, SAN_FRANCISCO)}`;
       drawTimeline(sydFlightInstant, sfNowInstant);
     }
 
@@ -375,7 +285,7 @@ function initFlightVsNow() {
     // Initialize SF time to current time
     sfNowInstant = Date.now();
     sfNowReadout.textContent = new Intl.DateTimeFormat("en-US", {
-      timeZone: "America/Los_Angeles",
+      timeZone: SAN_FRANCISCO,
       month: "2-digit",
       day: "2-digit",
       year: "numeric",
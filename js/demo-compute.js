@@ -0,0 +1,335 @@
+// Off-main-thread compute layer for heavy demo work
+//
+// Fields, contours and meshes run in a Web Worker (built from a Blob, so pages work from
+// file:// and need no extra file). Results come back as transferable typed arrays, and
+// canvases handed over with attachCanvas() are drawn in the worker as OffscreenCanvas.
+// Without Worker/OffscreenCanvas support the same kernels run on the main thread.
+
+const DemoCompute = (function () {
+  // Everything the worker runs. Kept self-contained: its source is copied into the worker
+  function kernels() {
+    const TAU = Math.PI * 2;
+
+    // HSL (all 0..1) to RGB in 0..1, rounded to 8 bits like the canvas demos
+    function hslToRgb(h, s, l) {
+      if (s === 0) return [l, l, l];
+      const hue2rgb = (p, q, t) => {
+        if (t < 0) t += 1;
+        if (t > 1) t -= 1;
+        if (t < 1 / 6) return p + (q - p) * 6 * t;
+        if (t < 1 / 2) return q;
+        if (t < 2 / 3) return p + (q - p) * (2 / 3 - t) * 6;
+        return p;
+      };
+      const q = l < 0.5 ? l * (1 + s) : l + s - l * s;
+      const p = 2 * l - q;
+      return [hue2rgb(p, q, h + 1 / 3), hue2rgb(p, q, h), hue2rgb(p, q, h - 1 / 3)].map(
+        (c) => Math.round(c * 255) / 255
+      );
+    }
+
+    // Row- then column-unwrapped atan2 on an N x M grid; th is row-major (M rows of N)
+    function atan2Field({ N = 160, M = 160, extent = 1.5, store }, env) {
+      const xs = new Float32Array(N), ys = new Float32Array(M);
+      const th = new Float64Array(N * M);
+      for (let i = 0; i < N; i++) xs[i] = -extent + (2 * extent * i) / (N - 1);
+      for (let j = 0; j < M; j++) ys[j] = -extent + (2 * extent * j) / (M - 1);
+      for (let j = 0; j < M; j++) {
+        for (let i = 0; i < N; i++) th[j * N + i] = Math.atan2(ys[j], xs[i]);
+      }
+      const unwrapToward = (a, b) => (b - a > Math.PI ? b - TAU : b - a < -Math.PI ? b + TAU : b);
+      for (let j = 0; j < M; j++) {
+        for (let i = 1; i < N; i++) th[j * N + i] = unwrapToward(th[j * N + i - 1], th[j * N + i]);
+      }
+      for (let i = 0; i < N; i++) {
+        for (let j = 1; j < M; j++) th[j * N + i] = unwrapToward(th[(j - 1) * N + i], th[j * N + i]);
+      }
+      const field = { xs, ys, th: Float32Array.from(th), N, M };
+      if (store) {
+        // Kept next to the kernels that use it; only the size goes back
+        env.store.set(store, field);
+        return { N, M };
+      }
+      return field;
+    }
+
+    // Marching-squares segments per level, flattened as x0, y0, x1, y1, ...
+    // Cells whose corners differ by more than maxJump straddle a seam and are skipped
+    function contours({ field, levels, maxJump = Math.PI }, env) {
+      const { xs, ys, th, N, M } = typeof field === "string" ? env.store.get(field) : field;
+      const out = levels.map(() => []);
+      const pts = [];
+      const edge = (level, zA, zB, xA, xB, yA, yB) => {
+        const dA = zA - level, dB = zB - level, denom = dA - dB;
+        if ((dA > 0 && dB > 0) || (dA < 0 && dB < 0) || denom === 0) return;
+        const t = dA / denom;
+        pts.push(xA + (xB - xA) * t, yA + (yB - yA) * t);
+      };
+
+      for (let j = 0; j < M - 1; j++) {
+        const rowA = j * N, rowB = rowA + N;
+        for (let i = 0; i < N - 1; i++) {
+          const z00 = th[rowA + i], z10 = th[rowA + i + 1];
+          const z01 = th[rowB + i], z11 = th[rowB + i + 1];
+          let lo = z00 < z10 ? z00 : z10, hi = z00 < z10 ? z10 : z00;
+          if (z01 < lo) lo = z01; else if (z01 > hi) hi = z01;
+          if (z11 < lo) lo = z11; else if (z11 > hi) hi = z11;
+          if (hi - lo > maxJump) continue;
+
+          for (let k = 0; k < levels.length; k++) {
+            const level = levels[k];
+            if (level < lo || level > hi) continue;
+            const x0 = xs[i], x1 = xs[i + 1], y0 = ys[j], y1 = ys[j + 1];
+            pts.length = 0;
+            edge(level, z00, z10, x0, x1, y0, y0);
+            edge(level, z10, z11, x1, x1, y0, y1);
+            edge(level, z11, z01, x1, x0, y1, y1);
+            edge(level, z01, z00, x0, x0, y1, y0);
+            if (pts.length === 4) out[k].push(pts[0], pts[1], pts[2], pts[3]);
+          }
+        }
+      }
+      return { segments: out.map((s) => Float32Array.from(s)) };
+    }
+
+    // Two-sheet atan2 surface: the upper sheet lifts the third quadrant by 2π, the lower
+    // sheet drops the second, and cells across the step are left open
+    function twoSheets({ R = 1.4, NX = 160, NY = 160, zscale = 0.35 }) {
+      const n = NX * NY;
+      const color = new Float32Array(n * 3);
+      const sheets = [new Float32Array(n * 3), new Float32Array(n * 3)];
+      let k = 0;
+      for (let j = 0; j < NY; j++) {
+        const y = -R + (2 * R * j) / (NY - 1);
+        for (let i = 0; i < NX; i++, k++) {
+          const x = -R + (2 * R * i) / (NX - 1);
+          const z = Math.atan2(y, x);
+          color.set(hslToRgb((z + Math.PI) / TAU, 0.55, 0.55), k * 3);
+          const [upper, lower] = sheets;
+          upper[k * 3] = lower[k * 3] = x;
+          upper[k * 3 + 1] = lower[k * 3 + 1] = y;
+          upper[k * 3 + 2] = (x < 0 && y < 0 ? z + TAU : z) * zscale;
+          lower[k * 3 + 2] = (x < 0 && y > 0 ? z - TAU : z) * zscale;
+        }
+      }
+
+      const zjump = Math.PI * 1.5 * zscale;
+      const [upper, lower] = sheets.map((position) => {
+        const index = new Uint32Array((NX - 1) * (NY - 1) * 6);
+        let m = 0;
+        const z = (p) => position[p * 3 + 2];
+        for (let j = 0; j < NY - 1; j++) {
+          for (let i = 0; i < NX - 1; i++) {
+            const a = j * NX + i, b = a + 1, c = a + NX + 1, d = a + NX;
+            if (Math.abs(z(a) - z(b)) > zjump || Math.abs(z(b) - z(c)) > zjump ||
+                Math.abs(z(c) - z(d)) > zjump || Math.abs(z(d) - z(a)) > zjump) continue;
+            index[m++] = a; index[m++] = b; index[m++] = d;
+            index[m++] = b; index[m++] = c; index[m++] = d;
+          }
+        }
+        const tris = index.slice(0, m);
+        return { position, normal: vertexNormals(position, tris), index: tris };
+      });
+      return { upper, lower, color };
+    }
+
+    // Same as BufferGeometry.computeVertexNormals(): summed face normals, normalized
+    function vertexNormals(position, index) {
+      const normal = new Float32Array(position.length);
+      for (let t = 0; t < index.length; t += 3) {
+        const a = index[t] * 3, b = index[t + 1] * 3, c = index[t + 2] * 3;
+        const cbx = position[c] - position[b], cby = position[c + 1] - position[b + 1], cbz = position[c + 2] - position[b + 2];
+        const abx = position[a] - position[b], aby = position[a + 1] - position[b + 1], abz = position[a + 2] - position[b + 2];
+        const nx = cby * abz - cbz * aby, ny = cbz * abx - cbx * abz, nz = cbx * aby - cby * abx;
+        normal[a] += nx; normal[a + 1] += ny; normal[a + 2] += nz;
+        normal[b] += nx; normal[b + 1] += ny; normal[b + 2] += nz;
+        normal[c] += nx; normal[c + 1] += ny; normal[c + 2] += nz;
+      }
+      for (let v = 0; v < normal.length; v += 3) {
+        const len = Math.hypot(normal[v], normal[v + 1], normal[v + 2]) || 1;
+        normal[v] /= len;
+        normal[v + 1] /= len;
+        normal[v + 2] /= len;
+      }
+      return normal;
+    }
+
+    // Contour overlay: the static levels are computed once, the highlighted ones per call.
+    // Drawn right here when the canvas lives in this thread, otherwise the segments go back
+    function contourLayer(params, env) {
+      const { canvas: key, field, levels, highlight } = params;
+      const cacheKey = `contours:${field}:${levels.join(",")}`;
+      if (!env.store.has(cacheKey)) env.store.set(cacheKey, contours({ field, levels }, env).segments);
+      const weak = env.store.get(cacheKey);
+      const strong = highlight.length ? contours({ field, levels: highlight }, env).segments : [];
+
+      const canvas = env.canvas(key);
+      if (!canvas) return { weak: weak.map((s) => s.slice()), strong };
+      return { drawn: drawContours(canvas, { weak, strong }, params) };
+    }
+
+    function drawContours(canvas, { weak, strong }, { width, height, transform, styles }) {
+      if (canvas.width !== width) canvas.width = width;
+      if (canvas.height !== height) canvas.height = height;
+      const ctx = canvas.getContext("2d");
+      const { cx, cy, scale } = transform;
+      ctx.clearRect(0, 0, width, height);
+      let drawn = 0;
+      const stroke = (groups, style, lineWidth) => {
+        ctx.strokeStyle = style;
+        ctx.lineWidth = lineWidth;
+        ctx.beginPath();
+        for (const s of groups) {
+          for (let i = 0; i < s.length; i += 4) {
+            ctx.moveTo(cx + s[i] * scale, cy - s[i + 1] * scale);
+            ctx.lineTo(cx + s[i + 2] * scale, cy - s[i + 3] * scale);
+          }
+          drawn += s.length / 4;
+        }
+        ctx.stroke();
+      };
+      stroke(weak, styles.weak, 1);
+      stroke(strong, styles.strong, 2);
+      return drawn;
+    }
+
+    return {
+      tasks: {
+        "atan2-field": atan2Field,
+        contours,
+        "atan2-two-sheets": twoSheets,
+        "contour-layer": contourLayer,
+      },
+      // Drawing for canvas tasks whose canvas stayed on the main thread
+      draw: { "contour-layer": drawContours },
+    };
+  }
+
+  // Buffers of every typed array in a (nested) result, to transfer instead of copy
+  function transferables(value, found = []) {
+    if (ArrayBuffer.isView(value)) {
+      if (!found.includes(value.buffer)) found.push(value.buffer);
+    } else if (value && typeof value === "object") {
+      Object.values(value).forEach((v) => transferables(v, found));
+    }
+    return found;
+  }
+
+  const WORKER_SOURCE = `
+const TASKS = (${kernels.toString()})().tasks;
+${transferables.toString()}
+const env = { store: new Map(), canvases: new Map() };
+env.canvas = (key) => env.canvases.get(key);
+self.onmessage = (e) => {
+  const { id, type, key, value, task, params } = e.data;
+  if (type === "canvas") return void env.canvases.set(key, value);
+  if (type === "put") return void env.store.set(key, value);
+  try {
+    const result = TASKS[task](params, env);
+    self.postMessage({ id, result }, transferables(result));
+  } catch (error) {
+    self.postMessage({ id, error: String((error && error.stack) || error) });
+  }
+};`;
+
+  let worker = null;
+  try {
+    if (window.Worker && window.Blob && window.URL) {
+      worker = new Worker(URL.createObjectURL(new Blob([WORKER_SOURCE], { type: "text/javascript" })));
+    }
+  } catch (error) {
+    console.warn("Demo compute worker unavailable, computing on the main thread:", error);
+    worker = null;
+  }
+
+  // The main thread shares the kernels: as a fallback, and to draw returned segments
+  const local = kernels();
+  const localEnv = { store: new Map(), canvases: new Map() };
+  localEnv.canvas = (key) => localEnv.canvases.get(key);
+
+  const pending = new Map();
+  let nextId = 1;
+  if (worker) {
+    worker.onmessage = (e) => {
+      const { id, result, error } = e.data;
+      const request = pending.get(id);
+      pending.delete(id);
+      if (!request) return;
+      if (error) request.reject(new Error(error));
+      else request.resolve(result);
+    };
+  }
+
+  const buffers = (transfer) => transfer.map((a) => (ArrayBuffer.isView(a) ? a.buffer : a));
+
+  // Run a task; typed arrays listed in transfer are moved to the worker, not copied
+  function run(task, params = {}, transfer = []) {
+    if (!worker) {
+      try {
+        return Promise.resolve(local.tasks[task](params, localEnv));
+      } catch (error) {
+        return Promise.reject(error);
+      }
+    }
+    const id = nextId++;
+    return new Promise((resolve, reject) => {
+      pending.set(id, { resolve, reject });
+      worker.postMessage({ id, task, params }, buffers(transfer));
+    });
+  }
+
+  // One request in flight per channel; newer params replace any still waiting, so a
+  // drag never queues up more work than the worker can finish
+  const channels = new Map();
+  function latest(channel, task, params, onResult) {
+    let state = channels.get(channel);
+    if (!state) channels.set(channel, (state = { busy: false, next: null }));
+    state.next = { task, params, onResult };
+    if (!state.busy) pump(state);
+  }
+
+  function pump(state) {
+    const job = state.next;
+    state.next = null;
+    if (!job) {
+      state.busy = false;
+      return;
+    }
+    state.busy = true;
+    run(job.task, job.params)
+      .then(job.onResult, (error) => console.error(`Demo compute task ${job.task} failed:`, error))
+      .then(() => pump(state));
+  }
+
+  // Keep data next to the kernels (e.g. a precomputed field) under a key tasks can name
+  function put(key, value, transfer = []) {
+    if (worker) worker.postMessage({ type: "put", key, value }, buffers(transfer));
+    else localEnv.store.set(key, value);
+  }
+
+  // Hand a canvas to the compute layer; true when it is now drawn off the main thread
+  const mainCanvases = new Map();
+  function attachCanvas(key, canvas) {
+    if (worker && canvas.transferControlToOffscreen) {
+      const offscreen = canvas.transferControlToOffscreen();
+      worker.postMessage({ type: "canvas", key, value: offscreen }, [offscreen]);
+      return true;
+    }
+    mainCanvases.set(key, canvas);
+    localEnv.canvases.set(key, canvas);
+    return false;
+  }
+
+  // Latest-wins canvas task (params.canvas names the canvas); when the canvas could not
+  // move to the worker, the worker's segments are drawn here
+  function draw(task, params) {
+    latest(params.canvas, task, params, (result) => {
+      const canvas = mainCanvases.get(params.canvas);
+      if (canvas && result && !("drawn" in result)) local.draw[task](canvas, result, params);
+    });
+  }
+
+  return { run, latest, put, attachCanvas, draw, inWorker: !!worker };
+})();
+
+window.DemoCompute = DemoCompute;
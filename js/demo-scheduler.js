@@ -0,0 +1,270 @@
+// Render-on-demand scheduler shared by the slide demos and the standalone demo pages
+//
+// Demos register a draw function instead of running their own requestAnimationFrame
+// loop. A frame only runs while a demo is invalidated (input, state change) or
+// animating, its element is still in the document and the tab is visible. showSlide()
+// brackets each slide with beginSlide()/teardown(), so the timers, animation frames,
+// listeners and demos a slide started are all stopped when the presenter moves on.
+
+const DemoScheduler = (function () {
+  const nativeSetTimeout = window.setTimeout.bind(window);
+  const nativeSetInterval = window.setInterval.bind(window);
+  const nativeClearTimeout = window.clearTimeout.bind(window);
+  const nativeRequestFrame = window.requestAnimationFrame.bind(window);
+  const nativeCancelFrame = window.cancelAnimationFrame.bind(window);
+
+  // Events that mean "the user did something, redraw"
+  const INPUT_EVENTS = ["pointerdown", "pointermove", "pointerup", "wheel", "click", "input", "change", "keydown"];
+  const FRAME_SAMPLES = 120;
+
+  const demos = new Set();
+  const stats = new Map();
+  const frameObservers = [];
+  let frame = 0;
+
+  // What the current slide started; null while no slide is being set up
+  let scope = null;
+  let slide = newScope();
+
+  function newScope() {
+    return { timers: new Set(), frames: new Set(), listeners: [], cleanups: [] };
+  }
+
+  // ---- Demos -------------------------------------------------------------
+
+  function register(name, element, draw, options = {}) {
+    const demo = {
+      name,
+      element,
+      draw,
+      dirty: true,
+      animating: !!options.animate,
+      lastTime: 0,
+      owner: slide,
+    };
+    demos.add(demo);
+    if (!stats.has(name)) {
+      stats.set(name, { frames: 0, total: 0, max: 0, samples: [] });
+    }
+    schedule();
+
+    return {
+      // Redraw once on the next frame (many calls per frame coalesce into one draw)
+      invalidate() {
+        demo.dirty = true;
+        schedule();
+      },
+      // Draw every frame until stop(), e.g. while an auto-rotation is on
+      start() {
+        demo.animating = true;
+        schedule();
+      },
+      stop() {
+        demo.animating = false;
+      },
+      // Invalidate on events under target; with the default input events, hovering
+      // alone does not redraw (pass "pointermove" explicitly for hover effects)
+      invalidateOn(target, events = INPUT_EVENTS) {
+        const hover = events !== INPUT_EVENTS;
+        events.forEach((type) => {
+          listen(target, type, (e) => {
+            if (type === "pointermove" && !hover && !e.buttons) return;
+            demo.dirty = true;
+            schedule();
+          }, { passive: true, capture: true });
+        });
+        return this;
+      },
+      dispose() {
+        demos.delete(demo);
+      },
+    };
+  }
+
+  function schedule() {
+    if (frame || document.hidden) return;
+    for (const demo of demos) {
+      if (demo.dirty || demo.animating) {
+        frame = nativeRequestFrame(tick);
+        return;
+      }
+    }
+  }
+
+  function tick(now) {
+    frame = 0;
+    for (const demo of Array.from(demos)) {
+      // The slide was swapped out (or the element removed) - suspend for good
+      if (!demo.element.isConnected) {
+        demos.delete(demo);
+        continue;
+      }
+      if (!demo.dirty && !demo.animating) {
+        demo.lastTime = 0;
+        continue;
+      }
+
+      demo.dirty = false;
+      const start = performance.now();
+      let again = false;
+      try {
+        // draw(now, dt) may return true to ask for one more frame (e.g. easing)
+        again = demo.draw(now, demo.lastTime ? now - demo.lastTime : 0) === true;
+      } catch (error) {
+        console.error(`Demo ${demo.name} failed to draw, stopping it:`, error);
+        demos.delete(demo);
+        continue;
+      }
+      record(demo.name, performance.now() - start);
+      demo.lastTime = now;
+      if (again) demo.dirty = true;
+    }
+    schedule();
+  }
+
+  function record(name, ms) {
+    const s = stats.get(name);
+    s.frames++;
+    s.total += ms;
+    s.max = Math.max(s.max, ms);
+    s.samples.push(ms);
+    if (s.samples.length > FRAME_SAMPLES) s.samples.shift();
+    frameObservers.forEach((observer) => observer(name, ms));
+  }
+
+  // observer(demo name, draw ms) after every frame, e.g. for the perf HUD
+  function onFrame(observer) {
+    frameObservers.push(observer);
+  }
+
+  // Per-demo frame times in ms: mean and max over the session, p95 over recent frames
+  function frameStats() {
+    return Array.from(stats, ([name, s]) => {
+      const recent = s.samples.slice().sort((a, b) => a - b);
+      return {
+        demo: name,
+        frames: s.frames,
+        mean_ms: s.frames ? +(s.total / s.frames).toFixed(2) : 0,
+        p95_ms: recent.length ? +recent[Math.min(recent.length - 1, Math.floor(recent.length * 0.95))].toFixed(2) : 0,
+        max_ms: +s.max.toFixed(2),
+        active: Array.from(demos).some((d) => d.name === name && (d.dirty || d.animating)),
+      };
+    });
+  }
+
+  function report() {
+    const rows = frameStats();
+    console.table(rows);
+    return rows;
+  }
+
+  // ---- Slide scope: timers, frames, listeners ----------------------------
+
+  // Run callback with the scope that created it, so chained timers stay tracked
+  function scoped(owner, callback) {
+    return function () {
+      const outer = scope;
+      scope = owner;
+      try {
+        return callback.apply(this, arguments);
+      } finally {
+        scope = outer;
+      }
+    };
+  }
+
+  window.setTimeout = function (callback, delay, ...args) {
+    if (!scope || typeof callback !== "function") return nativeSetTimeout(callback, delay, ...args);
+    const owner = scope;
+    const run = scoped(owner, callback);
+    const id = nativeSetTimeout(function () {
+      owner.timers.delete(id);
+      return run.apply(this, arguments);
+    }, delay, ...args);
+    owner.timers.add(id);
+    return id;
+  };
+
+  window.setInterval = function (callback, delay, ...args) {
+    if (!scope || typeof callback !== "function") return nativeSetInterval(callback, delay, ...args);
+    const id = nativeSetInterval(scoped(scope, callback), delay, ...args);
+    scope.timers.add(id);
+    return id;
+  };
+
+  window.requestAnimationFrame = function (callback) {
+    if (!scope) return nativeRequestFrame(callback);
+    const owner = scope;
+    const run = scoped(owner, callback);
+    const id = nativeRequestFrame(function (now) {
+      owner.frames.delete(id);
+      return run(now);
+    });
+    owner.frames.add(id);
+    return id;
+  };
+
+  // Listener on a long-lived target (window, document) removed with the slide
+  function listen(target, type, handler, options) {
+    target.addEventListener(type, handler, options);
+    slide.listeners.push([target, type, handler, options]);
+  }
+
+  // Extra cleanup for the current slide, e.g. removing a Leaflet map
+  function onTeardown(callback) {
+    slide.cleanups.push(callback);
+  }
+
+  // Everything created until endSlide() belongs to the new slide
+  function beginSlide() {
+    teardown();
+    scope = slide;
+  }
+
+  function endSlide() {
+    scope = null;
+  }
+
+  // Back into the current slide's scope, for demos initialized once their modules load
+  function resumeSlide() {
+    scope = slide;
+  }
+
+  function teardown() {
+    const old = slide;
+    slide = newScope();
+    scope = null;
+
+    old.timers.forEach((id) => nativeClearTimeout(id));
+    old.frames.forEach((id) => nativeCancelFrame(id));
+    old.listeners.forEach(([target, type, handler, options]) => target.removeEventListener(type, handler, options));
+    old.cleanups.forEach((callback) => {
+      try {
+        callback();
+      } catch (error) {
+        console.warn("Slide cleanup failed:", error);
+      }
+    });
+    demos.forEach((demo) => {
+      if (demo.owner === old) demos.delete(demo);
+    });
+  }
+
+  // Hidden tabs draw nothing; catch up with one frame when the tab comes back
+  document.addEventListener("visibilitychange", () => {
+    if (document.hidden) {
+      if (frame) nativeCancelFrame(frame);
+      frame = 0;
+      demos.forEach((demo) => (demo.lastTime = 0));
+    } else {
+      demos.forEach((demo) => (demo.dirty = true));
+      schedule();
+    }
+  });
+
+  return {
+    register, listen, onTeardown, beginSlide, endSlide, resumeSlide, teardown, frameStats, report, onFrame, INPUT_EVENTS,
+  };
+})();
+
+window.DemoScheduler = DemoScheduler;
@@ -103,13 +103,40 @@ function initFlightPhotoWindow() {
       return distance;
     }
 
+    const windows = [
+      { start: MORNING_START, end: MORNING_END, name: "Morning" },
+      { start: AFTERNOON_START, end: AFTERNOON_END, name: "Afternoon" },
+    ];
+
+    // Answers for every quarter-hour arrival, precomputed at build time (photo_scheduler.py);
+    // only used when they were computed for these same windows
+    const scenarios = window.DEMO_BUFFERS && window.DEMO_BUFFERS["photo-windows"];
+    const SCENARIO_STEP = 0.25;
+    const useScenarios =
+      !!scenarios &&
+      scenarios.optimal.length === 24 / SCENARIO_STEP &&
+      windows.every(
+        (w, i) =>
+          scenarios.windows[2 * i] === w.start &&
+          scenarios.windows[2 * i + 1] === w.end
+      );
+
+    function lookupOptimalWindow(arrivalTime) {
+      const i = Math.round(arrivalTime / SCENARIO_STEP) % scenarios.optimal.length;
+      const optimal = windows[scenarios.optimal[i]];
+      const naive = windows[scenarios.naive[i]];
+      return {
+        optimal,
+        optimalWait: scenarios.optimalWait[i],
+        naive,
+        naiveWait: scenarios.naiveWait[i],
+        differentChoice: optimal.name !== naive.name,
+      };
+    }
+
     // Find OPTIMAL photo window - this is where embedding shines!
     function findOptimalWindow(arrivalTime) {
-      // Check all windows and find the best one
-      const windows = [
-        { start: MORNING_START, end: MORNING_END, name: "Morning" },
-        { start: AFTERNOON_START, end: AFTERNOON_END, name: "Afternoon" },
-      ];
+      if (useScenarios) return lookupOptimalWindow(arrivalTime);
 
       let bestWindow = null;
       let shortestWait = 24;
@@ -65,15 +65,28 @@ function initGISDemo() {
     });
     window.gisMap = map; // Store reference for cleanup
 
-    // OSM tiles with attribution
-    let tiles = L.tileLayer(
-      "https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png",
-      {
+    // Drop the map, its window listeners and the label styles when the slide is left
+    if (window.DemoScheduler) {
+      DemoScheduler.onTeardown(() => {
+        map.remove();
+        style.remove();
+        if (window.gisMap === map) window.gisMap = null;
+      });
+    }
+
+    // OSM tiles with attribution - from the build's offline tile pack when the deck has one
+    function baseTiles(noWrap) {
+      const options = {
         maxZoom: 19,
         attribution:
           '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors',
-      }
-    ).addTo(map);
+        noWrap,
+      };
+      if (window.TilePack && TilePack.available()) return TilePack.layer(options);
+      return L.tileLayer("https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png", options);
+    }
+
+    let tiles = baseTiles(false).addTo(map);
     window.gisTiles = tiles;
 
     // Two draggable points that straddle the International Date Line (the REAL wraparound!)
@@ -244,15 +257,7 @@ function initGISDemo() {
       noWrapTilesCheckbox.addEventListener("change", (e) => {
         const noWrap = !!e.target.checked;
         map.removeLayer(tiles);
-        tiles = L.tileLayer(
-          "https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png",
-          {
-            maxZoom: 19,
-            attribution:
-              '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors',
-            noWrap,
-          }
-        ).addTo(map);
+        tiles = baseTiles(noWrap).addTo(map);
         window.gisTiles = tiles;
       });
     }
@@ -36,6 +36,21 @@ function initHueDragWheel() {
   const barCircular = document.getElementById("barCircular");
   const barNaive = document.getElementById("barNaive");
 
+  // Hue lookup tables baked at build time (CSS hsl() strings when they are absent, or were
+  // baked at other saturation/lightness values than S and L here)
+  const lut = window.DEMO_BUFFERS && window.DEMO_BUFFERS["hue-lut"];
+  function hueColor(hue, table = "hsl") {
+    const lightness = table === "hsl_handle" ? Math.min(70, L + 20) : L;
+    const baked = lut && lut[`${table}_channels`];
+    if (!baked || baked[0] !== S || baked[1] !== lightness) {
+      return `hsl(${hue}, ${S}%, ${lightness}%)`;
+    }
+    const t = lut[table];
+    const n = t.length / 3;
+    const i = 3 * (Math.round((hue * n) / 360) % n);
+    return `rgb(${t[i]}, ${t[i + 1]}, ${t[i + 2]})`;
+  }
+
   // Helpers
   const clamp360 = (h) => ((h % 360) + 360) % 360;
   const deg2rad = (d) => (d * Math.PI) / 180;
@@ -65,7 +80,7 @@ function initHueDragWheel() {
     elLine.setAttribute("x2", x);
     elLine.setAttribute("y2", y);
     // Color the line according to its hue
-    elLine.setAttribute("stroke", `hsl(${hue}, ${S}%, ${L}%)`);
+    elLine.setAttribute("stroke", hueColor(hue));
     elLine.setAttribute("stroke-width", width);
     if (dash) {
       elLine.setAttribute("stroke-dasharray", dash);
@@ -75,10 +90,7 @@ function initHueDragWheel() {
     elHandle.setAttribute("cx", x);
     elHandle.setAttribute("cy", y);
     // Color the handle with the same hue, slightly lighter
-    elHandle.setAttribute(
-      "fill",
-      `hsl(${hue}, ${S}%, ${Math.min(70, L + 20)}%)`
-    );
+    elHandle.setAttribute("fill", hueColor(hue, "hsl_handle"));
     // Position label slightly outside the handle
     const labelOffset = 18;
     const angle = deg2rad(hue - 90); // Apply rotation for label positioning
@@ -86,7 +98,7 @@ function initHueDragWheel() {
     elLabel.setAttribute("y", y + labelOffset * Math.sin(angle));
   }
   function setChip(dot, degree, hue) {
-    dot.style.background = `hsl(${hue}, ${S}%, ${L}%)`;
+    dot.style.background = hueColor(hue);
     degree.textContent = `${Math.round(hue)}°`;
   }
   function setArc(h1, h2) {
@@ -109,8 +121,8 @@ function initHueDragWheel() {
       const t = i / steps;
       const hm = clamp360(h1 + shortestDelta(h1, h2) * t);
       const hn = clamp360(h1 + (h2 - h1) * t);
-      colsCirc.push(`hsl(${hm}, ${S}%, ${L}%)`);
-      colsNaive.push(`hsl(${hn}, ${S}%, ${L}%)`);
+      colsCirc.push(hueColor(hm));
+      colsNaive.push(hueColor(hn));
     }
     barCircular.style.background = `linear-gradient(90deg, ${colsCirc.join(
       ","
@@ -138,6 +150,14 @@ function initHueDragWheel() {
     setBars(H1, H2);
   }
 
+  // Pointer events arrive faster than frames; the scheduler draws at most once per frame
+  const view = window.DemoScheduler
+    ? DemoScheduler.register("hue-drag-wheel", svg, render)
+    : { invalidate: render };
+  const listen = window.DemoScheduler
+    ? DemoScheduler.listen
+    : (target, type, handler) => target.addEventListener(type, handler);
+
   // Dragging
   function makeDraggable(handle, which) {
     let dragging = false;
@@ -154,15 +174,15 @@ function initHueDragWheel() {
       const hue = hueFromPoint(x, y);
       if (which === "A") H1 = hue;
       else H2 = hue;
-      render();
+      view.invalidate();
     }
     function onUp(e) {
       dragging = false;
       handle.releasePointerCapture?.(e.pointerId);
     }
     handle.addEventListener("pointerdown", onDown);
-    window.addEventListener("pointermove", onMove);
-    window.addEventListener("pointerup", onUp);
+    listen(window, "pointermove", onMove);
+    listen(window, "pointerup", onUp);
   }
   makeDraggable(hA, "A");
   makeDraggable(hB, "B");
@@ -177,8 +197,8 @@ function initHueDragWheel() {
       dB = Math.abs(shortestDelta(hue, H2));
     if (dA <= dB) H1 = hue;
     else H2 = hue;
-    render();
+    view.invalidate();
   });
 
-  render();
+  view.invalidate();
 }
@@ -0,0 +1,84 @@
+// Offline Leaflet tiles from the build's tile pack (window.TILE_PACK, see tile_pack.py)
+//
+// In the single file every tile is WebP inside one base64 blob, decoded on first use into
+// Blob URLs that are kept for the whole talk. The bundle loads tiles/{z}/{x}/{y}.webp from
+// next to index.html. Tiles the pack does not have are left blank without a request, so
+// panning across the antimeridian and rebuilding the layer never touch the network.
+
+const TilePack = (function () {
+  const urls = new Map();
+  let slots = null;
+  let bytes = null;
+
+  function pack() {
+    return window.TILE_PACK || null;
+  }
+
+  // Position of a "z/x/y" tile in the pack, or undefined
+  function slot(key) {
+    if (!slots) {
+      slots = new Map();
+      pack().tiles.forEach((name, i) => slots.set(name, i));
+    }
+    return slots.get(key);
+  }
+
+  function decode(base64) {
+    const binary = atob(base64);
+    const out = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) out[i] = binary.charCodeAt(i);
+    return out;
+  }
+
+  // URL of a packed tile, or null when it is not in the pack
+  function tileUrl(z, x, y) {
+    const p = pack();
+    const key = z + "/" + x + "/" + y;
+    const i = slot(key);
+    if (i === undefined) return null;
+    if (!p.base64) return p.url.replace("{z}", z).replace("{x}", x).replace("{y}", y);
+
+    let url = urls.get(key);
+    if (!url) {
+      if (!bytes) bytes = decode(p.base64);
+      const tile = bytes.subarray(p.offsets[i], p.offsets[i + 1]);
+      url = URL.createObjectURL(new Blob([tile], { type: "image/webp" }));
+      urls.set(key, url);
+    }
+    return url;
+  }
+
+  // Leaflet layer serving the pack; options as for L.tileLayer, e.g. noWrap. The pack's own
+  // attribution (MBTiles metadata or build.tile_pack.attribution) wins over options.attribution.
+  // Leaflet wraps tile columns before createTile(), so world copies reuse the same tiles.
+  function layer(options) {
+    const p = pack();
+    const PackLayer = L.GridLayer.extend({
+      createTile(coords, done) {
+        const url = tileUrl(coords.z, coords.x, coords.y);
+        if (!url) {
+          const blank = document.createElement("div");
+          setTimeout(() => done(null, blank), 0);
+          return blank;
+        }
+        const tile = document.createElement("img");
+        tile.alt = "";
+        tile.setAttribute("role", "presentation");
+        tile.onload = () => done(null, tile);
+        tile.onerror = (error) => done(error, tile);
+        tile.src = url;
+        return tile;
+      },
+    });
+    return new PackLayer({
+      ...options,
+      minNativeZoom: p.minZoom,
+      maxNativeZoom: p.maxZoom,
+      attribution: p.attribution || (options && options.attribution),
+    });
+  }
+
+  return { available: () => !!pack(), layer, tileUrl };
+})();
+
+window.TilePack = TilePack;
@@ -0,0 +1,115 @@
+// UTC <-> local wall-clock conversion for IANA time zones, from build-time tables
+//
+// The build embeds a UTC-offset transition table for every zone a deck mentions as
+// window.DEMO_BUFFERS["tz:<zone>"] (see tz_tables.py): sorted transition instants and the
+// offset that applies after each one. Lookups are binary searches over those typed arrays,
+// so converting a time never constructs an Intl.DateTimeFormat. Zones without a table, and
+// instants outside the years it covers, use one cached Intl formatter per zone instead.
+//
+// "Local ms" below means the wall-clock time encoded as if it were UTC, i.e. what
+// Date.UTC(year, month - 1, day, hour, minute) returns for the time on the local clock.
+
+const TimeZones = (function () {
+  const DAY = 86400;
+  const formatters = new Map();
+
+  function table(zone) {
+    const buffers = window.DEMO_BUFFERS;
+    return (buffers && buffers["tz:" + zone]) || null;
+  }
+
+  // Number of transitions at or before t
+  function upperBound(sorted, t) {
+    let lo = 0;
+    let hi = sorted.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      if (sorted[mid] <= t) lo = mid + 1;
+      else hi = mid;
+    }
+    return lo;
+  }
+
+  function intlOffset(zone, seconds) {
+    let formatter = formatters.get(zone);
+    if (!formatter) {
+      formatter = new Intl.DateTimeFormat("en-US", {
+        timeZone: zone,
+        hourCycle: "h23",
+        year: "numeric",
+        month: "numeric",
+        day: "numeric",
+        hour: "numeric",
+        minute: "numeric",
+        second: "numeric",
+      });
+      formatters.set(zone, formatter);
+    }
+    const parts = {};
+    formatter.formatToParts(new Date(seconds * 1000)).forEach((p) => (parts[p.type] = p.value));
+    const local = Date.UTC(+parts.year, parts.month - 1, +parts.day, +parts.hour, +parts.minute, +parts.second);
+    return local / 1000 - seconds;
+  }
+
+  // UTC offset in seconds at a UTC instant in whole seconds
+  function offsetSeconds(zone, seconds) {
+    const t = table(zone);
+    if (t && seconds >= t.range[0] && seconds < t.range[1]) {
+      return t.offsets[upperBound(t.transitions, seconds)];
+    }
+    return intlOffset(zone, seconds);
+  }
+
+  // UTC offset in ms at an instant (epoch ms)
+  function offsetAt(zone, epochMs) {
+    return offsetSeconds(zone, Math.floor(epochMs / 1000)) * 1000;
+  }
+
+  // Local ms on the zone's clocks at an instant
+  function toLocal(zone, epochMs) {
+    return epochMs + offsetAt(zone, epochMs);
+  }
+
+  // Instant for a local time: {instant, status: "valid" | "fold" | "gap", ...}
+  //
+  // In a fold (clocks went back, the time happens twice) the earlier instant is used,
+  // or the later one with fold = 1, and `later` holds the other. In a gap (clocks went
+  // forward, the time never happens) the time is read with the offset from before the
+  // transition, moving it forward by the gap; `adjusted` is the local ms it lands on.
+  // Same rules as Python's datetime (PEP 495) and tz_tables.local_to_utc().
+  function fromLocal(zone, localMs, fold = 0) {
+    const local = Math.floor(localMs / 1000);
+    const fraction = localMs - local * 1000;
+    const before = offsetSeconds(zone, local - DAY);
+    const after = offsetSeconds(zone, local + DAY);
+    const earlyOk = offsetSeconds(zone, local - before) === before;
+    const lateOk = offsetSeconds(zone, local - after) === after;
+    const early = (local - before) * 1000 + fraction;
+    const late = (local - after) * 1000 + fraction;
+
+    if (earlyOk && lateOk && before !== after) {
+      return { instant: fold ? late : early, status: "fold", earlier: early, later: late };
+    }
+    if (earlyOk || lateOk) {
+      return { instant: earlyOk ? early : late, status: "valid" };
+    }
+    const instant = fold ? late : early;
+    return { instant, status: "gap", adjusted: toLocal(zone, instant) };
+  }
+
+  // Local ms for "YYYY-MM-DD" and "HH:MM" strings, e.g. from date and time inputs
+  function localMs(dateStr, timeStr) {
+    const [year, month, day] = dateStr.split("-").map(Number);
+    const [hour, minute] = timeStr.split(":").map(Number);
+    return Date.UTC(year, month - 1, day, hour, minute);
+  }
+
+  // "HH:MM" of a local ms value
+  function formatLocalTime(local) {
+    return new Date(local).toISOString().substring(11, 16);
+  }
+
+  return { offsetAt, toLocal, fromLocal, localMs, formatLocalTime, hasTable: (zone) => !!table(zone) };
+})();
+
+window.TimeZones = TimeZones;
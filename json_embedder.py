@@ -1,16 +1,95 @@
 #!/usr/bin/env python3
 """
 JSON Data Embedder for Presentation Build System
-Simplified - no external data dependencies
+Simplified - no external data dependencies, plus build-time lookup tables
 """
 
+import json
+import base64
+
 from templates import JSON_EMBED
+from template_engine import TemplateSet
+from geometry_buffers import np, pack_buffers
 
 
 class JSONDataEmbedder:
     """Simplified data embedder with no external dependencies"""
 
-    @staticmethod
-    def load_and_embed_json_data():
-        """Return simplified JavaScript embedding code (no external data needed)"""
-        return JSON_EMBED
\ No newline at end of file
+    def __init__(self, config=None, progress=print, templates=None):
+        build_config = (config or {}).get('build') or {}
+        self.lut_config = build_config.get('hue_luts')
+        self.tz_config = build_config.get('timezones', {})
+        self.photo_config = build_config.get('photo_windows')
+        # Zones for js/timezones.js; None until a built slide is known to load it
+        self.timezones = None
+        self.log = progress
+        # The builder's TemplateSet, so a deck's templates/demo_buffers.js applies
+        self.templates = templates or TemplateSet(progress=progress)
+        self._embed_js = None
+
+    def use_timezones(self, zones):
+        """Zones the deck mentions; their transition tables are embedded alongside the LUTs
+
+        None means no built slide loads js/timezones.js, and no tables are embedded.
+        """
+        self.timezones = sorted(zones) if zones is not None else None
+        self._embed_js = None
+
+    def load_and_embed_json_data(self):
+        """Return JavaScript embedding code: no external data, plus baked tables if enabled"""
+        if self._embed_js is None:
+            self._embed_js = JSON_EMBED + self._demo_buffers_js()
+        return self._embed_js
+
+    def _demo_buffers_js(self):
+        """window.DEMO_BUFFERS with every table the deck uses, in one base64 blob"""
+        buffers = {**self._hue_lut_buffers(), **self._photo_window_buffers(), **self._timezone_buffers()}
+        if not buffers:
+            return ""
+        blob, layout = pack_buffers(buffers)
+        return "\n" + self.templates.render('DEMO_BUFFERS',
+                                            LAYOUT_JSON=json.dumps(layout, separators=(',', ':')),
+                                            BUFFER_BASE64=base64.b64encode(blob).decode('ascii'))
+
+    def _hue_lut_buffers(self):
+        """DEMO_BUFFERS['hue-lut'] for the hue drag wheel, as compact uint8 tables"""
+        if not self.lut_config:
+            return {}
+        if np is None:
+            self.log("   ⚠️  NumPy not installed - hue wheel falls back to CSS hsl() colors")
+            return {}
+
+        from hue_lut import deck_tables
+        size = self.lut_config.get('size', 360) if isinstance(self.lut_config, dict) else 360
+        return {'hue-lut': deck_tables(size)}
+
+    def _photo_window_buffers(self):
+        """DEMO_BUFFERS['photo-windows'] scenario answers for the flight photo-window slide"""
+        if not self.photo_config:
+            return {}
+        if np is None:
+            self.log("   ⚠️  NumPy not installed - photo-window slide computes its windows in the browser")
+            return {}
+
+        from photo_scheduler import demo_scenarios
+        step = self.photo_config.get('step', 0.25) if isinstance(self.photo_config, dict) else 0.25
+        return {'photo-windows': demo_scenarios(step)}
+
+    def _timezone_buffers(self):
+        """DEMO_BUFFERS['tz:<zone>'] UTC-offset transitions for js/timezones.js"""
+        if self.tz_config is False or self.timezones is None:
+            return {}
+        tz_config = self.tz_config if isinstance(self.tz_config, dict) else {}
+        zones = sorted(set(self.timezones) | set(tz_config.get('zones') or []))
+        if not zones:
+            return {}
+        if np is None:
+            self.log("   ⚠️  NumPy not installed - time zone demos fall back to Intl")
+            return {}
+
+        from tz_tables import DEFAULT_YEARS, deck_tables
+        years = tuple(tz_config.get('years') or DEFAULT_YEARS)
+        buffers = deck_tables(zones, years)
+        size = sum(array.nbytes for arrays in buffers.values() for array in arrays.values())
+        self.log(f"   🕒 Embedded offset tables for {', '.join(zones)} ({years[0]}-{years[1]}, {size:,} bytes)")
+        return buffers
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Payload Report for Presentation Build System
+Per-slide byte accounting for the single-file deck, plus budget enforcement
+"""
+
+import re
+from demo_modules import slide_modules, libraries_for_slide
+
+
+SCRIPT_RE = re.compile(r'<script\b[^>]*>.*?</script>', re.IGNORECASE | re.DOTALL)
+STYLE_RE = re.compile(r'<style\b[^>]*>.*?</style>', re.IGNORECASE | re.DOTALL)
+DATA_URL_PREFIX = len("data:image/webp;base64,")
+
+
+class BudgetExceededError(Exception):
+    """Raised when a slide or the whole deck is over its configured byte budget"""
+
+
+def _utf8_len(text):
+    return len(text.encode('utf-8'))
+
+
+class PayloadReport:
+    """Collects what each slide costs in the shipped single-file deck"""
+
+    def __init__(self, config):
+        self.budgets = config['build'].get('budgets') or {}
+        self.slides = []
+        self.deck_bytes = 0
+
+    def account(self, slides_content, output, module_sizes, deck_bytes):
+        """Measure every slide; output is the build_fs tree holding processed assets"""
+        self.deck_bytes = deck_bytes
+        self.slides = []
+        for slide in slides_content:
+            content = slide['content']
+            scripts = SCRIPT_RE.findall(content)
+            styles = STYLE_RE.findall(content)
+            markup = STYLE_RE.sub('', SCRIPT_RE.sub('', content))
+
+            # Embedded images cost their base64 data URL, which is 4/3 of the WebP bytes
+            asset_bytes = 0
+            for asset in slide['assets']:
+                if asset['type'] == 'image' and asset.get('processed') and output.exists(asset['processed']):
+                    asset_bytes += DATA_URL_PREFIX + 4 * ((output.size(asset['processed']) + 2) // 3)
+
+            modules = slide_modules(content, module_sizes)
+            entry = {
+                'slide': slide['file'],
+                'number': slide['number'],
+                'title': slide['title'],
+                'html_bytes': _utf8_len(markup),
+                'script_bytes': sum(_utf8_len(s) for s in scripts),
+                'style_bytes': sum(_utf8_len(s) for s in styles),
+                'asset_bytes': asset_bytes,
+                'runtime_bytes': sum(module_sizes[m] for m in modules),
+                'runtime_modules': modules,
+                'runtime_libraries': libraries_for_slide(markup, module_sizes),
+            }
+            entry['total_bytes'] = (entry['html_bytes'] + entry['script_bytes'] + entry['style_bytes']
+                                    + entry['asset_bytes'] + entry['runtime_bytes'])
+            self.slides.append(entry)
+        return self.slides
+
+    def to_manifest(self):
+        """Manifest section: per-slide entries plus deck totals and budgets"""
+        slide_total = sum(s['total_bytes'] - s['runtime_bytes'] for s in self.slides)
+        return {
+            'deck_bytes': self.deck_bytes,
+            # Template, CSS, navigation and every js/ module are shipped regardless of slide
+            'shell_bytes': max(self.deck_bytes - slide_total, 0),
+            'budgets': self.budgets,
+            'slides': self.slides,
+        }
+
+    def violations(self):
+        """Budget violations as human readable strings"""
+        problems = []
+        deck_budget = self.budgets.get('deck_bytes')
+        if deck_budget and self.deck_bytes > deck_budget:
+            problems.append(f"deck is {self.deck_bytes} bytes (budget {deck_budget})")
+
+        default_budget = self.budgets.get('slide_bytes')
+        per_slide = self.budgets.get('slides') or {}
+        for slide in self.slides:
+            budget = per_slide.get(slide['slide'], default_budget)
+            if budget and slide['total_bytes'] > budget:
+                problems.append(f"{slide['slide']} is {slide['total_bytes']} bytes (budget {budget})")
+        return problems
+
+    def check_budgets(self):
+        """Fail the build if anything is over budget"""
+        problems = self.violations()
+        if problems:
+            raise BudgetExceededError("Payload budget exceeded:\n   " + "\n   ".join(problems))
+
+    def print_table(self, log=print, human_size=str):
+        """Ranked table of the heaviest slides"""
+        if not self.slides:
+            return
+        log("\n📦 Slide payloads (single file, heaviest first):")
+        log(f"   {'#':>3}  {'Slide':<36} {'HTML':>8} {'Scripts':>8} {'Styles':>8} "
+            f"{'Assets':>8} {'Runtime':>8} {'Total':>8}")
+        for slide in sorted(self.slides, key=lambda s: s['total_bytes'], reverse=True):
+            log(f"   {slide['number']:>3}  {slide['slide'][:36]:<36} "
+                f"{human_size(slide['html_bytes']):>8} {human_size(slide['script_bytes']):>8} "
+                f"{human_size(slide['style_bytes']):>8} {human_size(slide['asset_bytes']):>8} "
+                f"{human_size(slide['runtime_bytes']):>8} {human_size(slide['total_bytes']):>8}")
+        log(f"   Deck: {human_size(self.deck_bytes)} "
+            f"(shell + shared runtime: {human_size(self.to_manifest()['shell_bytes'])})")
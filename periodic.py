@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Periodic Arrays for Presentation Build System
+Array-backed periodic quantities (hue, time of day, longitude, any [low, low + period))
+"""
+
+import numpy as np
+
+import circstats
+from circstats import TAU
+
+
+class PeriodicArray:
+    """A NumPy buffer of values in [low, low + period) with wrap-aware arithmetic
+
+    Arithmetic is vectorized over the whole buffer; no per-element Python objects are
+    created. Subtracting two periodic arrays gives the shortest signed difference as a
+    plain ndarray, adding an offset gives a new periodic array. Ordering compares along
+    the shortest arc, so a < b means b is less than half a period ahead of a.
+    """
+
+    __slots__ = ('data', 'period', 'low')
+    # Make ndarray op PeriodicArray defer to our reflected operators
+    __array_ufunc__ = None
+
+    def __init__(self, values, period=TAU, low=None, copy=True):
+        """Wrap values into [low, low + period); copy=False wraps a float array in place"""
+        self.period = float(period)
+        self.low = -self.period / 2 if low is None else float(low)
+        values = np.asarray(values)
+        in_place = not copy and np.issubdtype(values.dtype, np.floating) and values.flags.writeable
+        self.data = circstats.wrap(values, self.low, self.period, out=values if in_place else None)
+        self.data = np.asarray(self.data)
+
+    @classmethod
+    def radians(cls, values, **kwargs):
+        return cls(values, TAU, -np.pi, **kwargs)
+
+    @classmethod
+    def degrees(cls, values, **kwargs):
+        return cls(values, 360.0, -180.0, **kwargs)
+
+    @classmethod
+    def hue(cls, values, **kwargs):
+        """Hue in degrees, [0, 360)"""
+        return cls(values, 360.0, 0.0, **kwargs)
+
+    @classmethod
+    def longitude(cls, values, **kwargs):
+        """Longitude in degrees, [-180, 180)"""
+        return cls(values, 360.0, -180.0, **kwargs)
+
+    @classmethod
+    def time_of_day(cls, hours, **kwargs):
+        """Hours since midnight, [0, 24)"""
+        return cls(hours, 24.0, 0.0, **kwargs)
+
+    @classmethod
+    def from_embedding(cls, xy, period=TAU, low=None):
+        """Inverse of embedding(): angles of the [..., 2] cos/sin vectors (read as views)"""
+        xy = np.asarray(xy)
+        angles = np.arctan2(xy[..., 1], xy[..., 0])
+        angles *= period / TAU
+        return cls(angles, period, low, copy=False)
+
+    def _like(self, values, copy=False):
+        return PeriodicArray(values, self.period, self.low, copy=copy)
+
+    def _view(self, data):
+        """Share already-wrapped data without re-wrapping (or copying) it"""
+        view = object.__new__(PeriodicArray)
+        view.data, view.period, view.low = data, self.period, self.low
+        return view
+
+    def _values_of(self, other):
+        """Raw values of an operand, checking periodic operands share our period"""
+        if isinstance(other, PeriodicArray):
+            if other.period != self.period:
+                raise ValueError(f"period mismatch: {self.period} vs {other.period}")
+            return other.data
+        return other
+
+    # Array protocol
+
+    def __array__(self, dtype=None, copy=None):
+        return self.data if dtype is None else self.data.astype(dtype, copy=False)
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        item = self.data[index]
+        return self._view(item) if np.ndim(item) else item
+
+    def __setitem__(self, index, values):
+        self.data[index] = circstats.wrap(self._values_of(values), self.low, self.period)
+
+    def __float__(self):
+        return float(self.data)
+
+    def __repr__(self):
+        return f"PeriodicArray({self.data!r}, period={self.period:g}, low={self.low:g})"
+
+    # Arithmetic
+
+    def __add__(self, other):
+        return self._like(self.data + self._values_of(other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, PeriodicArray):
+            return self.diff(other)
+        return self._like(self.data - other)
+
+    def __rsub__(self, other):
+        return self._like(other - self.data)
+
+    def __neg__(self):
+        return self._like(-self.data)
+
+    def diff(self, other=None, axis=-1):
+        """Shortest signed difference self - other, or consecutive steps along axis"""
+        if other is None:
+            steps = np.diff(self.data, axis=axis)
+            return circstats.wrap(steps, -self.period / 2, self.period, out=steps)
+        return circstats.wrapped_diff(self.data, self._values_of(other), self.period)
+
+    def interp(self, other, t):
+        """Point a fraction t of the way along the shortest arc from self to other"""
+        step = circstats.wrapped_diff(self._values_of(other), self.data, self.period)
+        # t may broadcast against the hues (e.g. a column of steps), so this is not in place
+        step = step * np.asarray(t)
+        step += self.data
+        return self._like(step)
+
+    def mean(self, axis=None, weights=None):
+        """Circular mean; NaN where it is undefined"""
+        return self._like(circstats.circular_mean(self.data, axis, weights, self.period, self.low))
+
+    def resultant_length(self, axis=None, weights=None):
+        return circstats.resultant_length(self.data, axis, weights, period=self.period)
+
+    def std(self, axis=None, weights=None):
+        """Circular standard deviation in the units of the period"""
+        return circstats.circular_std(self.data, axis, weights, self.period)
+
+    def unwrap(self, axis=-1):
+        """Continuous ndarray with the period jumps removed"""
+        return circstats.unwrap(self.data, axis, self.period)
+
+    def with_low(self, low):
+        """Same angles, wrapped into [low, low + period)"""
+        return PeriodicArray(self.data, self.period, low)
+
+    def embedding(self, out=None):
+        """[..., 2] array of (cos, sin); writes straight into out without temporaries"""
+        if out is None:
+            out = np.empty(self.data.shape + (2,), dtype=np.result_type(self.data.dtype, np.float32))
+        cos, sin = out[..., 0], out[..., 1]
+        np.multiply(self.data, TAU / self.period, out=cos)
+        np.sin(cos, out=sin)
+        np.cos(cos, out=cos)
+        return out
+
+    # Comparisons along the shortest arc
+
+    def __eq__(self, other):
+        return self.diff(other) == 0
+
+    def __ne__(self, other):
+        return self.diff(other) != 0
+
+    def __lt__(self, other):
+        return self.diff(other) < 0
+
+    def __le__(self, other):
+        return self.diff(other) <= 0
+
+    def __gt__(self, other):
+        return self.diff(other) > 0
+
+    def __ge__(self, other):
+        return self.diff(other) >= 0
+
+    __hash__ = None
+
+    def isclose(self, other, atol=1e-9):
+        """Equal up to atol, measured along the circle"""
+        return np.abs(self.diff(other)) <= atol
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Photo Window Scheduler for Presentation Build System
+Circular time-of-day distances and optimal imaging windows for many flights at once
+"""
+
+import os
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import circstats
+
+
+HOURS = 24.0
+
+# Morning and afternoon windows from js/flight-photo-window.js, as (name, start, end) hours
+DEMO_WINDOWS = (('Morning', 9, 11), ('Afternoon', 14, 16))
+
+# Flight x window cells per chunk; bounds the temporaries for any number of flights
+CHUNK_SIZE = 1 << 18
+
+# optimal/naive: window index per flight (-1 when its site has no windows), waits in hours
+Schedule = namedtuple('Schedule', 'optimal optimal_wait naive naive_wait in_window')
+
+
+def circular_distance(a, b, period=HOURS):
+    """Shortest distance between times of day, either way round the clock
+
+    Same as the angle between the clock embeddings the slide uses, without the
+    precision acos loses near zero.
+    """
+    return np.abs(circstats.wrapped_diff(a, b, period=period))
+
+
+def window_geometry(starts, ends):
+    """(centers, lengths) of windows; a window may run past midnight, e.g. 22 -> 2"""
+    starts = np.asarray(starts, dtype=np.float64)
+    lengths = np.mod(np.asarray(ends, dtype=np.float64) - starts, HOURS)
+    return np.mod(starts + lengths / 2, HOURS), lengths
+
+
+def _schedule_chunk(arrivals, starts, centers, lengths):
+    """Schedule for one chunk of flights against (M,) or per-flight (n, M) windows"""
+    arrivals = arrivals[:, None]
+    missing = np.isnan(centers)
+
+    # Vector method: nearest window center in either direction
+    distance = circular_distance(arrivals, centers)
+    distance[np.broadcast_to(missing, distance.shape)] = np.inf
+    optimal = np.argmin(distance, axis=1)
+    optimal_wait = np.take_along_axis(distance, optimal[:, None], axis=1)[:, 0]
+
+    # Naive method: next window center later today, else the earliest one tomorrow
+    wait = centers - arrivals
+    wait[wait <= 0] += HOURS
+    wait[np.broadcast_to(missing, wait.shape)] = np.inf
+    naive = np.argmin(wait, axis=1)
+    naive_wait = np.take_along_axis(wait, naive[:, None], axis=1)[:, 0]
+
+    in_window = (np.mod(arrivals - starts, HOURS) < lengths).any(axis=1)
+
+    none = np.isinf(optimal_wait)
+    optimal[none] = naive[none] = -1
+    optimal_wait[none] = naive_wait[none] = np.nan
+    return optimal, optimal_wait, naive, naive_wait, in_window
+
+
+def schedule(arrivals, starts, ends, sites=None, chunk_size=CHUNK_SIZE, workers=1):
+    """Optimal (shortest circular wait) and naive (next chronological) window per flight
+
+    arrivals are local hours of day for N flights. starts/ends are (M,) windows shared by
+    every flight, or (S, M) windows per site with sites giving each flight's site index;
+    pad sites with fewer windows with NaN. Flights are processed in chunks of about
+    chunk_size flight x window cells, across a process pool when workers > 1
+    (workers=None uses every CPU). Ties go to the earlier window, as in the slide.
+    """
+    arrivals = np.mod(np.asarray(arrivals, dtype=np.float64).ravel(), HOURS)
+    starts = np.asarray(starts, dtype=np.float64)
+    centers, lengths = window_geometry(starts, ends)
+    if (starts.ndim == 2) != (sites is not None):
+        raise ValueError("Per-site windows need a site index for every flight, and shared windows none")
+    if sites is not None:
+        sites = np.asarray(sites, dtype=np.intp).ravel()
+        if sites.shape != arrivals.shape:
+            raise ValueError(f"Got {sites.size} site indices for {arrivals.size} flights")
+
+    n = arrivals.size
+    rows = max(1, chunk_size // max(1, centers.shape[-1]))
+
+    def chunks():
+        for start in range(0, n, rows):
+            part = slice(start, start + rows)
+            if sites is None:
+                yield arrivals[part], starts, centers, lengths
+            else:
+                site = sites[part]
+                yield arrivals[part], starts[site], centers[site], lengths[site]
+
+    result = Schedule(np.empty(n, np.intp), np.empty(n), np.empty(n, np.intp), np.empty(n), np.empty(n, bool))
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers > 1 and n > rows:
+        _run_pool(result, chunks(), rows, workers)
+    else:
+        for i, chunk in enumerate(chunks()):
+            _fill(result, i * rows, _schedule_chunk(*chunk))
+    return result
+
+
+def _fill(result, offset, part):
+    for out, values in zip(result, part):
+        out[offset:offset + len(values)] = values
+
+
+def _run_pool(result, chunks, rows, workers):
+    """Chunks across a process pool, with at most two per worker in flight at a time"""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for i, chunk in enumerate(chunks):
+            pending.append((i * rows, pool.submit(_schedule_chunk, *chunk)))
+            if len(pending) >= 2 * workers:
+                offset, future = pending.popleft()
+                _fill(result, offset, future.result())
+        for offset, future in pending:
+            _fill(result, offset, future.result())
+
+
+def demo_scenarios(step=0.25, windows=DEMO_WINDOWS):
+    """Window choices for every arrival the flight photo-window sliders can produce
+
+    Departure, duration and time zone sliders move in multiples of a quarter hour, so
+    arrivals fall on a step grid and the slide looks its answers up by round(arrival / step).
+    Embedded in the deck as window.DEMO_BUFFERS['photo-windows'].
+    """
+    arrivals = np.arange(0, HOURS, step)
+    starts = [start for _, start, _ in windows]
+    ends = [end for _, _, end in windows]
+    result = schedule(arrivals, starts, ends)
+    return {
+        'windows': np.array([starts, ends], dtype=np.float32).T,
+        'optimal': result.optimal.astype(np.uint8),
+        'optimalWait': result.optimal_wait.astype(np.float32),
+        'naive': result.naive.astype(np.uint8),
+        'naiveWait': result.naive_wait.astype(np.float32),
+    }
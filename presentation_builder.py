@@ -14,15 +14,27 @@ SAVE_DEBUG = False
 
 import json
 import re
-import shutil
-import zipfile
+import base64
 from pathlib import Path
 from datetime import datetime
 import yaml
 from asset_manager import AssetManager
-from slide_processor import SlideProcessor
+from slide_processor import SlideProcessor, select_slides
 from json_embedder import JSONDataEmbedder
-from templates import SINGLE_FILE, BUNDLE_INDEX, NAVIGATION, BUNDLE_PRESENTATION
+from bundle_packager import BundlePackager
+from staged_output import StagedOutput
+from transcode_cache import TranscodeCache
+from build_fs import DiskFS
+from payload_report import PayloadReport
+from demo_pages import DemoPageBuilder
+from tex_mathml import MathConverter
+from tz_tables import zones_in
+from demo_modules import PAGE_MODULES, TIMEZONES_MODULE, lazy_modules, slide_modules
+from template_engine import TemplateSet
+from tile_pack import TILE_URL, TilePacker
+from image_atlas import ImageAtlas
+from search_index import SearchIndexer
+from svg_optimizer import SvgOptimizer
 
 
 # JS_MODULES will be auto-discovered from js/ directory 
@@ -30,12 +42,69 @@ from templates import SINGLE_FILE, BUNDLE_INDEX, NAVIGATION, BUNDLE_PRESENTATION
 class PresentationBuilder:
     """Main builder orchestrating the presentation build process"""
 
-    def __init__(self, config_path="config.yaml"):
-        self.config = self._load_config(config_path)
-        self.build_dir = Path("docs")
-        self.asset_manager = AssetManager(self.config, self.build_dir)
-        self.slide_processor = SlideProcessor(self.config, self.asset_manager)
-        self.json_embedder = JSONDataEmbedder()
+    def __init__(self, config_path="config.yaml", root=".", output_dir=None, transcode_cache=None,
+                 config=None, source=None, output=None, progress=print):
+        self.config = self._load_config(config_path) if config is None else self._with_defaults(config)
+        self.log = progress
+        # All deck inputs (slides/, js/, styles.css, static assets) are read through
+        # self.source - a directory on disk, or an in-memory file mapping (see build_api)
+        self.root = Path(root)
+        self.source = source if source is not None else DiskFS(self.root)
+        self.slides_dir = Path("slides")
+        self.js_dir = Path("js")
+        self.styles_path = Path("styles.css")
+
+        if output is None:
+            self.output_dir = Path(output_dir) if output_dir else self.root / "docs"
+            # Everything is built into a staging dir and synced into output_dir at the end
+            self.staged_output = StagedOutput(self.output_dir)
+            self.output = DiskFS(self.staged_output.staging_dir)
+        else:
+            # In-memory build - the caller collects the files from the output tree
+            self.output_dir = None
+            self.staged_output = None
+            self.output = output
+
+        if transcode_cache is None:
+            cache_dir = self.config['build'].get('cache_dir', '.build_cache')
+            transcode_cache = TranscodeCache(self.root / cache_dir / "transcode")
+        self.asset_manager = AssetManager(self.config, self.output, self.source, transcode_cache, progress)
+        # TeX is typeset to MathML once per distinct expression and cached across builds;
+        # in-memory builds only keep the conversions for the build itself
+        math_cache_dir = None
+        if self.staged_output is not None:
+            math_cache_dir = self.root / self.config['build'].get('cache_dir', '.build_cache') / "math"
+        self.math_converter = MathConverter(self.config, math_cache_dir, progress)
+        # Slides are indexed for the jump-to palette as they are collected, cached by content
+        # on disk (in memory only for in-memory builds)
+        self.search_indexer = None
+        if self.config['build'].get('search', True):
+            search_cache_dir = None
+            if self.staged_output is not None:
+                search_cache_dir = self.root / self.config['build'].get('cache_dir', '.build_cache') / "search"
+            self.search_indexer = SearchIndexer(search_cache_dir, progress)
+        # Inline slide SVGs trimmed before assets are processed (build.svg_optimize)
+        self.svg_optimizer = SvgOptimizer(self.config, progress)
+        self.slide_processor = SlideProcessor(self.config, self.asset_manager, self.slides_dir, progress,
+                                              self.math_converter, self.search_indexer, self.svg_optimizer)
+        # Page templates, overridable by same-named files in the deck's templates/ directory
+        self.templates = TemplateSet(self.source, self.config['build'].get('templates_dir', 'templates'), progress)
+        self.json_embedder = JSONDataEmbedder(self.config, progress, self.templates)
+        # Offline map tiles for the GIS slide (build.tile_pack), transcoded once per build
+        self.tile_packer = TilePacker(self.config, self.root, transcode_cache, progress)
+        self.bundle_packager = BundlePackager(self.config, progress)
+        # Small bundle images merged into WebP atlases (build.image_atlas)
+        self.image_atlas = ImageAtlas(self.config, self.source, self.output, transcode_cache, progress)
+        self.payload_report = PayloadReport(self.config)
+        # Vendored CDN libraries are cached on disk; in-memory builds keep the CDN links
+        vendor_cache_dir = None
+        if self.staged_output is not None:
+            vendor_cache_dir = self.root / self.config['build'].get('cache_dir', '.build_cache') / "vendor"
+        self.demo_page_builder = DemoPageBuilder(self.config, self.source, self.output, self.asset_manager,
+                                                 vendor_cache_dir, progress, self.templates)
+        # Set by select() - a partial build leaves every output it does not rebuild in place
+        self.partial = False
+        self.build_demo_pages = bool(self.config.get('demo_pages'))
     
     def _load_config(self, config_path):
         """Load build configuration"""
@@ -43,27 +112,79 @@ class PresentationBuilder:
             with open(config_path) as f:
                 return yaml.safe_load(f)
         else:
-            return {
-                'presentation': {
-                    'title': 'LWIR Project Presentation',
-                    'author': 'Geoff',
-                    'date': datetime.now().strftime('%Y-%m-%d')
-                },
-                'build': {
-                    'single_file': True,
-                    'bundle_folder': True,
-                    'webp_quality': 90,
-                    'max_image_width': 1920,
-                    'compress_json': True
-                }
-            }
+            return self._with_defaults({})
+
+    def _with_defaults(self, config):
+        """Fill in any missing presentation/build settings"""
+        config = dict(config)
+        config['presentation'] = {
+            'title': 'LWIR Project Presentation',
+            'author': 'Geoff',
+            'date': datetime.now().strftime('%Y-%m-%d'),
+            **config.get('presentation', {})
+        }
+        config['build'] = {
+            'single_file': True,
+            'bundle_folder': True,
+            'webp_quality': 90,
+            'max_image_width': 1920,
+            'compress_json': True,
+            'code_splitting': True,
+            'perf_hud': False,
+            'search': True,
+            **config.get('build', {})
+        }
+        return config
     
+    def select(self, slides=None, only=None):
+        """Build only some slides and/or outputs (build.py --slides, --only)
+
+        slides is a select_slides() spec such as "12-14"; only names outputs from
+        'single', 'bundle' and 'demos' (default single and bundle). Navigation covers just
+        the selected slides. Nothing else in the output directory is removed, and the ZIP
+        and manifest are left from the last full build.
+        """
+        if slides:
+            self.slide_processor.selection = select_slides(self.config.get('slides', []), slides)
+        only = set(only or ('single', 'bundle'))
+        self.config['build']['single_file'] = 'single' in only
+        self.config['build']['bundle_folder'] = 'bundle' in only
+        self.build_demo_pages = 'demos' in only and bool(self.config.get('demo_pages'))
+        self.partial = True
+
     def build_all(self):
         """Main build function - creates both single file and bundle"""
-        # Clean and create build directory
-        if self.build_dir.exists():
-            shutil.rmtree(self.build_dir)
-        self.build_dir.mkdir()
+        if self.staged_output is None:
+            self._build_outputs()
+            self.log("✅ Build complete! Output kept in memory")
+            return
+
+        # Build into a fresh staging directory; the live output is untouched until commit
+        self.staged_output.begin()
+
+        try:
+            self._build_outputs()
+
+            # Create manifest - keep the old build time if nothing else changed
+            if not self.partial:
+                written, _, removed = self.staged_output.changes()
+                removed = [rel for rel in removed if rel != Path("assets_manifest.json")]
+                self._create_manifest(keep_build_time=not written and not removed)
+        except BaseException:
+            self.staged_output.abort()
+            raise
+
+        # Partial builds only overwrite what they rebuilt; the next full build reuses the rest
+        written, unchanged, removed = self.staged_output.commit(prune=not self.partial)
+
+        self.log(f"✅ Build complete! Output in {self.output_dir}")
+        self.log(f"   ✏️  {len(written)} files written, {len(unchanged)} unchanged, {len(removed)} removed")
+        self._print_build_summary()
+
+    def _build_outputs(self):
+        """Write static assets, single file and bundle into the output tree"""
+        # Offset tables are embedded for the time zones named by slides that load js/timezones.js
+        self.json_embedder.use_timezones(self._deck_timezones())
 
         # Copy static assets to docs root for GitHub Pages
         self._copy_static_assets()
@@ -75,27 +196,55 @@ class PresentationBuilder:
         if self.config['build']['bundle_folder']:
             self.build_bundle()
 
-        # Create manifest
-        self._create_manifest()
+        if self.build_demo_pages:
+            self.demo_page_builder.build()
 
-        print(f"✅ Build complete! Output in {self.build_dir}")
-        self._print_build_summary()
+        # Per-slide byte accounting; fails the build when a budget is exceeded
+        self.payload_report.print_table(self.log, self._human_size)
+        self.payload_report.check_budgets()
+
+        if self.staged_output is None and not self.partial:
+            self._create_manifest()
 
     def _get_js_modules(self):
         """Auto-discover JavaScript modules in the js/ directory"""
-        js_dir = Path("js")
-        if not js_dir.exists():
-            return []
-
-        # Find all .js files in the js directory
-        js_files = list(js_dir.glob("*.js"))
-        js_modules = [f.name for f in js_files]
+        # Find all .js files in the js directory, except those only the demo pages load
+        js_files = self.source.glob(self.js_dir, "*.js")
+        js_modules = [f.name for f in js_files if f.name not in PAGE_MODULES]
 
         # Sort for consistent ordering
         js_modules.sort()
 
         return js_modules
 
+    def _deck_timezones(self):
+        """IANA zone names used by the built slides that load js/timezones.js and their modules
+
+        None when no built slide loads it, so no tables are embedded.
+        """
+        available = self._get_js_modules()
+        texts = []
+        modules = set()
+        for _, slide_filename in self.slide_processor.selected_slides():
+            slide_file = self.slides_dir / slide_filename
+            if not self.source.exists(slide_file):
+                continue
+            content = self.source.read_text(slide_file)
+            needed = slide_modules(content, available)
+            if TIMEZONES_MODULE in needed:
+                texts.append(content)
+                modules.update(needed)
+        if not texts:
+            return None
+        texts.extend(self.source.read_text(self.js_dir / module) for module in sorted(modules))
+        return zones_in('\n'.join(texts))
+
+    def _lazy_modules(self):
+        """Demo modules loaded when a slide first needs them; the rest load up front"""
+        if not self.config['build'].get('code_splitting', True):
+            return set()
+        return lazy_modules(self._get_js_modules())
+
     def _copy_static_assets(self):
         """Copy static assets to docs root for GitHub Pages"""
         static_assets = [
@@ -106,43 +255,52 @@ class PresentationBuilder:
         copied_count = 0
         for asset in static_assets:
             asset_path = Path(asset)
-            if asset_path.exists():
-                shutil.copy2(asset_path, self.build_dir / asset_path.name)
+            if self.source.exists(asset_path):
+                self.output.write_bytes(asset_path.name, self.source.read_bytes(asset_path))
                 copied_count += 1
-                print(f"   📋 Copied {asset} to docs root for GitHub Pages")
+                self.log(f"   📋 Copied {asset} to docs root for GitHub Pages")
 
         if copied_count > 0:
-            print(f"   ✅ Copied {copied_count} static assets for GitHub Pages")
+            self.log(f"   ✅ Copied {copied_count} static assets for GitHub Pages")
 
     def _create_unified_js(self):
-        """Reads and combines all interactive JavaScript modules."""
+        """Reads and combines the JavaScript modules every slide relies on."""
         unified_js = ""
         js_embedded_count = 0
-        js_modules = self._get_js_modules()
+        lazy = self._lazy_modules()
+        js_modules = [module for module in self._get_js_modules() if module not in lazy]
         for module in js_modules:
-            module_path = Path("js") / module
-            if module_path.exists():
-                module_js = module_path.read_text(encoding='utf-8')
+            module_path = self.js_dir / module
+            if self.source.exists(module_path):
+                module_js = self.source.read_text(module_path)
                 # Escape </script> tags to avoid breaking the parent script block
                 module_js_escaped = module_js.replace('</', '<\\/')
                 unified_js += module_js_escaped + "\n\n"
                 js_embedded_count += 1
 
         if js_embedded_count > 0:
-            print(f"   📦 Combined {js_embedded_count} interactive modules for unified loading")
+            self.log(f"   📦 Combined {js_embedded_count} interactive modules for unified loading")
+        if lazy:
+            self.log(f"   💤 {len(lazy)} demo modules evaluated on first use: {', '.join(sorted(lazy))}")
 
         return unified_js
 
+    def _lazy_module_sources(self, slides_content):
+        """Source of each lazily loaded module a slide loads, shipped as inert strings in the single file"""
+        lazy = self._lazy_modules()
+        needed = {module for slide in slides_content for module in slide_modules(slide['content'], lazy)}
+        return {module: self.source.read_text(self.js_dir / module)
+                for module in sorted(needed) if self.source.exists(self.js_dir / module)}
+
     def build_single_file(self):
         """Build single HTML file with everything embedded"""
         # Collect slides for single file mode
         slides_content = self.slide_processor.collect_slides(output_mode='single')
 
         # Save intermediate JSON for debugging
-        json_debug_path = self.build_dir / "slides_debug.json"
-        with open(json_debug_path, 'w', encoding='utf-8') as f:
-            json.dump(slides_content, f, indent=2, ensure_ascii=False)
-        print(f"   📄 Debug: Saved slides data to {json_debug_path}")
+        json_debug_path = Path("slides_debug.json")
+        self.output.write_text(json_debug_path, json.dumps(slides_content, indent=2, ensure_ascii=False))
+        self.log(f"   📄 Debug: Saved slides data to {json_debug_path}")
 
         # Create the unified JavaScript from all modules
         unified_js = self._create_unified_js()
@@ -156,11 +314,7 @@ class PresentationBuilder:
                 if asset['type'] == 'image':
                     # Process the image to WebP in temp location
                     original_path = Path(asset['original'])
-                    temp_dir = self.build_dir / "temp"
-                    temp_dir.mkdir(exist_ok=True)
-
                     local_name = self.asset_manager._generate_asset_name(original_path, 'image')
-                    temp_path = temp_dir / local_name
 
                     # Process the image
                     processed_path = self.asset_manager._process_asset(original_path, local_name, 'image', 'single')
@@ -175,75 +329,73 @@ class PresentationBuilder:
         html_content = self.asset_manager.embed_as_base64(html_content, all_slide_assets)
 
         # Write single file
-        single_file_path = self.build_dir / "index.html"
-        single_file_path.write_text(html_content, encoding='utf-8')
+        single_file_path = Path("index.html")
+        self.output.write_text(single_file_path, html_content)
 
-        file_size = single_file_path.stat().st_size / (1024*1024)
-        print(f"   📄 Single file: {file_size:.1f}MB")
+        file_size = self.output.size(single_file_path) / (1024*1024)
+        self.log(f"   📄 Single file: {file_size:.1f}MB")
 
-        # Clean up temp directory
-        temp_dir = self.build_dir / "temp"
-        if temp_dir.exists():
-            shutil.rmtree(temp_dir)
+        module_sizes = {m: self.source.size(self.js_dir / m) for m in self._get_js_modules()}
+        self.payload_report.account(slides_content, self.output, module_sizes, self.output.size(single_file_path))
     
     def build_bundle(self):
         """Build bundle folder with separate assets"""
-        bundle_dir = self.build_dir / "presentation_bundle"
-        bundle_dir.mkdir(exist_ok=True)
+        bundle_dir = Path("presentation_bundle")
 
         # Collect slides for bundle mode
         slides_content = self.slide_processor.collect_slides(output_mode='bundle')
-
-        # Create directory structure
-        (bundle_dir / "css").mkdir(exist_ok=True)
-        (bundle_dir / "js").mkdir(exist_ok=True)
-        (bundle_dir / "assets").mkdir(exist_ok=True)
+        self.image_atlas.pack(slides_content, bundle_dir)
 
         # Copy CSS
-        if Path("styles.css").exists():
-            shutil.copy2("styles.css", bundle_dir / "css" / "styles.css")
+        if self.source.exists(self.styles_path):
+            self.output.write_bytes(bundle_dir / "css" / "styles.css", self.source.read_bytes(self.styles_path))
 
         # Copy interactive JavaScript modules
         js_count = 0
         js_modules = self._get_js_modules()
         for module in js_modules:
-            module_path = Path("js") / module
-            if module_path.exists():
-                print(f"   📄 Copying {module_path} to {bundle_dir / 'js' / module}")
-                shutil.copy2(module_path, bundle_dir / "js" / module)
+            module_path = self.js_dir / module
+            if self.source.exists(module_path):
+                self.log(f"   📄 Copying {module_path} to {bundle_dir / 'js' / module}")
+                self.output.write_bytes(bundle_dir / "js" / module, self.source.read_bytes(module_path))
                 js_count += 1
             else:
-                print(f"   ⚠️ Module {module_path} not found")
+                self.log(f"   ⚠️ Module {module_path} not found")
 
         if js_count > 0:
-            print(f"   🎮 Copied {js_count} interactive modules")
+            self.log(f"   🎮 Copied {js_count} interactive modules")
 
         # Create presentation.js with embedded slide data
         presentation_js = self._create_bundle_javascript(slides_content)
-        (bundle_dir / "js" / "presentation.js").write_text(presentation_js, encoding='utf-8')
+        self.output.write_text(bundle_dir / "js" / "presentation.js", presentation_js)
 
         # Create index.html
-        index_html = self._create_bundle_html()
-        (bundle_dir / "index.html").write_text(index_html, encoding='utf-8')
-
-        # Create ZIP
-        zip_path = self.build_dir / "presentation_bundle.zip"
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for file in bundle_dir.rglob('*'):
-                if file.is_file():
-                    zf.write(file, file.relative_to(bundle_dir))
-
-        zip_size = zip_path.stat().st_size / (1024*1024)
-        print(f"   📁 Bundle: {zip_size:.1f}MB")
+        index_html = self._create_bundle_html(slides_content)
+        self.output.write_text(bundle_dir / "index.html", index_html)
+
+        if self.partial:
+            self.log("   🗜️  ZIP left as it was for a partial build")
+            return
+
+        # Create ZIP, reusing unchanged members of the live archive
+        zip_path = Path("presentation_bundle.zip")
+        previous_zip = None
+        if self.output_dir is not None and (self.output_dir / zip_path).is_file():
+            previous_zip = (self.output_dir / zip_path).read_bytes()
+        self.bundle_packager.package(self.output, bundle_dir, zip_path, previous_zip=previous_zip)
+
+        zip_size = self.output.size(zip_path) / (1024*1024)
+        self.log(f"   📁 Bundle: {zip_size:.1f}MB")
     
     def _create_single_file_html(self, slides_content, unified_js):
         """Create complete single-file HTML"""
-        css_content = Path("styles.css").read_text() if Path("styles.css").exists() else ""
+        css_content = self.source.read_text(self.styles_path) if self.source.exists(self.styles_path) else ""
 
         # Get embedded JSON data
-        json_embed_js = self.json_embedder.load_and_embed_json_data()
+        json_embed_js = self.json_embedder.load_and_embed_json_data() + self._tile_pack_js('single')
 
-        # Create slides JavaScript data
+        # Create slides JavaScript data, with the demo modules each slide loads on first use
+        lazy = self._lazy_modules()
         slides_js_data = []
         for slide in slides_content:
             content_to_process = slide['content']
@@ -280,50 +432,54 @@ class PresentationBuilder:
 
             slides_js_data.append({
                 'content': final_content,  # Use the fully processed content
-                'title': slide['title']
+                'title': slide['title'],
+                'file': slide['file'],
+                'modules': slide_modules(slide['content'], lazy)
             })
 
         slides_json = json.dumps(slides_js_data, ensure_ascii=False, separators=(',', ':'))
 
-        # Get the main navigation logic
-        nav_js = self._create_navigation_javascript()
+        # Get the main navigation logic, with the demo modules it loads on first use
+        nav_js = self._create_navigation_javascript('single', slides_content,
+                                                     self._lazy_module_sources(slides_content))
+
+        # MathJax only ships when some TeX could not be converted to MathML
+        math_runtime = self._math_runtime(slides_content)
 
         # Combine interactive modules with navigation
         # This ensures functions like initVectorCalculator() are defined before nav_js might call them
         combined_js = unified_js + nav_js
 
-        # DEBUG: Save intermediate versions
-        debug_html = SINGLE_FILE.replace('{{TITLE}}', self.config['presentation']['title']) \
-                                .replace('{{CSS_CONTENT}}', css_content) \
-                                .replace('{{TOTAL_SLIDES}}', str(len(slides_content))) \
-                                .replace('{{JSON_EMBED_JS}}', json_embed_js) \
-                                .replace('{{SLIDES_JSON}}', slides_json) \
-                                .replace('{{NAVIGATION_JS}}', nav_js)
+        values = {
+            'TITLE': self.config['presentation']['title'],
+            'CSS_CONTENT': css_content,
+            'TOTAL_SLIDES': len(slides_content),
+            'MATH_RUNTIME': math_runtime,
+            'JSON_EMBED_JS': json_embed_js,
+            'SLIDES_JSON': slides_json,
+        }
 
-        # Save debug versions (if enabled)
+        # Save debug versions (if enabled) - the debug page is only rendered then
         if SAVE_DEBUG:
-            debug_dir = self.build_dir / "debug"
-            debug_dir.mkdir(exist_ok=True)
-
-            (debug_dir / "presentation_debug.html").write_text(debug_html, encoding='utf-8')
-            (debug_dir / "json_embed.js").write_text(json_embed_js, encoding='utf-8')
-            (debug_dir / "navigation.js").write_text(nav_js, encoding='utf-8')
-            (debug_dir / "slides_data.json").write_text(slides_json, encoding='utf-8')
-            (debug_dir / "combined.js").write_text(combined_js, encoding='utf-8')
-
-            print(f"   🐛 Debug files saved to {debug_dir}")
-
-        return SINGLE_FILE.replace('{{TITLE}}', self.config['presentation']['title']) \
-                        .replace('{{CSS_CONTENT}}', css_content) \
-                        .replace('{{TOTAL_SLIDES}}', str(len(slides_content))) \
-                        .replace('{{JSON_EMBED_JS}}', json_embed_js) \
-                        .replace('{{SLIDES_JSON}}', slides_json) \
-                        .replace('{{NAVIGATION_JS}}', combined_js)
-    
-    def _create_bundle_html(self):
+            debug_dir = Path("debug")
+
+            debug_html = self.templates.render('SINGLE_FILE', **values, NAVIGATION_JS=nav_js)
+            self.output.write_text(debug_dir / "presentation_debug.html", debug_html)
+            self.output.write_text(debug_dir / "json_embed.js", json_embed_js)
+            self.output.write_text(debug_dir / "navigation.js", nav_js)
+            self.output.write_text(debug_dir / "slides_data.json", slides_json)
+            self.output.write_text(debug_dir / "combined.js", combined_js)
+
+            self.log(f"   🐛 Debug files saved to {debug_dir}")
+
+        return self.templates.render('SINGLE_FILE', **values, NAVIGATION_JS=combined_js)
+
+    def _create_bundle_html(self, slides_content):
         """Create index.html for bundle"""
-        # Generate script tags for all JS modules
-        js_modules = self._get_js_modules()
+        # Generate script tags for the JS modules every slide relies on
+        # Demo modules are not tagged; DemoModules fetches them when a slide needs them
+        lazy = self._lazy_modules()
+        js_modules = [module for module in self._get_js_modules() if module not in lazy]
         script_tags = []
         for module in js_modules:
             script_tags.append(f'    <script src="js/{module}"></script>')
@@ -331,43 +487,87 @@ class PresentationBuilder:
 
         js_script_tags = '\n'.join(script_tags)
 
-        return BUNDLE_INDEX.replace('{{TITLE}}', self.config['presentation']['title']) \
-                          .replace('{{JS_SCRIPT_TAGS}}', js_script_tags)
+        return self.templates.render('BUNDLE_INDEX',
+                                     TITLE=self.config['presentation']['title'],
+                                     MATH_RUNTIME=self._math_runtime(slides_content),
+                                     JS_SCRIPT_TAGS=js_script_tags)
+
+    def _math_runtime(self, slides_content):
+        """MathJax tags for the page head, or nothing when all math was converted at build time"""
+        return self.templates.render('MATHJAX_RUNTIME') if self.math_converter.needs_runtime(slides_content) else ''
     
     def _create_bundle_javascript(self, slides_content):
         """Create presentation.js for bundle with embedded slides"""
         # Get embedded JSON data
-        json_embed_js = self.json_embedder.load_and_embed_json_data()
+        json_embed_js = self.json_embedder.load_and_embed_json_data() + self._tile_pack_js('bundle')
         
-        # Create slides JavaScript data
+        # Create slides JavaScript data, with the demo modules each slide loads on first use
+        lazy = self._lazy_modules()
         slides_js_data = []
         for slide in slides_content:
             slides_js_data.append({
                 'content': slide['content'],
-                'title': slide['title']
+                'title': slide['title'],
+                'file': slide['file'],
+                'modules': slide_modules(slide['content'], lazy)
             })
         
         slides_json = json.dumps(slides_js_data, ensure_ascii=False, separators=(',', ':'))
         
         # Create navigation JavaScript
-        nav_js = self._create_navigation_javascript()
+        nav_js = self._create_navigation_javascript('bundle', slides_content)
         
-        return BUNDLE_PRESENTATION.replace('{{JSON_EMBED_JS}}', json_embed_js) \
-                                 .replace('{{SLIDES_JSON}}', slides_json) \
-                                 .replace('{{NAVIGATION_JS}}', nav_js)
+        return self.templates.render('BUNDLE_PRESENTATION', JSON_EMBED_JS=json_embed_js,
+                                     SLIDES_JSON=slides_json, NAVIGATION_JS=nav_js)
     
-    def _create_navigation_javascript(self):
-        """Create reusable navigation JavaScript"""
+    def _tile_pack_js(self, mode):
+        """window.TILE_PACK for js/tile-pack.js; the bundle also gets the tiles as files"""
+        pack = self.tile_packer.pack()
+        if pack is None:
+            return ''
+        index = pack.index()
+        blob_base64 = ''
+        if mode == 'bundle':
+            for path, tile in pack.files():
+                self.output.write_bytes(Path("presentation_bundle") / path, tile)
+            index['url'] = TILE_URL
+        else:
+            blob, index['offsets'] = pack.blob()
+            blob_base64 = base64.b64encode(blob).decode('ascii')
+        return '\n' + self.templates.render('TILE_PACK', TILE_INDEX_JSON=json.dumps(index, separators=(',', ':')),
+                                             TILE_BLOB_BASE64=blob_base64)
+
+    def _create_navigation_javascript(self, mode, slides_content, module_sources=None):
+        """Create reusable navigation JavaScript, preceded by the demo module loader"""
+        # Module sources are embedded as strings in the single file; the bundle fetches js/ files
+        sources_json = json.dumps(module_sources or {}, ensure_ascii=False).replace('</', '<\\/')
+        parts = [self.templates.render('DEMO_MODULE_LOADER', MODULE_SOURCES_JSON=sources_json)]
+        if self.config['build'].get('perf_hud'):
+            title = json.dumps(self.config['presentation']['title'], ensure_ascii=False).replace('</', '<\\/')
+            parts.append(self.templates.render('PERF_HUD', DECK_TITLE_JSON=title, BUILD_MODE_JSON=json.dumps(mode)))
+        if self.search_indexer is not None:
+            index_json = self.search_indexer.build(slides_content).replace('</', '<\\/')
+            parts.append(self.templates.render('SEARCH_PALETTE', SEARCH_INDEX_JSON=index_json))
         # Always use the template to ensure YAML ordering is respected
         # The old presentation.js file has hardcoded slide ordering that conflicts with YAML
-        return NAVIGATION
+        parts.append(self.templates.render('NAVIGATION'))
+        return ''.join(parts)
     
-    def _create_manifest(self):
+    def _create_manifest(self, keep_build_time=False):
         """Create asset manifest"""
+        build_time = datetime.now().isoformat()
+        previous_manifest = self.output_dir / "assets_manifest.json" if self.output_dir else None
+        if keep_build_time and previous_manifest.exists():
+            # Unchanged build - reuse the previous timestamp so the manifest is byte-identical
+            try:
+                build_time = json.loads(previous_manifest.read_text())['build_info']['build_time']
+            except (ValueError, KeyError):
+                pass
+
         manifest = {
             'build_info': {
                 'title': self.config['presentation']['title'],
-                'build_time': datetime.now().isoformat(),
+                'build_time': build_time,
                 'total_assets': len(self.asset_manager.assets_collected),
                 'webp_quality': self.config['build']['webp_quality']
             },
@@ -382,20 +582,29 @@ class PresentationBuilder:
                 'used_in_slide': asset['slide']
             }
             
-            if asset.get('processed') and Path(asset['processed']).exists():
-                size = Path(asset['processed']).stat().st_size
+            if asset.get('processed') and self.output.exists(asset['processed']):
+                size = self.output.size(asset['processed'])
                 asset_info['size_bytes'] = size
                 asset_info['size_human'] = self._human_size(size)
             
             manifest['assets'].append(asset_info)
+
+        if self.payload_report.slides:
+            manifest['payload'] = self.payload_report.to_manifest()
+
+        if self.demo_page_builder.report:
+            manifest['demo_pages'] = self.demo_page_builder.report
+
+        if self.image_atlas.report:
+            manifest['image_atlas'] = self.image_atlas.report
         
-        manifest_path = self.build_dir / "assets_manifest.json"
-        with open(manifest_path, 'w') as f:
-            json.dump(manifest, f, indent=2)
+        manifest_path = Path("assets_manifest.json")
+        self.output.write_text(manifest_path, json.dumps(manifest, indent=2))
         
-        print(f"📋 Created manifest: {manifest_path}")
+        self.log(f"📋 Created manifest: {manifest_path}")
     
-    def _human_size(self, size_bytes):
+    @staticmethod
+    def _human_size(size_bytes):
         """Convert bytes to human readable format"""
         for unit in ['B', 'KB', 'MB', 'GB']:
             if size_bytes < 1024:
@@ -408,14 +617,16 @@ class PresentationBuilder:
         total_assets = len(self.asset_manager.assets_collected)
         image_assets = len([a for a in self.asset_manager.assets_collected if a['type'] == 'image'])
         
-        print("\n📊 Build Summary:")
-        print(f"   📄 Slides processed: {len(list(Path('slides').glob('*.html')))}")
-        print(f"   🖼️  Images converted to WebP: {image_assets}")
-        print(f"   📁 Total assets: {total_assets}")
-        print(f"   🎯 WebP quality: {self.config['build']['webp_quality']}%")
+        self.log("\n📊 Build Summary:")
+        if self.partial:
+            self.log(f"   📄 Slides processed: {len(list(self.slide_processor.selected_slides()))} (partial build)")
+        else:
+            self.log(f"   📄 Slides processed: {len(self.source.glob(self.slides_dir, '*.html'))}")
+        self.log(f"   🖼️  Images converted to WebP: {image_assets}")
+        self.log(f"   📁 Total assets: {total_assets}")
+        self.log(f"   🎯 WebP quality: {self.config['build']['webp_quality']}%")
         
-        if self.build_dir.exists():
-            files = list(self.build_dir.rglob('*'))
+        if self.output_dir.exists():
+            files = list(self.output_dir.rglob('*'))
             total_size = sum(f.stat().st_size for f in files if f.is_file())
-            print(f"   💾 Total output size: {self._human_size(total_size)}")
-
+            self.log(f"   💾 Total output size: {self._human_size(total_size)}")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Runtime Report for Presentation Build System
+Ranks the slides that stutter live, from the telemetry the perf HUD (build.perf_hud) exports
+"""
+
+import json
+from pathlib import Path
+
+
+SCHEMA = 'runtime-telemetry/1'
+
+# showSlide() phases in the order the navigation runtime marks them
+PHASES = ('teardown', 'innerHTML', 'scripts', 'slideLoaded', 'modules', 'init', 'frame')
+
+# A slide change slower than this is a visible hitch; frames over budget miss 60 fps
+SLOW_SHOW_MS = 100
+FRAME_BUDGET_MS = 1000 / 60
+
+
+class TelemetryError(ValueError):
+    """Raised for a file that is not perf HUD telemetry"""
+
+
+def _percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0
+
+
+class RuntimeReport:
+    """Per-slide live performance across telemetry sessions, joined with the build's payload report"""
+
+    def __init__(self, payload=None):
+        # manifest['payload'] from the build, to show each slide's bytes next to its timings
+        self.payload = {slide['slide']: slide for slide in (payload or {}).get('slides', [])}
+        self.sessions = []
+
+    @classmethod
+    def from_files(cls, paths, manifest_path=None):
+        """Report over telemetry files, with payload bytes when the build manifest exists"""
+        payload = None
+        if manifest_path and Path(manifest_path).exists():
+            payload = json.loads(Path(manifest_path).read_text()).get('payload')
+        report = cls(payload)
+        for path in paths:
+            try:
+                telemetry = json.loads(Path(path).read_text())
+            except (OSError, ValueError) as e:
+                raise TelemetryError(f"Could not read telemetry {path}: {e}") from e
+            report.ingest(telemetry, source=str(path))
+        return report
+
+    def ingest(self, telemetry, source='telemetry'):
+        """Add one exported session"""
+        if not isinstance(telemetry, dict) or telemetry.get('schema') != SCHEMA:
+            raise TelemetryError(f"{source} is not perf HUD telemetry (expected schema {SCHEMA!r})")
+        self.sessions.append(telemetry)
+
+    def slides(self):
+        """Per-slide figures, worst first"""
+        slides = {}
+
+        def slide(name):
+            return slides.setdefault(name, {
+                'slide': name, 'number': None, 'title': '', 'sessions': set(), 'totals': [],
+                'phases': {}, 'long_tasks': 0, 'long_task_ms': 0.0, 'frames': 0,
+                'frames_over_budget': 0, 'frame_p95_ms': 0.0, 'heap_bytes': None,
+                'module_errors': 0, 'left_early': 0,
+            })
+
+        for index, session in enumerate(self.sessions):
+            for show in session.get('shows', []):
+                entry = slide(show['slide'])
+                entry['number'] = show.get('number', entry['number'])
+                entry['title'] = show.get('title') or entry['title']
+                entry['sessions'].add(index)
+                # A show left before its modules loaded has no full timing to rank
+                if show.get('outcome') == 'left':
+                    entry['left_early'] += 1
+                    continue
+                if show.get('outcome') == 'module_error':
+                    entry['module_errors'] += 1
+                entry['totals'].append(show['total_ms'])
+                for phase, ms in show.get('phases_ms', {}).items():
+                    entry['phases'].setdefault(phase, []).append(ms)
+                if show.get('heap_bytes') is not None:
+                    entry['heap_bytes'] = max(entry['heap_bytes'] or 0, show['heap_bytes'])
+            for task in session.get('long_tasks', []):
+                if task.get('slide') is None:
+                    continue
+                entry = slide(task['slide'])
+                entry['long_tasks'] += 1
+                entry['long_task_ms'] += task['duration_ms']
+            for frames in session.get('frames', []):
+                entry = slide(frames['slide'])
+                entry['frames'] += frames['frames']
+                entry['frames_over_budget'] += frames.get('over_budget', 0)
+                entry['frame_p95_ms'] = max(entry['frame_p95_ms'], frames['p95_ms'])
+
+        rows = []
+        for entry in slides.values():
+            totals = entry.pop('totals')
+            phases = {phase: sum(values) / len(values) for phase, values in entry['phases'].items()}
+            payload = self.payload.get(entry['slide'], {})
+            row = {
+                **entry,
+                'sessions': len(entry['sessions']),
+                'shows': len(totals),
+                'show_p50_ms': round(_percentile(totals, 0.5), 1),
+                'show_max_ms': round(max(totals, default=0), 1),
+                'phases_mean_ms': {phase: round(phases[phase], 2) for phase in PHASES if phase in phases},
+                'slowest_phase': max(phases, key=phases.get) if phases else None,
+                'long_task_ms': round(entry['long_task_ms'], 1),
+                'frame_p95_ms': round(entry['frame_p95_ms'], 2),
+                'payload_bytes': payload.get('total_bytes'),
+            }
+            del row['phases']
+            row['flags'] = [flag for flag, hit in (
+                ('module errors', row['module_errors'] > 0),
+                ('slow show', row['show_max_ms'] > SLOW_SHOW_MS),
+                ('long tasks', row['long_tasks'] > 0),
+                ('janky frames', row['frame_p95_ms'] > FRAME_BUDGET_MS),
+            ) if hit]
+            rows.append(row)
+
+        rows.sort(key=lambda row: (len(row['flags']), row['show_max_ms'] + row['long_task_ms']), reverse=True)
+        return rows
+
+    def to_json(self):
+        """Aggregated report, e.g. to archive next to assets_manifest.json"""
+        return {
+            'sessions': [{key: session.get(key) for key in ('deck', 'mode', 'started_at', 'user_agent', 'device')}
+                         for session in self.sessions],
+            'slides': self.slides(),
+        }
+
+    def print_table(self, log=print, human_size=str):
+        """Ranked table of the slides that stutter"""
+        rows = self.slides()
+        log(f"\n🐢 Runtime telemetry ({len(self.sessions)} sessions, worst first):")
+        log(f"   {'#':>3}  {'Slide':<36} {'Shows':>5} {'p50':>8} {'Max':>8} {'Slowest':>12} "
+            f"{'Long':>9} {'Frame95':>8} {'Heap':>8} {'Payload':>8}  Flags")
+        for row in rows:
+            heap = human_size(row['heap_bytes']) if row['heap_bytes'] is not None else '-'
+            payload = human_size(row['payload_bytes']) if row['payload_bytes'] is not None else '-'
+            frame = f"{row['frame_p95_ms']:.1f}ms" if row['frames'] else '-'
+            log(f"   {row['number'] or '-':>3}  {row['slide'][:36]:<36} {row['shows']:>5} "
+                f"{row['show_p50_ms']:>6.1f}ms {row['show_max_ms']:>6.1f}ms {row['slowest_phase'] or '-':>12} "
+                f"{row['long_tasks']:>3}/{row['long_task_ms']:>4.0f}ms {frame:>8} "
+                f"{heap:>8} {payload:>8}  {', '.join(row['flags'])}")
+        stutter = [row['slide'] for row in rows if row['flags']]
+        log(f"   {len(stutter)} of {len(rows)} slides stutter" + (f": {', '.join(stutter)}" if stutter else ""))
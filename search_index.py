@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Search Index for Presentation Build System
+Per-slide terms from titles, text and code, merged into a prefix index for the jump-to palette
+"""
+
+import re
+import html
+import json
+import hashlib
+
+from transcode_cache import TranscodeCache
+
+
+# Bump when extraction changes so cached slide entries are rebuilt
+INDEX_VERSION = 1
+
+# Score a slide gets for a term in its title, in its code, and per occurrence in its text
+TITLE_SCORE, CODE_SCORE, TEXT_SCORE = 8, 3, 1
+MAX_SCORE = 255
+
+SNIPPET_LENGTH = 120
+
+STRIP_RE = re.compile(r'<(script|style)\b[^>]*>.*?</\1>|<!--.*?-->', re.IGNORECASE | re.DOTALL)
+CODE_RE = re.compile(r'<code\b[^>]*>(.*?)</code>', re.IGNORECASE | re.DOTALL)
+TAG_RE = re.compile(r'<[^>]+>')
+# TeX is indexed by the words around it, not by its commands
+MATH_RE = re.compile(r'\$\$.*?\$\$|\\\[.*?\\\]|\\\(.*?\\\)|<math\b.*?</math>', re.DOTALL)
+WORD_RE = re.compile(r'[a-z0-9]+(?:[\'’][a-z]+)?')
+IDENTIFIER_RE = re.compile(r'[A-Za-z_$][A-Za-z0-9_$]{2,}')
+IDENTIFIER_PART_RE = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+')
+
+STOP_WORDS = frozenset('''
+    a an and are as at be but by can do for from has have if in into is it its no not of on or
+    so than that the their then there these this to was we were what when which will with you your
+'''.split())
+
+
+def _words(text):
+    return [word for word in WORD_RE.findall(text.lower()) if word not in STOP_WORDS and len(word) > 1]
+
+
+def _identifiers(code):
+    """Identifiers in a code block, whole and split at camelCase/snake_case, lowercased"""
+    terms = []
+    for identifier in IDENTIFIER_RE.findall(code):
+        terms.append(identifier.lower())
+        parts = IDENTIFIER_PART_RE.findall(identifier)
+        if len(parts) > 1:
+            terms.extend(part.lower() for part in parts if len(part) > 1)
+    return terms
+
+
+def _text(fragment):
+    return ' '.join(html.unescape(TAG_RE.sub(' ', fragment)).split())
+
+
+def slide_entry(content, title):
+    """{'terms': {term: score}, 'snippet': text} for one slide's HTML"""
+    content = MATH_RE.sub(' ', STRIP_RE.sub(' ', content))
+    code = ' '.join(html.unescape(TAG_RE.sub(' ', block)) for block in CODE_RE.findall(content))
+    text = _text(CODE_RE.sub(' ', content))
+
+    terms = {}
+    for word in _words(text):
+        terms[word] = terms.get(word, 0) + TEXT_SCORE
+    for identifier in set(_identifiers(code)):
+        terms[identifier] = terms.get(identifier, 0) + CODE_SCORE
+    for word in set(_words(title)):
+        terms[word] = terms.get(word, 0) + TITLE_SCORE
+
+    # The snippet skips the heading, which the palette already shows as the title
+    snippet = text[len(title):].strip() if text.startswith(title) else text
+    if len(snippet) > SNIPPET_LENGTH:
+        snippet = snippet[:SNIPPET_LENGTH].rsplit(' ', 1)[0] + '…'
+    return {'terms': {term: min(score, MAX_SCORE) for term, score in terms.items()}, 'snippet': snippet}
+
+
+def merge(entries):
+    """Prefix index over slide entries, in slide order
+
+    terms is sorted, so every term starting with a prefix sits in one run found by binary
+    search. Term i's postings are postings[2 * offsets[i]:2 * offsets[i + 1]], flat
+    (slide, score) pairs.
+    """
+    by_term = {}
+    for slide, entry in enumerate(entries):
+        for term, score in entry['terms'].items():
+            by_term.setdefault(term, []).append((slide, score))
+
+    terms = sorted(by_term)
+    offsets = [0]
+    postings = []
+    for term in terms:
+        for slide, score in by_term[term]:
+            postings.extend((slide, score))
+        offsets.append(len(postings) // 2)
+    return {'version': INDEX_VERSION, 'terms': terms, 'offsets': offsets, 'postings': postings,
+            'snippets': [entry['snippet'] for entry in entries]}
+
+
+class SearchIndexer:
+    """Indexes each slide as it is collected; unchanged slides come from the cache"""
+
+    def __init__(self, cache_dir=None, progress=print):
+        self.cache = TranscodeCache(cache_dir) if cache_dir is not None else None
+        self.log = progress
+        self._entries = {}
+        self._built = (None, None)
+        self.indexed = 0
+
+    def slide_entry(self, content, title):
+        """Cached slide_entry(); the same slide in both output modes is indexed once"""
+        key = hashlib.sha256(f"{INDEX_VERSION}\0{title}\0{content}".encode('utf-8')).hexdigest()
+        if key not in self._entries:
+            if self.cache is None:
+                self._entries[key] = slide_entry(content, title)
+                self.indexed += 1
+            else:
+                data, hit = self.cache.get_or_create(
+                    key, lambda: json.dumps(slide_entry(content, title)).encode('utf-8'), suffix='.json')
+                self._entries[key] = json.loads(data)
+                self.indexed += not hit
+        return self._entries[key]
+
+    def build(self, slides_content):
+        """Index JSON for the palette, from the 'search' entry of each collected slide"""
+        # Both output modes share the cached entries, so the second merge is free
+        key = tuple(id(slide['search']) for slide in slides_content)
+        if self._built[0] == key:
+            return self._built[1]
+        index = merge([slide['search'] for slide in slides_content])
+        index_json = json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+        self.log(f"   🔎 Search index: {len(index['terms'])} terms over {len(slides_content)} slides, "
+                 f"{len(index_json.encode('utf-8')):,} bytes ({self.indexed} slides indexed, rest cached)")
+        self._built = (key, index_json)
+        return index_json
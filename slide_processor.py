@@ -19,44 +19,113 @@ from PIL import Image
 import yaml
 
 
+# A --slides item: a position in config.yaml order or a range of them, e.g. "12" or "12-14"
+SLIDE_RANGE_RE = re.compile(r'^(\d+)(?:-(\d+))?$')
+
+
+class SlideSelectionError(ValueError):
+    """Raised for a --slides selection that names no slide in config.yaml"""
+
+
+def _slide_filename(slide_config):
+    return slide_config if isinstance(slide_config, str) else slide_config.get('file')
+
+
+def select_slides(slide_configs, spec):
+    """Positions (1-based, config.yaml order) picked by a selection like "12-14,18-flight-photo-window.html"
+
+    Items are comma separated: a position, an inclusive range of positions, or a slide file
+    name from config.yaml (".html" may be left off).
+    """
+    filenames = [_slide_filename(slide_config) for slide_config in slide_configs]
+    selected = set()
+    for item in (part.strip() for part in spec.split(',')):
+        if not item:
+            continue
+        match = SLIDE_RANGE_RE.match(item)
+        if match:
+            first = int(match.group(1))
+            last = int(match.group(2) or first)
+            if not 1 <= first <= last <= len(filenames):
+                raise SlideSelectionError(f"Slide range {item} is outside 1-{len(filenames)}")
+            selected.update(range(first, last + 1))
+        elif item in filenames or f"{item}.html" in filenames:
+            name = item if item in filenames else f"{item}.html"
+            selected.update(i for i, filename in enumerate(filenames, 1) if filename == name)
+        else:
+            raise SlideSelectionError(f"No slide {item} in config.yaml")
+    if not selected:
+        raise SlideSelectionError(f"Slide selection {spec!r} is empty")
+    return selected
+
+
 class SlideProcessor:
     """Handles slide collection and processing"""
     
-    def __init__(self, config, asset_manager):
+    def __init__(self, config, asset_manager, slides_dir=Path("slides"), progress=print, math_converter=None,
+                 search_indexer=None, svg_optimizer=None):
         self.config = config
         self.asset_manager = asset_manager
+        # Slides are read from the same source tree the asset manager resolves against
+        self.source = asset_manager.source
+        self.slides_dir = Path(slides_dir)
+        self.log = progress
+        # Converts TeX to MathML at build time (tex_mathml.MathConverter); None leaves it alone
+        self.math_converter = math_converter
+        # Indexes each slide for the jump-to palette (search_index.SearchIndexer); None skips it
+        self.search_indexer = search_indexer
+        # Shrinks inline SVGs (svg_optimizer.SvgOptimizer); None leaves them as written
+        self.svg_optimizer = svg_optimizer
+        # Positions from select_slides() for a partial build; None builds every slide
+        self.selection = None
+
+    def selected_slides(self):
+        """(position, file name) of each configured slide the build includes"""
+        for i, slide_config in enumerate(self.config.get('slides', []), 1):
+            if self.selection is None or i in self.selection:
+                yield i, _slide_filename(slide_config)
     
     def collect_slides(self, output_mode='bundle'):
         """Read slide files from config.yaml and discover assets"""
-        slides_dir = Path("slides")
+        slides_dir = self.slides_dir
         
         # Get slide files from config.yaml
         slide_configs = self.config.get('slides', [])
         if not slide_configs:
-            print("❌ No slides defined in config.yaml")
+            self.log("❌ No slides defined in config.yaml")
             return []
         
-        print(f"📄 Processing {len(slide_configs)} slides from config.yaml")
+        selected = list(self.selected_slides())
+        if self.selection is None:
+            self.log(f"📄 Processing {len(slide_configs)} slides from config.yaml")
+        else:
+            self.log(f"📄 Processing {len(selected)} of {len(slide_configs)} slides from config.yaml")
         
         slides_content = []
-        for i, slide_config in enumerate(slide_configs, 1):
-            # Handle both formats
-            if isinstance(slide_config, str):
-                slide_filename = slide_config
-            else:
-                slide_filename = slide_config.get('file')
-            
+        math_converted = math_fallbacks = 0
+        svg_totals = {}
+        # Slides keep their deck position as 'number' in a partial build
+        for i, slide_filename in selected:
             slide_file = slides_dir / slide_filename
             
-            if not slide_file.exists():
-                print(f"   ❌ Slide not found: {slide_filename}")
+            if not self.source.exists(slide_file):
+                self.log(f"   ❌ Slide not found: {slide_filename}")
                 continue
             
             # Quietly process slide
-            content = slide_file.read_text(encoding='utf-8')
+            content = self.source.read_text(slide_file)
             
             # Extract title from HTML
             title = self._extract_title_from_html(content)
+
+            # Index the source before asset paths are rewritten, so both output modes share it
+            search = self.search_indexer.slide_entry(content, title) if self.search_indexer else None
+
+            # Optimize inline SVGs; element ids are kept for the slide's scripts
+            if self.svg_optimizer is not None:
+                content, svg_stats = self.svg_optimizer.optimize_html(content, slide_filename)
+                for key, value in svg_stats.items():
+                    svg_totals[key] = svg_totals.get(key, 0) + value
             
             # Process assets in this slide
             content, slide_assets = self.asset_manager.process_slide_assets(
@@ -65,16 +134,32 @@ class SlideProcessor:
             
             # IMPORTANT: Remove any fetch() calls from slides
             content = self._remove_fetch_calls(content)
+
+            # Typeset math as MathML; expressions that fail are left for MathJax
+            converted = fallbacks = 0
+            if self.math_converter is not None:
+                content, converted, fallbacks = self.math_converter.convert_html(content, slide_filename)
+                math_converted += converted
+                math_fallbacks += fallbacks
             
             slides_content.append({
                 'file': slide_filename,
                 'number': i,
                 'title': title,
                 'content': content,
-                'assets': slide_assets
+                'assets': slide_assets,
+                'math_fallbacks': fallbacks,
+                'search': search
             })
             
             self.asset_manager.assets_collected.extend(slide_assets)
+
+        if math_converted or math_fallbacks:
+            self.log(f"   ➗ Typeset {math_converted} math expressions as MathML, {math_fallbacks} left for MathJax")
+        if svg_totals.get('svgs'):
+            self.log(f"   🪶 Optimized {svg_totals['svgs']} inline SVGs: "
+                     f"{svg_totals['bytes_before']:,} → {svg_totals['bytes_after']:,} bytes, "
+                     f"{svg_totals['nodes_before']} → {svg_totals['nodes_after']} DOM nodes")
         
         return slides_content
     
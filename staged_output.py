@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Staged Output for Presentation Build System
+Builds into a staging directory and only touches output files whose content changed
+"""
+
+import os
+import shutil
+import hashlib
+from pathlib import Path
+
+
+# Files in the output directory that the build never produces but must not delete
+KEEP_FILES = {'CNAME', '.nojekyll'}
+
+
+class StagedOutput:
+    """Stages a build next to the output directory and syncs it in by content hash"""
+
+    def __init__(self, output_dir):
+        self.output_dir = Path(output_dir)
+        self.staging_dir = self.output_dir.with_name(f".{self.output_dir.name}.staging")
+
+    def begin(self):
+        """Create a fresh, empty staging directory"""
+        if self.staging_dir.exists():
+            shutil.rmtree(self.staging_dir)
+        self.staging_dir.mkdir(parents=True)
+        return self.staging_dir
+
+    def abort(self):
+        """Throw away the staging directory, leaving the output untouched"""
+        if self.staging_dir.exists():
+            shutil.rmtree(self.staging_dir)
+
+    def changes(self, prune=True):
+        """Compare staging with the output: (written, unchanged, removed) relative paths"""
+        staged = {p.relative_to(self.staging_dir) for p in self.staging_dir.rglob('*') if p.is_file()}
+        written, unchanged = [], []
+        for rel in sorted(staged):
+            dest = self.output_dir / rel
+            if dest.is_file() and self._same_content(self.staging_dir / rel, dest):
+                unchanged.append(rel)
+            else:
+                written.append(rel)
+
+        removed = []
+        if prune and self.output_dir.exists():
+            for p in sorted(self.output_dir.rglob('*')):
+                rel = p.relative_to(self.output_dir)
+                if p.is_file() and rel not in staged and rel.name not in KEEP_FILES:
+                    removed.append(rel)
+
+        return written, unchanged, removed
+
+    def commit(self, prune=True):
+        """Move changed files into the output and delete files the build no longer produces"""
+        if not self.output_dir.exists():
+            # First build - swap the whole staging directory in at once
+            os.replace(self.staging_dir, self.output_dir)
+            written = [p.relative_to(self.output_dir) for p in self.output_dir.rglob('*') if p.is_file()]
+            return written, [], []
+
+        written, unchanged, removed = self.changes(prune)
+
+        for rel in written:
+            dest = self.output_dir / rel
+            if dest.is_dir():
+                shutil.rmtree(dest)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            # os.replace is atomic, so readers see either the old or the new file
+            os.replace(self.staging_dir / rel, dest)
+
+        for rel in removed:
+            (self.output_dir / rel).unlink()
+
+        # Drop directories left empty by removals, deepest first
+        for p in sorted(self.output_dir.rglob('*'), key=lambda p: len(p.parts), reverse=True):
+            if p.is_dir() and not any(p.iterdir()):
+                p.rmdir()
+
+        shutil.rmtree(self.staging_dir)
+        return written, unchanged, removed
+
+    @staticmethod
+    def _same_content(a, b):
+        """Cheap size check first, then compare sha256 digests"""
+        if a.stat().st_size != b.stat().st_size:
+            return False
+        return StagedOutput._digest(a) == StagedOutput._digest(b)
+
+    @staticmethod
+    def _digest(path):
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        return h.hexdigest()
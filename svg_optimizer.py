@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+SVG Optimizer for Presentation Build System
+Shrinks inline slide SVGs: rounded coordinates, merged groups and transforms, hoisted styles, no metadata
+"""
+
+import re
+import hashlib
+
+
+# SVGs inside these are code or script text, not markup
+SKIP_RE = re.compile(r'<(script|style|pre|code|textarea)\b.*?</\1\s*>|<!--.*?-->|<svg\b',
+                     re.IGNORECASE | re.DOTALL)
+
+TOKEN_RE = re.compile(
+    r'(?P<comment><!--.*?-->)'
+    r'|(?P<cdata><!\[CDATA\[.*?\]\]>)'
+    r'|</(?P<close>[\w:.-]+)\s*>'
+    r'|<(?P<name>[\w:.-]+)(?P<attrs>(?:\s+[^\s=/>]+(?:\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s"\'>]+))?)*)\s*(?P<empty>/?)>'
+    r'|(?P<text>[^<]+|<)',
+    re.DOTALL)
+ATTR_RE = re.compile(r'([^\s=/>]+)(?:\s*=\s*("[^"]*"|\'[^\']*\'|[^\s"\'>]+))?')
+NUMBER_RE = re.compile(r'-?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?')
+TRANSFORM_RE = re.compile(r'\s*([a-zA-Z]+)\s*\(([^)]*)\)\s*,?')
+PATH_TOKEN_RE = re.compile(r'([MmLlHhVvCcSsQqTtAaZz])|(-?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?)|[\s,]+')
+
+# Kept verbatim: their content is CSS, script or HTML
+RAW_ELEMENTS = {'style', 'script', 'foreignObject'}
+# Whitespace inside these is rendered text
+TEXT_ELEMENTS = {'text', 'tspan', 'textPath', 'title', 'desc'}
+# Elements a parent group's transform can move onto
+TRANSFORMABLE = {'g', 'path', 'rect', 'circle', 'ellipse', 'line', 'polyline', 'polygon', 'text', 'use', 'image'}
+# Coordinate attributes a parent group's translate can be added into, by element
+TRANSLATABLE = {
+    'circle': (('cx', 'cy'),), 'ellipse': (('cx', 'cy'),), 'rect': (('x', 'y'),), 'image': (('x', 'y'),),
+    'use': (('x', 'y'),), 'text': (('x', 'y'),), 'line': (('x1', 'y1'), ('x2', 'y2')),
+    'path': (), 'polyline': (), 'polygon': (),
+}
+# Path commands: which argument in each group is an x (0) or y (1) coordinate
+PATH_ARGS = {'M': (0, 1), 'L': (0, 1), 'T': (0, 1), 'H': (0,), 'V': (1,), 'C': (0, 1, 0, 1, 0, 1),
+             'S': (0, 1, 0, 1), 'Q': (0, 1, 0, 1), 'A': (None, None, None, None, None, 0, 1), 'Z': ()}
+# Attributes holding coordinates and lengths, rounded to the configured precision
+GEOMETRY_ATTRS = {
+    'x', 'y', 'x1', 'y1', 'x2', 'y2', 'cx', 'cy', 'r', 'rx', 'ry', 'fx', 'fy', 'dx', 'dy',
+    'width', 'height', 'd', 'points', 'transform', 'viewBox', 'stroke-width', 'font-size',
+    'stroke-dashoffset', 'stroke-dasharray', 'offset', 'opacity', 'fill-opacity', 'stroke-opacity',
+}
+# Editor bookkeeping that browsers ignore
+METADATA_ELEMENTS = {'metadata'}
+METADATA_PREFIXES = ('inkscape:', 'sodipodi:', 'xmlns:inkscape', 'xmlns:sodipodi', 'xmlns:rdf',
+                     'xmlns:cc', 'xmlns:dc', 'xmlns:sketch', 'sketch:', 'xmlns:serif', 'serif:')
+
+# Identity transforms dropped outright
+IDENTITY_TRANSFORMS = {('translate', (0.0,)), ('translate', (0.0, 0.0)), ('scale', (1.0,)),
+                       ('scale', (1.0, 1.0)), ('rotate', (0.0,)), ('skewX', (0.0,)), ('skewY', (0.0,))}
+
+
+class Element:
+    """An SVG element: name, [name, value, quote] attributes, and child elements or strings"""
+
+    __slots__ = ('name', 'attrs', 'children')
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.children = []
+
+    def get(self, name):
+        for attr in self.attrs:
+            if attr[0] == name:
+                return attr[1]
+        return None
+
+    def set(self, name, value):
+        for attr in self.attrs:
+            if attr[0] == name:
+                attr[1] = value
+                return
+        self.attrs.append([name, value, '"'])
+
+    def remove(self, name):
+        self.attrs = [attr for attr in self.attrs if attr[0] != name]
+
+    def elements(self):
+        return [child for child in self.children if isinstance(child, Element)]
+
+
+def _parse_attrs(text):
+    attrs = []
+    for name, value in ATTR_RE.findall(text):
+        if value and value[0] in '"\'':
+            attrs.append([name, value[1:-1], value[0]])
+        else:
+            attrs.append([name, value or None, '"'])
+    return attrs
+
+
+def parse_svg(content, start):
+    """(root Element, end offset) for the <svg> at start, or None if it is not closed"""
+    stack = []
+    pos = start
+    while pos < len(content):
+        token = TOKEN_RE.match(content, pos)
+        pos = token.end()
+        if token.group('name'):
+            element = Element(token.group('name'), _parse_attrs(token.group('attrs')))
+            if stack:
+                stack[-1].children.append(element)
+            if element.name in RAW_ELEMENTS and not token.group('empty'):
+                close = re.compile(rf'</{re.escape(element.name)}\s*>', re.IGNORECASE).search(content, pos)
+                if close is None:
+                    return None
+                element.children.append(content[pos:close.start()])
+                pos = close.end()
+            elif not token.group('empty'):
+                stack.append(element)
+            elif not stack:
+                return element, pos
+        elif token.group('close'):
+            if not stack or stack[-1].name != token.group('close'):
+                return None
+            element = stack.pop()
+            if not stack:
+                return element, pos
+        elif token.group('cdata') and stack:
+            stack[-1].children.append(token.group('cdata'))
+        elif token.group('text') and stack:
+            stack[-1].children.append(token.group('text'))
+        # Comments are dropped
+    return None
+
+
+def serialize(element):
+    parts = []
+    _serialize(element, parts)
+    return ''.join(parts)
+
+
+def _serialize(element, parts):
+    parts.append('<' + element.name)
+    for name, value, quote in element.attrs:
+        if value is None:
+            parts.append(' ' + name)
+        else:
+            quote = "'" if '"' in value else quote
+            parts.append(f' {name}={quote}{value}{quote}')
+    if not element.children:
+        parts.append('/>')
+        return
+    parts.append('>')
+    for child in element.children:
+        if isinstance(child, Element):
+            _serialize(child, parts)
+        else:
+            parts.append(child)
+    parts.append(f'</{element.name}>')
+
+
+def count_nodes(markup):
+    """DOM nodes (elements, text and comments) the browser builds for an SVG's markup"""
+    return sum(1 for token in TOKEN_RE.finditer(markup)
+               if token.group('name') or token.group('comment') or token.group('cdata') or token.group('text'))
+
+
+def _format_number(value, precision):
+    text = f"{round(value, precision):.{precision}f}".rstrip('0').rstrip('.') if precision > 0 else str(round(value))
+    return '0' if text in ('-0', '') else text
+
+
+def round_numbers(value, precision):
+    """Numbers with more decimals than precision rounded, the rest left as written"""
+    def replace(match):
+        number = match.group(0)
+        decimals = number.split('.', 1)[1] if '.' in number else ''
+        if 'e' in number.lower() or len(decimals) <= precision:
+            return number
+        text = _format_number(float(number), precision)
+        # "0.999.5" is two numbers; "1.5" would be one
+        if '.' not in text and value[match.end():match.end() + 1] == '.':
+            text += ' '
+        return text
+    return NUMBER_RE.sub(replace, value)
+
+
+def _shift_list(value, offset, precision):
+    """Every number in a coordinate list moved by offset, or None if it is not one"""
+    try:
+        numbers = [float(number) for number in re.split(r'[\s,]+', value.strip()) if number]
+    except ValueError:
+        return None
+    return ' '.join(_format_number(number + offset, precision) for number in numbers) if numbers else None
+
+
+def translate_path(d, tx, ty, precision):
+    """Path data moved by (tx, ty), or None if it has syntax this does not handle"""
+    commands = []
+    command = None
+    pos = 0
+    for match in PATH_TOKEN_RE.finditer(d):
+        if match.start() != pos:
+            return None
+        pos = match.end()
+        if match.group(1):
+            command = [match.group(1), []]
+            commands.append(command)
+        elif match.group(2):
+            if command is None:
+                return None
+            command[1].append(float(match.group(2)))
+    if pos != len(d) or not commands or commands[0][0] not in 'Mm':
+        return None
+
+    parts = []
+    for n, (letter, args) in enumerate(commands):
+        axes = PATH_ARGS[letter.upper()]
+        if (len(args) % len(axes) or not args) if axes else args:
+            return None
+        # Packed arc flags ("a5 5 0 016 7") read as one number here
+        if letter in 'Aa' and any(args[i] not in (0, 1) for i in range(len(args)) if i % 7 in (3, 4)):
+            return None
+        if letter.isupper():
+            args = [arg if axes[i % len(axes)] is None else arg + (tx, ty)[axes[i % len(axes)]]
+                    for i, arg in enumerate(args)]
+        elif n == 0:
+            # A leading moveto is absolute; the pairs after it are relative linetos
+            args = [args[0] + tx, args[1] + ty] + args[2:]
+        parts.append(letter + ' '.join(_format_number(arg, precision) for arg in args))
+    return ''.join(parts).replace(' -', '-')
+
+
+def _shift_pairs(value, tx, ty, precision):
+    """An x,y point list moved by (tx, ty), or None if it is not one"""
+    try:
+        numbers = [float(number) for number in re.split(r'[\s,]+', value.strip()) if number]
+    except ValueError:
+        return None
+    if not numbers or len(numbers) % 2:
+        return None
+    return ' '.join(f"{_format_number(numbers[i] + tx, precision)},{_format_number(numbers[i + 1] + ty, precision)}"
+                    for i in range(0, len(numbers), 2))
+
+
+def _parse_transform(value):
+    """[(name, args)] for a transform list, or None if it has syntax this does not handle"""
+    items = []
+    pos = 0
+    for match in TRANSFORM_RE.finditer(value):
+        if match.start() != pos:
+            return None
+        try:
+            args = tuple(float(arg) for arg in re.split(r'[\s,]+', match.group(2).strip()) if arg)
+        except ValueError:
+            return None
+        items.append((match.group(1), args))
+        pos = match.end()
+    return items if pos == len(value) and items else None
+
+
+def simplify_transform(value, precision):
+    """Adjacent translates merged and identity transforms dropped; '' when nothing is left"""
+    items = _parse_transform(value)
+    if items is None:
+        return value
+    merged = []
+    for name, args in items:
+        if name == 'translate' and merged and merged[-1][0] == 'translate' and len(args) in (1, 2):
+            prev = merged[-1][1]
+            merged[-1] = ('translate', (prev[0] + args[0], (prev[1] if len(prev) > 1 else 0) + (args[1] if len(args) > 1 else 0)))
+        else:
+            merged.append((name, args))
+    kept = [(name, args) for name, args in merged
+            if (name, tuple(round(arg, 9) for arg in args)) not in IDENTITY_TRANSFORMS]
+    return ' '.join(f"{name}({','.join(_format_number(arg, precision) for arg in args)})" for name, args in kept)
+
+
+class SvgOptimizer:
+    """Optimizes every inline <svg> in slide HTML; element ids and classes are never touched"""
+
+    def __init__(self, config, progress=print):
+        svg_config = config.get('build', {}).get('svg_optimize')
+        self.enabled = bool(svg_config)
+        svg_config = svg_config if isinstance(svg_config, dict) else {}
+        self.precision = svg_config.get('precision', 2)
+        self.hoist_styles = svg_config.get('hoist_styles', True)
+        self.log = progress
+        # Slide HTML -> (optimized HTML, stats); both output modes optimize each slide once
+        self._optimized = {}
+
+    def optimize_html(self, content, slide=None):
+        """(HTML with its inline SVGs optimized, stats dict)"""
+        stats = {'svgs': 0, 'bytes_before': 0, 'bytes_after': 0, 'nodes_before': 0, 'nodes_after': 0}
+        if not self.enabled or '<svg' not in content:
+            return content, stats
+        if content in self._optimized:
+            return self._optimized[content]
+
+        parts = []
+        last = 0
+        pos = 0
+        while True:
+            match = SKIP_RE.search(content, pos)
+            if match is None:
+                break
+            if match.group(0).lower() != '<svg':
+                pos = match.end()
+                continue
+            parsed = parse_svg(content, match.start())
+            if parsed is None:
+                self.log(f"   ⚠️  {slide or 'Slide'}: unbalanced <svg> left as written")
+                pos = match.end()
+                continue
+            root, end = parsed
+            before = content[match.start():end]
+            self.optimize(root)
+            after = serialize(root)
+            parts.append(content[last:match.start()])
+            parts.append(after)
+            last = pos = end
+            stats['svgs'] += 1
+            stats['bytes_before'] += len(before.encode('utf-8'))
+            stats['bytes_after'] += len(after.encode('utf-8'))
+            stats['nodes_before'] += count_nodes(before)
+            stats['nodes_after'] += count_nodes(after)
+        parts.append(content[last:])
+
+        result = (''.join(parts), stats)
+        self._optimized[content] = result
+        return result
+
+    def optimize(self, root):
+        """All passes over one parsed <svg>, in place"""
+        self._clean(root)
+        self._merge_groups(root)
+        if self.hoist_styles:
+            self._hoist_styles(root)
+
+    def _clean(self, element):
+        """Drop metadata and layout whitespace; round geometry; simplify transforms"""
+        element.attrs = [attr for attr in element.attrs if not attr[0].startswith(METADATA_PREFIXES)]
+        for attr in element.attrs:
+            name, value = attr[0], attr[1]
+            if value is None or name not in GEOMETRY_ATTRS:
+                continue
+            if name == 'transform':
+                value = simplify_transform(value, self.precision)
+            attr[1] = round_numbers(value, self.precision)
+        if element.get('transform') == '':
+            element.remove('transform')
+
+        if element.name in RAW_ELEMENTS:
+            return
+        children = []
+        for child in element.children:
+            if isinstance(child, Element):
+                if child.name in METADATA_ELEMENTS or child.name.startswith(METADATA_PREFIXES):
+                    continue
+                self._clean(child)
+                children.append(child)
+            elif element.name in TEXT_ELEMENTS:
+                # Rendered text: runs of whitespace show as one space
+                children.append(re.sub(r'\s+', ' ', child))
+            elif child.strip():
+                children.append(child.strip())
+        # A tspan's edge spaces separate it from the words around it
+        if element.name in ('text', 'title', 'desc') and len(children) == 1 and isinstance(children[0], str):
+            children[0] = children[0].strip()
+        element.children = children
+
+    def _merge_groups(self, element):
+        """Unwrap <g>s with no attributes, and push a lone transform onto a group's only child"""
+        if element.name in RAW_ELEMENTS:
+            return
+        children = []
+        for child in element.children:
+            if not isinstance(child, Element):
+                children.append(child)
+                continue
+            self._merge_groups(child)
+            if child.name == 'g' and [attr[0] for attr in child.attrs] == ['transform']:
+                self._bake_translate(child)
+            if child.name == 'g' and not child.attrs:
+                children.extend(child.children)
+                continue
+            if (child.name == 'g' and [attr[0] for attr in child.attrs] == ['transform']
+                    and len(child.children) == 1 and isinstance(child.children[0], Element)
+                    and child.children[0].name in TRANSFORMABLE):
+                only = child.children[0]
+                inner = only.get('transform')
+                only.set('transform', simplify_transform(
+                    child.get('transform') + (' ' + inner if inner else ''), self.precision))
+                if only.get('transform') == '':
+                    only.remove('transform')
+                children.append(only)
+                continue
+            children.append(child)
+        element.children = children
+
+    def _bake_translate(self, group):
+        """Add a group's lone translate() into its children's coordinates, emptying the group"""
+        items = _parse_transform(group.get('transform'))
+        if not items or len(items) != 1 or items[0][0] != 'translate' or len(items[0][1]) not in (1, 2):
+            return
+        tx, ty = items[0][1][0], items[0][1][1] if len(items[0][1]) > 1 else 0.0
+        children = group.children
+        if not children or any(not isinstance(child, Element) for child in children):
+            return
+        # Gradients, clips and filters in user space would stay behind; markers follow their path
+        for child in children:
+            if child.name not in TRANSLATABLE or self._references(child):
+                return
+
+        moved = []
+        for child in children:
+            values = {}
+            if child.get('transform'):
+                values['transform'] = simplify_transform(group.get('transform') + ' ' + child.get('transform'),
+                                                         self.precision)
+            elif child.name == 'path':
+                values['d'] = translate_path(child.get('d') or '', tx, ty, self.precision)
+            elif child.name in ('polyline', 'polygon'):
+                points = _shift_pairs(child.get('points') or '', tx, ty, self.precision)
+                values['points'] = points
+            else:
+                for x_name, y_name in TRANSLATABLE[child.name]:
+                    values[x_name] = _shift_list(child.get(x_name) or '0', tx, self.precision)
+                    values[y_name] = _shift_list(child.get(y_name) or '0', ty, self.precision)
+                # Positioned tspans are in the text's coordinates too
+                for tspan in self._descendants(child):
+                    if tspan.get('x') is not None or tspan.get('y') is not None:
+                        return
+            if any(value is None for value in values.values()):
+                return
+            moved.append((child, values))
+
+        for child, values in moved:
+            for name, value in values.items():
+                if value:
+                    child.set(name, value)
+                else:
+                    child.remove(name)
+        group.remove('transform')
+
+    def _references(self, element):
+        for name, value, _ in element.attrs:
+            if value and 'url(' in value and not name.startswith('marker'):
+                return True
+        return any(self._references(child) for child in element.elements())
+
+    def _descendants(self, element):
+        for child in element.elements():
+            yield child
+            yield from self._descendants(child)
+
+    def _hoist_styles(self, root):
+        """Repeated style attributes on id-less elements become one class rule each"""
+        styled = []
+
+        def walk(element):
+            if element is not root and element.get('style') and element.get('id') is None:
+                styled.append(element)
+            if element.name not in RAW_ELEMENTS:
+                for child in element.elements():
+                    walk(child)
+        walk(root)
+
+        declarations = {}
+        for element in styled:
+            key = ' '.join(element.get('style').split()).strip().rstrip(';')
+            declarations.setdefault(key, []).append(element)
+
+        rules = []
+        for key, elements in declarations.items():
+            if len(elements) < 2:
+                continue
+            # Named by content, so the same style hoisted on several slides shares one rule
+            class_name = 'svgs-' + hashlib.sha1(key.encode('utf-8')).hexdigest()[:6]
+            rules.append(f".{class_name}{{{key}}}")
+            for element in elements:
+                element.remove('style')
+                existing = element.get('class')
+                element.set('class', f"{existing} {class_name}" if existing else class_name)
+        if rules:
+            style = Element('style', [])
+            style.children.append(''.join(rules))
+            root.children.insert(0, style)
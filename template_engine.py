@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Template Engine for Presentation Build System
+Compiles {{PLACEHOLDER}} templates into static segments and slots, rendered in a single join
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import templates
+
+
+SLOT_RE = re.compile(r'\{\{([A-Z][A-Z0-9_]*)\}\}')
+
+# Templates the builder renders, and the file in the project's templates/ dir that overrides each
+TEMPLATE_FILES = {
+    'SINGLE_FILE': 'single_file.html',
+    'BUNDLE_INDEX': 'bundle_index.html',
+    'NAVIGATION': 'navigation.js',
+    'BUNDLE_PRESENTATION': 'bundle_presentation.js',
+    'DEMO_BUFFERS': 'demo_buffers.js',
+    'MATHJAX_RUNTIME': 'mathjax_runtime.html',
+    'DEMO_MODULE_LOADER': 'demo_modules.js',
+    'PERF_HUD': 'perf_hud.js',
+    'TILE_PACK': 'tile_pack.js',
+    'SEARCH_PALETTE': 'search_palette.js',
+}
+
+
+class TemplateError(ValueError):
+    """Raised when a template is rendered without a value for one of its slots"""
+
+
+class CompiledTemplate:
+    """A template split once into static text and named slots
+
+    segments alternates static text and slot names (static, slot, static, ...), so rendering
+    is one join over the pieces. Values are inserted verbatim: a {{NAME}} inside slide
+    content or module source is never substituted again.
+    """
+
+    __slots__ = ('name', 'segments', 'slots')
+
+    def __init__(self, name, source):
+        self.name = name
+        self.segments = SLOT_RE.split(source)
+        self.slots = frozenset(self.segments[1::2])
+
+    def stream(self, values):
+        """Pieces of the rendered template in order, e.g. for writing without one big string"""
+        missing = self.slots - values.keys()
+        if missing:
+            raise TemplateError(f"Template {self.name} needs values for {', '.join(sorted(missing))}")
+        for i, segment in enumerate(self.segments):
+            if i % 2 == 0:
+                if segment:
+                    yield segment
+            else:
+                yield str(values[segment])
+
+    def render(self, **values):
+        """Rendered text; values for slots the template does not have are ignored"""
+        return ''.join(self.stream(values))
+
+
+@lru_cache(maxsize=64)
+def compile_template(name, source):
+    """Compiled form of a template, cached by its source across builds in the process"""
+    return CompiledTemplate(name, source)
+
+
+class TemplateSet:
+    """The builder's templates: built-ins from templates.py, overridden by project files
+
+    A file named as in TEMPLATE_FILES under templates_dir (read through the deck's source
+    tree) replaces the built-in template of that name. Each is compiled on first use.
+    """
+
+    def __init__(self, source=None, templates_dir='templates', progress=print):
+        self.source = source
+        self.templates_dir = Path(templates_dir) if templates_dir else None
+        self.log = progress
+        self._compiled = {}
+
+    def get(self, name):
+        """Compiled template by its templates.py name, e.g. 'SINGLE_FILE'"""
+        if name not in self._compiled:
+            self._compiled[name] = compile_template(name, self._source_text(name))
+        return self._compiled[name]
+
+    def render(self, name, **values):
+        return self.get(name).render(**values)
+
+    def _source_text(self, name):
+        if name not in TEMPLATE_FILES:
+            raise TemplateError(f"Unknown template {name}")
+        path = self.templates_dir / TEMPLATE_FILES[name] if self.templates_dir else None
+        if path is not None and self.source is not None and self.source.exists(path):
+            self.log(f"   🧩 Using {path} instead of the built-in {name} template")
+            return self.source.read_text(path)
+        return getattr(templates, name)
@@ -80,21 +80,7 @@ SINGLE_FILE = '''<!DOCTYPE html>
         }
     </style>
 
-    <!-- Math rendering with MathJax -->
-    <script>
-        MathJax = {
-            tex: {
-                inlineMath: [['$', '$'], ['\\(', '\\)']],
-                displayMath: [['$$', '$$'], ['\\[', '\\]']]
-            },
-            options: {
-                renderActions: {
-                    addMenu: []  // Disable context menu for cleaner presentation
-                }
-            }
-        };
-    </script>
-    <script src="https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-mml-chtml.js"></script>
+{{MATH_RUNTIME}}
 </head>
 <body>
     <div class="slideshow-container">
@@ -434,6 +420,7 @@ BUNDLE_INDEX = '''<!DOCTYPE html>
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{{TITLE}}</title>
     <link rel="stylesheet" href="css/styles.css">
+{{MATH_RUNTIME}}
 </head>
 <body>
     <div class="slideshow-container">
@@ -459,6 +446,7 @@ BUNDLE_INDEX = '''<!DOCTYPE html>
 
 ## File 3: templates/navigation.js
 NAVIGATION = '''let currentSlide = 0;
+let slideToken = 0;
 
 function showSlide(index) {
     if (index < 0 || index >= slidesData.length) return;
@@ -468,8 +456,16 @@ function showSlide(index) {
     console.log(`   Title: ${slidesData[index].title || 'Untitled'}`);
     console.log(`${'='.repeat(80)}`);
 
+    // Per-phase timings when the deck was built with the perf HUD (build.perf_hud)
+    const perf = window.PerfHUD ? PerfHUD.beginShow(index) : null;
+
+    // Stop the previous slide's demos, timers and listeners; track what this one starts
+    if (window.DemoScheduler) DemoScheduler.beginSlide();
+    if (perf) perf.phase('teardown');
+
     const slideContent = document.getElementById('slide-content');
     slideContent.innerHTML = slidesData[index].content;
+    if (perf) perf.phase('innerHTML');
     
     // Update counter
     document.getElementById('current-slide').textContent = index + 1;
@@ -505,11 +501,42 @@ function showSlide(index) {
             }
         }
     });
+    if (perf) perf.phase('scripts');
 
     // Fire the slideLoaded event to trigger SVG enhancement pipeline
     window.dispatchEvent(new Event('slideLoaded'));
+    if (perf) perf.phase('slideLoaded');
 
-    // Initialize interactive demos if present
+    // Math the build could not convert to MathML is typeset by MathJax (only loaded then)
+    if (window.MathJax && typeof MathJax.typesetPromise === 'function') {
+        MathJax.typesetPromise([slideContent]).catch(error => console.warn('MathJax typeset failed:', error));
+    }
+
+    // Initialize interactive demos once the modules this slide needs are loaded
+    // (immediately when they already are); a slide left in the meantime is skipped. The
+    // slide's scheduler scope stays open until then, or until a module fails to load.
+    const token = ++slideToken;
+    DemoModules.load(slidesData[index].modules || [], () => {
+        if (token !== slideToken) return;
+        if (perf) perf.phase('modules');
+        if (window.DemoScheduler) DemoScheduler.resumeSlide();
+        try {
+            initDemos(index);
+        } finally {
+            if (window.DemoScheduler) DemoScheduler.endSlide();
+            if (perf) perf.end();
+        }
+    }, () => {
+        if (token === slideToken && window.DemoScheduler) DemoScheduler.endSlide();
+        if (perf) perf.end('module_error');
+    });
+    DemoModules.prefetch(slidesData[(index + 1) % slidesData.length].modules || []);
+
+    currentSlide = index;
+}
+
+// Initialize interactive demos present on the slide
+function initDemos(index) {
     // Check for hue drag wheel (slide 06)
     if (document.getElementById('dwSVG') && typeof initHueDragWheel === 'function') {
         console.log('🎨 Initializing hue drag wheel for slide', index + 1);
@@ -553,8 +580,6 @@ function showSlide(index) {
         console.log('🛩️ Initializing flight vs now timezone demo for slide', index + 1);
         initFlightVsNow();
     }
-
-    currentSlide = index;
 }
 
 function nextSlide() {
@@ -642,3 +667,501 @@ document.addEventListener('DOMContentLoaded', function() {
 });
 '''
 
+
+## File 6: templates/demo_buffers.js
+DEMO_BUFFERS = '''// Binary buffers precomputed at build time; pages fall back to computing them when absent
+window.DEMO_BUFFERS = (function() {
+    const layout = {{LAYOUT_JSON}};
+    const binary = atob("{{BUFFER_BASE64}}");
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+
+    const buffers = {};
+    for (const [name, attributes] of Object.entries(layout)) {
+        buffers[name] = {};
+        for (const [attr, [type, offset, length, shape]] of Object.entries(attributes)) {
+            const array = new window[type](bytes.buffer, offset, length);
+            array.shape = shape;
+            buffers[name][attr] = array;
+        }
+    }
+    return buffers;
+})();
+'''
+
+
+## File 7: templates/mathjax_runtime.html (only for math the build could not convert to MathML)
+MATHJAX_RUNTIME = '''    <!-- Math rendering with MathJax -->
+    <script>
+        MathJax = {
+            tex: {
+                inlineMath: [['$', '$'], ['\\\\(', '\\\\)']],
+                displayMath: [['$$', '$$'], ['\\\\[', '\\\\]']]
+            },
+            options: {
+                renderActions: {
+                    addMenu: []  // Disable context menu for cleaner presentation
+                }
+            }
+        };
+    </script>
+    <script src="https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-mml-chtml.js"></script>'''
+
+
+## File 8: templates/demo_modules.js (js/ demo modules loaded when a slide first needs them)
+DEMO_MODULE_LOADER = '''// Demo modules load on first use: each slide lists the js/ modules it needs (deps first).
+// Single file: their source ships as inert strings, evaluated when first needed.
+// Bundle: they are fetched from js/, and the next slide's modules are prefetched.
+const DemoModules = (function() {
+    const sources = {{MODULE_SOURCES_JSON}};
+    const loaded = new Set();
+    const pending = new Map();
+    const prefetched = new Set();
+
+    function inject(name) {
+        if (name in sources) {
+            // Inline scripts run as soon as they are inserted, so this is synchronous
+            const script = document.createElement('script');
+            script.textContent = sources[name] + '\\n//# sourceURL=js/' + name;
+            document.head.appendChild(script);
+            delete sources[name];
+            loaded.add(name);
+            return null;
+        }
+        if (!pending.has(name)) {
+            pending.set(name, new Promise((resolve, reject) => {
+                const script = document.createElement('script');
+                script.src = 'js/' + name;
+                script.async = false;  // fetched in parallel, run in insertion order
+                script.onload = () => { loaded.add(name); resolve(); };
+                script.onerror = () => { pending.delete(name); reject(new Error('Could not load js/' + name)); };
+                document.head.appendChild(script);
+            }));
+        }
+        return pending.get(name);
+    }
+
+    // Load names (run in list order), then call ready - right away when all are loaded already.
+    // failed (optional) is called instead when a module cannot be loaded.
+    function load(names, ready, failed) {
+        const missing = names.filter(name => !loaded.has(name));
+        if (!missing.length) return ready();
+
+        const loading = missing.map(inject).filter(Boolean);
+        if (!loading.length) return ready();
+        Promise.all(loading).then(ready, error => {
+            console.error('❌ Demo module failed to load:', error);
+            if (failed) failed(error);
+        });
+    }
+
+    // Warm the cache for modules a slide is about to need
+    function prefetch(names) {
+        names.forEach(name => {
+            if (loaded.has(name) || name in sources || prefetched.has(name)) return;
+            prefetched.add(name);
+            const link = document.createElement('link');
+            link.rel = 'prefetch';
+            link.as = 'script';
+            link.href = 'js/' + name;
+            document.head.appendChild(link);
+        });
+    }
+
+    return { load, prefetch, loaded };
+})();
+
+'''
+
+
+## File 9: templates/perf_hud.js (only with build.perf_hud; the P key toggles the overlay)
+PERF_HUD = '''// Runtime telemetry: showSlide() phases, long tasks, demo frame times and JS heap per slide.
+// Press P for the overlay; PerfHUD.download() (or its button) saves the session as JSON for
+// `build.py --telemetry <file>`, which ranks the slides that stutter.
+const PerfHUD = (function() {
+    const SCHEMA = 'runtime-telemetry/1';
+    const FRAME_BUDGET_MS = 1000 / 60;
+    // Heap samples kept for the export: the oldest are dropped beyond this
+    const HEAP_SAMPLES = 600;
+    const startedAt = new Date().toISOString();
+    const nativeRequestFrame = window.requestAnimationFrame.bind(window);
+    const nativeSetInterval = window.setInterval.bind(window);
+    const nativeClearInterval = window.clearInterval.bind(window);
+
+    const shows = [];
+    const longTasks = [];
+    const heap = [];
+    const frames = new Map();   // "slide\\u0000demo" -> {slide, demo, frames, total, max, samples}
+    let shown = null;           // slide file currently on screen
+    let open = null;            // show still waiting for its modules
+    let overlay = null;
+    let refresh = 0;
+
+    function slideFile(index) {
+        const slide = slidesData[index];
+        return (slide && slide.file) || `slide-${index + 1}`;
+    }
+
+    function sampleHeap() {
+        // Only Chromium exposes the JS heap; elsewhere heap figures are null
+        const memory = performance.memory;
+        if (!memory) return null;
+        const sample = {
+            at_ms: +performance.now().toFixed(1),
+            slide: shown,
+            used_bytes: memory.usedJSHeapSize,
+            total_bytes: memory.totalJSHeapSize,
+            limit_bytes: memory.jsHeapSizeLimit,
+        };
+        heap.push(sample);
+        if (heap.length > HEAP_SAMPLES) heap.shift();
+        return sample;
+    }
+
+    // One showSlide() call: phase(name) closes the phase that ran since the previous mark.
+    // end(outcome) records it: 'ready' once its demos started, 'module_error' when a module
+    // failed to load, 'left' when the next slide replaced it before its modules loaded.
+    function beginShow(index) {
+        if (open) open.end('left');
+        shown = slideFile(index);
+        const record = {
+            slide: shown,
+            number: index + 1,
+            title: slidesData[index].title || '',
+            at_ms: +performance.now().toFixed(1),
+            phases_ms: {},
+            total_ms: 0,
+            heap_bytes: null,
+            outcome: null,
+        };
+        const start = performance.now();
+        let last = start;
+        let ended = false;
+        const show = {
+            phase(name) {
+                const now = performance.now();
+                record.phases_ms[name] = +((record.phases_ms[name] || 0) + now - last).toFixed(2);
+                last = now;
+            },
+            end(outcome = 'ready') {
+                if (ended) return;
+                ended = true;
+                if (open === show) open = null;
+                record.outcome = outcome;
+                if (outcome === 'left') {
+                    // Time spent waiting for modules until the slide was left
+                    show.phase('modules');
+                    record.total_ms = +(performance.now() - start).toFixed(2);
+                    shows.push(record);
+                    return;
+                }
+                show.phase(outcome === 'ready' ? 'init' : 'modules');
+                // Until the browser can produce the slide's first frame
+                nativeRequestFrame(() => {
+                    show.phase('frame');
+                    record.total_ms = +(performance.now() - start).toFixed(2);
+                    const sample = sampleHeap();
+                    record.heap_bytes = sample ? sample.used_bytes : null;
+                    shows.push(record);
+                    if (overlay) render();
+                });
+            },
+        };
+        open = show;
+        return show;
+    }
+
+    if (window.DemoScheduler && DemoScheduler.onFrame) {
+        DemoScheduler.onFrame((demo, ms) => {
+            const key = shown + '\\u0000' + demo;
+            let entry = frames.get(key);
+            if (!entry) {
+                entry = { slide: shown, demo, frames: 0, total: 0, max: 0, over_budget: 0, samples: [] };
+                frames.set(key, entry);
+            }
+            entry.frames++;
+            entry.total += ms;
+            entry.max = Math.max(entry.max, ms);
+            if (ms > FRAME_BUDGET_MS) entry.over_budget++;
+            entry.samples.push(ms);
+            if (entry.samples.length > 240) entry.samples.shift();
+        });
+    }
+
+    const longTasksSupported = !!window.PerformanceObserver &&
+        (PerformanceObserver.supportedEntryTypes || []).includes('longtask');
+    if (longTasksSupported) {
+        new PerformanceObserver(list => {
+            list.getEntries().forEach(entry => longTasks.push({
+                slide: shown,
+                at_ms: +entry.startTime.toFixed(1),
+                duration_ms: +entry.duration.toFixed(1),
+            }));
+        }).observe({ type: 'longtask', buffered: true });
+    }
+
+    function percentile(values, p) {
+        if (!values.length) return 0;
+        const sorted = values.slice().sort((a, b) => a - b);
+        return sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))];
+    }
+
+    // The session in the schema runtime_report.py ingests; sample adds a heap reading first
+    function snapshot(sample = true) {
+        if (sample) sampleHeap();
+        return {
+            schema: SCHEMA,
+            deck: {{DECK_TITLE_JSON}},
+            mode: {{BUILD_MODE_JSON}},
+            started_at: startedAt,
+            duration_ms: +performance.now().toFixed(1),
+            user_agent: navigator.userAgent,
+            device: {
+                cpus: navigator.hardwareConcurrency || null,
+                memory_gb: navigator.deviceMemory || null,
+                screen: [screen.width, screen.height],
+                pixel_ratio: window.devicePixelRatio || 1,
+            },
+            long_tasks_supported: longTasksSupported,
+            shows: shows.slice(),
+            long_tasks: longTasks.slice(),
+            frames: Array.from(frames.values(), entry => ({
+                slide: entry.slide,
+                demo: entry.demo,
+                frames: entry.frames,
+                mean_ms: +(entry.total / entry.frames).toFixed(2),
+                p95_ms: +percentile(entry.samples, 0.95).toFixed(2),
+                max_ms: +entry.max.toFixed(2),
+                over_budget: entry.over_budget,
+            })),
+            heap: heap.slice(),
+        };
+    }
+
+    function download() {
+        const blob = new Blob([JSON.stringify(snapshot(), null, 2)], { type: 'application/json' });
+        const link = document.createElement('a');
+        link.href = URL.createObjectURL(blob);
+        link.download = `telemetry-${startedAt.replace(/[:.]/g, '-')}.json`;
+        document.body.appendChild(link);
+        link.click();
+        link.remove();
+        URL.revokeObjectURL(link.href);
+    }
+
+    // Refreshed every second while open; reads the heap without recording a sample
+    function render() {
+        const data = snapshot(false);
+        const last = data.shows[data.shows.length - 1];
+        const phases = last ? Object.entries(last.phases_ms).map(([name, ms]) => `${name} ${ms.toFixed(1)}`).join(' · ') : '';
+        const worst = {};
+        data.shows.forEach(show => {
+            worst[show.slide] = Math.max(worst[show.slide] || 0, show.total_ms);
+        });
+        const slowest = Object.entries(worst).sort((a, b) => b[1] - a[1]).slice(0, 5);
+        const slideFrames = data.frames.filter(entry => entry.slide === shown);
+        const slideTasks = data.long_tasks.filter(task => task.slide === shown);
+        const heapNow = performance.memory ? { used_bytes: performance.memory.usedJSHeapSize } : null;
+
+        overlay.querySelector('.perf-hud-body').innerHTML = `
+            <div><b>${shown || '-'}</b> ${last ? last.total_ms.toFixed(1) + ' ms' : ''}</div>
+            <div class="perf-hud-dim">${phases}</div>
+            <div>Long tasks here: ${slideTasks.length} (${slideTasks.reduce((sum, task) => sum + task.duration_ms, 0).toFixed(0)} ms)</div>
+            ${slideFrames.map(entry => `<div>${entry.demo}: p95 ${entry.p95_ms} ms, max ${entry.max_ms} ms, ${entry.over_budget}/${entry.frames} over budget</div>`).join('')}
+            <div>Heap: ${heapNow ? (heapNow.used_bytes / 1048576).toFixed(1) + ' MB' : 'n/a'}</div>
+            <div class="perf-hud-dim">Slowest shows:</div>
+            ${slowest.map(([slide, ms]) => `<div class="perf-hud-dim">${ms.toFixed(1)} ms ${slide}</div>`).join('')}`;
+    }
+
+    function toggle() {
+        if (overlay) {
+            nativeClearInterval(refresh);
+            overlay.remove();
+            overlay = null;
+            return;
+        }
+        overlay = document.createElement('div');
+        overlay.className = 'perf-hud';
+        overlay.style.cssText = 'position:fixed;top:8px;right:8px;z-index:10000;max-width:420px;padding:8px 10px;' +
+            'font:12px/1.4 monospace;color:#e8f5e9;background:rgba(0,0,0,0.8);border-radius:6px;';
+        overlay.innerHTML = '<style>.perf-hud-dim{opacity:0.7}</style><div class="perf-hud-body"></div>' +
+            '<button style="margin-top:6px;font:inherit">⬇ Telemetry JSON</button>';
+        overlay.querySelector('button').addEventListener('click', download);
+        document.body.appendChild(overlay);
+        render();
+        refresh = nativeSetInterval(render, 1000);
+    }
+
+    document.addEventListener('keydown', event => {
+        const typing = event.target.closest && event.target.closest('input, textarea, select');
+        if ((event.key === 'p' || event.key === 'P') && !typing) toggle();
+    });
+
+    return { beginShow, snapshot, download, toggle };
+})();
+
+window.PerfHUD = PerfHUD;
+
+'''
+
+
+## File 10: templates/tile_pack.js (only with build.tile_pack; read by js/tile-pack.js)
+TILE_PACK = '''// Offline map tiles packed at build time (tile_pack.py). The single file carries them as one
+// base64 blob, decoded on first use; the bundle loads tiles/{z}/{x}/{y}.webp next to index.html
+window.TILE_PACK = Object.assign({{TILE_INDEX_JSON}}, { base64: "{{TILE_BLOB_BASE64}}" });
+'''
+
+
+## File 11: templates/search_palette.js (with build.search; / or Ctrl+K opens it)
+SEARCH_PALETTE = '''// Jump-to palette over the build-time search index (search_index.py): sorted terms, so each
+// query word is a binary search for its prefix run, then a walk over that run's postings.
+const SlideSearch = (function() {
+    const index = {{SEARCH_INDEX_JSON}};
+    const MAX_RESULTS = 12;
+    let palette = null;
+    let input = null;
+    let list = null;
+    let results = [];
+    let selected = 0;
+
+    // First term >= word
+    function lowerBound(word) {
+        let lo = 0;
+        let hi = index.terms.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >>> 1;
+            if (index.terms[mid] < word) lo = mid + 1;
+            else hi = mid;
+        }
+        return lo;
+    }
+
+    // slide -> best score among the terms starting with prefix; exact matches count double
+    function prefixScores(prefix) {
+        const scores = new Map();
+        for (let t = lowerBound(prefix); t < index.terms.length && index.terms[t].startsWith(prefix); t++) {
+            const exact = index.terms[t] === prefix ? 2 : 1;
+            for (let p = index.offsets[t]; p < index.offsets[t + 1]; p++) {
+                const slide = index.postings[2 * p];
+                const score = index.postings[2 * p + 1] * exact;
+                if (score > (scores.get(slide) || 0)) scores.set(slide, score);
+            }
+        }
+        return scores;
+    }
+
+    // Slides matching every word of the query, best first: [{slide, score}]
+    function search(query) {
+        const words = query.toLowerCase().match(/[a-z0-9_$]+/g) || [];
+        let totals = null;
+        for (const word of words) {
+            const scores = prefixScores(word);
+            const next = new Map();
+            for (const [slide, score] of scores) {
+                if (totals === null || totals.has(slide)) next.set(slide, (totals ? totals.get(slide) : 0) + score);
+            }
+            totals = next;
+            if (!totals.size) break;
+        }
+        return [...(totals || new Map())]
+            .map(([slide, score]) => ({ slide, score }))
+            .sort((a, b) => b.score - a.score || a.slide - b.slide)
+            .slice(0, MAX_RESULTS);
+    }
+
+    function render() {
+        const query = input.value.trim();
+        results = search(query);
+        const number = /^\\d+$/.test(query) ? parseInt(query, 10) - 1 : -1;
+        if (number >= 0 && number < slidesData.length) {
+            results = [{ slide: number, score: Infinity }, ...results.filter(r => r.slide !== number)];
+        }
+        if (!query) results = slidesData.map((_, slide) => ({ slide, score: 0 })).slice(0, MAX_RESULTS);
+        selected = 0;
+        list.textContent = '';
+        results.forEach((result, i) => {
+            const item = document.createElement('li');
+            item.style.cssText = 'padding:6px 10px;border-radius:4px;cursor:pointer;';
+            const title = document.createElement('div');
+            title.textContent = (result.slide + 1) + '. ' + (slidesData[result.slide].title || 'Untitled Slide');
+            const snippet = document.createElement('div');
+            snippet.textContent = index.snippets[result.slide] || '';
+            snippet.style.cssText = 'opacity:0.65;font-size:12px;white-space:nowrap;overflow:hidden;text-overflow:ellipsis;';
+            item.append(title, snippet);
+            item.addEventListener('mousedown', event => { event.preventDefault(); jump(i); });
+            list.appendChild(item);
+        });
+        highlight();
+    }
+
+    function highlight() {
+        Array.from(list.children).forEach((item, i) => {
+            item.style.background = i === selected ? 'rgba(41,245,200,0.2)' : '';
+            if (i === selected) item.scrollIntoView({ block: 'nearest' });
+        });
+    }
+
+    function jump(i) {
+        const result = results[i];
+        close();
+        if (result) goToSlide(result.slide);
+    }
+
+    function open() {
+        if (!palette) {
+            palette = document.createElement('div');
+            palette.style.cssText = 'position:fixed;top:12vh;left:50%;transform:translateX(-50%);z-index:100000;' +
+                'width:min(640px,90vw);padding:10px;border-radius:8px;background:rgba(20,24,28,0.97);' +
+                'color:#e8f5e9;font:14px/1.4 system-ui,sans-serif;box-shadow:0 8px 32px rgba(0,0,0,0.6);';
+            input = document.createElement('input');
+            input.type = 'search';
+            input.placeholder = 'Jump to slide: title, text, code or number';
+            input.style.cssText = 'width:100%;box-sizing:border-box;padding:8px 10px;font:inherit;' +
+                'border:1px solid #29f5c8;border-radius:4px;background:#0d1014;color:inherit;';
+            list = document.createElement('ul');
+            list.style.cssText = 'list-style:none;margin:8px 0 0;padding:0;max-height:50vh;overflow-y:auto;';
+            palette.append(input, list);
+            input.addEventListener('input', render);
+            input.addEventListener('blur', close);
+        }
+        document.body.appendChild(palette);
+        input.value = '';
+        render();
+        input.focus();
+    }
+
+    function close() {
+        if (palette && palette.parentNode) palette.remove();
+    }
+
+    function isOpen() {
+        return !!(palette && palette.parentNode);
+    }
+
+    // Capture phase, so the slide navigation never sees keys typed into the palette
+    window.addEventListener('keydown', event => {
+        if (isOpen()) {
+            event.stopPropagation();
+            if (event.key === 'Escape') close();
+            else if (event.key === 'Enter') { event.preventDefault(); jump(selected); }
+            else if (event.key === 'ArrowDown' || event.key === 'ArrowUp') {
+                event.preventDefault();
+                const step = event.key === 'ArrowDown' ? 1 : -1;
+                selected = (selected + step + results.length) % Math.max(results.length, 1);
+                highlight();
+            }
+            return;
+        }
+        const typing = event.target.closest && event.target.closest('input, textarea, select');
+        if ((event.key === '/' && !typing) || ((event.ctrlKey || event.metaKey) && event.key.toLowerCase() === 'k')) {
+            event.preventDefault();
+            event.stopPropagation();
+            open();
+        }
+    }, true);
+
+    return { search, open, close };
+})();
+
+window.SlideSearch = SlideSearch;
+'''
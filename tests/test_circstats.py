@@ -0,0 +1,18 @@
+import numpy as np
+
+import circstats
+from periodic import PeriodicArray
+
+
+def test_unwrap_keeps_half_period_steps_like_numpy():
+    # Hue at half-degree resolution has exact 180° steps in both directions
+    hues = np.array([0, 180, 0, 180, 360, 540, 179.5, -0.5, -180, 0])
+    np.testing.assert_array_equal(circstats.unwrap(hues, period=360), np.unwrap(hues, period=360))
+    np.testing.assert_array_equal(PeriodicArray.hue(hues).unwrap(),
+                                  np.unwrap(PeriodicArray.hue(hues).data, period=360))
+
+
+def test_unwrap_matches_numpy_on_radians():
+    rng = np.random.default_rng(0)
+    walk = circstats.wrap(np.cumsum(rng.normal(0, 1.5, (3, 1000)), axis=1))
+    np.testing.assert_allclose(circstats.unwrap(walk, axis=1), np.unwrap(walk, axis=1), atol=1e-9)
@@ -0,0 +1,76 @@
+import io
+import re
+
+from PIL import Image
+
+from build_fs import MemoryFS
+from image_atlas import ImageAtlas, TRANSPARENT_PIXEL
+from transcode_cache import MemoryTranscodeCache
+
+
+CONFIG = {'build': {'image_atlas': {'max_size': 128}}}
+# icon.webp is 100x40 at the top left of a 200x100 atlas
+LAYOUT = {'icon.webp': ('assets/atlas-0.webp', (200, 100), 0, 0, 100, 40)}
+
+
+def rewrite(content):
+    return ImageAtlas(CONFIG, MemoryFS(), MemoryFS())._rewrite(content, LAYOUT)
+
+
+def style_of(tag):
+    return re.search(r'style="([^"]*)"', tag).group(1)
+
+
+def test_one_css_side_keeps_aspect_ratio():
+    tag, count = rewrite('<img src="assets/icon.webp" style="width:50px" alt="">')
+    assert count == 1
+    assert f'src="{TRANSPARENT_PIXEL}"' in tag
+    assert 'data-atlas-src="assets/icon.webp"' in tag
+    assert 'width="100" height="40"' in tag
+    style = style_of(tag)
+    assert style.startswith('width:50px;background-image:url(assets/atlas-0.webp);')
+    assert 'aspect-ratio:100/40' in style
+    assert style.endswith(';height:auto')
+
+
+def test_unsized_tag_gets_attributes_and_no_auto_side():
+    tag, count = rewrite('<img src="assets/icon.webp" alt="">')
+    assert count == 1
+    assert 'width="100" height="40"' in tag
+    style = style_of(tag)
+    assert 'aspect-ratio:100/40' in style
+    assert 'height:auto' not in style and 'width:auto' not in style
+
+
+def test_classed_tag_stays_a_plain_image():
+    content = '<img src="assets/icon.webp" class="meta-logo" style="max-width:50px">'
+    assert rewrite(content) == (content, 0)
+
+
+def webp(size, color):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'WebP')
+    return buffer.getvalue()
+
+
+def test_pack_rewrites_tags_and_drops_packed_files():
+    images = {'icon.webp': webp((100, 40), 'red'), 'dot.webp': webp((30, 30), 'blue')}
+    source = MemoryFS({f"images/{name}": data for name, data in images.items()})
+    output = MemoryFS({f"presentation_bundle/assets/{name}": data for name, data in images.items()})
+    slides = [{
+        'content': '<img src="assets/icon.webp" style="width:50px"><img src="assets/dot.webp">',
+        'assets': [{'type': 'image', 'original': f"images/{name}", 'processed': f"assets/{name}"}
+                   for name in images],
+    }]
+    atlas = ImageAtlas(CONFIG, source, output, MemoryTranscodeCache(), progress=lambda *args: None)
+
+    atlas.pack(slides)
+
+    assert atlas.report['images'] == 2 and atlas.report['img_tags'] == 2
+    assert sorted(atlas.report['files_removed']) == ['dot.webp', 'icon.webp']
+    assert [str(path) for path in output.files()] == ['presentation_bundle/assets/atlas-0.webp']
+    tags = re.findall(r'<img\b[^>]*>', slides[0]['content'])
+    assert 'aspect-ratio:100/40' in style_of(tags[0]) and 'height:auto' in style_of(tags[0])
+    assert 'aspect-ratio:30/30' in style_of(tags[1])
+    with Image.open(io.BytesIO(output.read_bytes('presentation_bundle/assets/atlas-0.webp'))) as img:
+        assert img.size == (atlas.report['atlases'][0]['width'], atlas.report['atlases'][0]['height'])
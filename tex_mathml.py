@@ -0,0 +1,683 @@
+#!/usr/bin/env python3
+"""
+TeX to MathML for Presentation Build System
+Typesets $…$, $$…$$, \\(…\\) and \\[…\\] in slide HTML as static MathML at build time
+"""
+
+import re
+import html
+from collections import namedtuple
+
+from transcode_cache import TranscodeCache
+
+
+# Bump when the generated markup changes so cached expressions are converted again
+CONVERTER_VERSION = 1
+
+# 'mathml' converts at build time and loads MathJax only for what fails to convert,
+# 'mathjax' leaves the TeX alone and always loads MathJax (the old behaviour)
+MODES = ('mathml', 'mathjax')
+
+# Markup whose text is never math: scripts, styles, code, existing MathML, comments, tags
+SKIP_RE = re.compile(
+    r'<(script|style|pre|code|textarea|math)\b.*?</\1\s*>|<!--.*?-->|<[^>]*>',
+    re.IGNORECASE | re.DOTALL)
+
+# Same delimiters as the MathJax config; an inline $ must hug its contents and the
+# closing $ may not be followed by a digit, so prices like "$5 or $10" stay text
+MATH_RE = re.compile(
+    r'\$\$(?P<dollars>.+?)\$\$'
+    r'|\\\[(?P<brackets>.+?)\\\]'
+    r'|\\\((?P<parens>.+?)\\\)'
+    r'|(?<![\\$])\$(?P<dollar>[^\s$](?:[^$]*?[^\s\\$])?)\$(?!\d)',
+    re.DOTALL)
+DISPLAY_GROUPS = ('dollars', 'brackets')
+
+TOKEN_RE = re.compile(r'\\([A-Za-z]+\*?)|\\(.)|(\d+(?:\.\d+)?|\.\d+)|(\s+)|(.)', re.DOTALL)
+
+
+class TexError(ValueError):
+    """TeX the converter does not handle; the expression is left for MathJax"""
+
+
+GREEK = {
+    'alpha': 'α', 'beta': 'β', 'gamma': 'γ', 'delta': 'δ', 'epsilon': 'ϵ', 'varepsilon': 'ε',
+    'zeta': 'ζ', 'eta': 'η', 'theta': 'θ', 'vartheta': 'ϑ', 'iota': 'ι', 'kappa': 'κ',
+    'lambda': 'λ', 'mu': 'μ', 'nu': 'ν', 'xi': 'ξ', 'pi': 'π', 'varpi': 'ϖ', 'rho': 'ρ',
+    'varrho': 'ϱ', 'sigma': 'σ', 'varsigma': 'ς', 'tau': 'τ', 'upsilon': 'υ', 'phi': 'ϕ',
+    'varphi': 'φ', 'chi': 'χ', 'psi': 'ψ', 'omega': 'ω',
+}
+# Upright in TeX
+GREEK_UPPER = {
+    'Gamma': 'Γ', 'Delta': 'Δ', 'Theta': 'Θ', 'Lambda': 'Λ', 'Xi': 'Ξ', 'Pi': 'Π',
+    'Sigma': 'Σ', 'Upsilon': 'Υ', 'Phi': 'Φ', 'Psi': 'Ψ', 'Omega': 'Ω',
+}
+
+IDENTIFIERS = {
+    'infty': '∞', 'partial': '∂', 'nabla': '∇', 'hbar': 'ℏ', 'ell': 'ℓ', 'emptyset': '∅',
+    'varnothing': '∅', 'aleph': 'ℵ', 'Re': 'ℜ', 'Im': 'ℑ', 'wp': '℘', 'imath': 'ı', 'jmath': 'ȷ',
+}
+
+OPERATORS = {
+    # Binary operators
+    'pm': '±', 'mp': '∓', 'times': '×', 'div': '÷', 'cdot': '⋅', 'cdotp': '⋅', 'ast': '∗',
+    'star': '⋆', 'circ': '∘', 'bullet': '∙', 'oplus': '⊕', 'ominus': '⊖', 'otimes': '⊗',
+    'odot': '⊙', 'cup': '∪', 'cap': '∩', 'setminus': '∖', 'wedge': '∧', 'land': '∧',
+    'vee': '∨', 'lor': '∨', 'dagger': '†',
+    # Relations
+    'le': '≤', 'leq': '≤', 'ge': '≥', 'geq': '≥', 'ne': '≠', 'neq': '≠', 'approx': '≈',
+    'equiv': '≡', 'sim': '∼', 'simeq': '≃', 'cong': '≅', 'propto': '∝', 'll': '≪', 'gg': '≫',
+    'prec': '≺', 'succ': '≻', 'in': '∈', 'notin': '∉', 'ni': '∋', 'subset': '⊂', 'supset': '⊃',
+    'subseteq': '⊆', 'supseteq': '⊇', 'perp': '⊥', 'parallel': '∥', 'mid': '∣', 'models': '⊨',
+    'vdash': '⊢', 'doteq': '≐', 'leqslant': '⩽', 'geqslant': '⩾', 'lesssim': '≲',
+    'gtrsim': '≳', 'coloneqq': '≔', 'triangleq': '≜', 'lt': '<', 'gt': '>', 'colon': ':',
+    # Arrows
+    'to': '→', 'rightarrow': '→', 'leftarrow': '←', 'gets': '←', 'leftrightarrow': '↔',
+    'Rightarrow': '⇒', 'Leftarrow': '⇐', 'Leftrightarrow': '⇔', 'implies': '⟹',
+    'impliedby': '⟸', 'iff': '⟺', 'mapsto': '↦', 'longrightarrow': '⟶',
+    'longleftarrow': '⟵', 'longmapsto': '⟼', 'uparrow': '↑', 'downarrow': '↓',
+    'nearrow': '↗', 'searrow': '↘', 'hookrightarrow': '↪', 'rightleftharpoons': '⇌',
+    # Logic and misc
+    'neg': '¬', 'lnot': '¬', 'forall': '∀', 'exists': '∃', 'nexists': '∄', 'angle': '∠',
+    'triangle': '△', 'therefore': '∴', 'because': '∵', 'prime': '′',
+    'ldots': '…', 'dots': '…', 'cdots': '⋯', 'vdots': '⋮', 'ddots': '⋱',
+}
+
+# Delimiters usable after \left, \right and \big; as plain symbols they do not stretch
+DELIMITERS = {
+    'langle': '⟨', 'rangle': '⟩', 'lvert': '|', 'rvert': '|', 'vert': '|', 'lVert': '‖',
+    'rVert': '‖', 'Vert': '‖', 'lfloor': '⌊', 'rfloor': '⌋', 'lceil': '⌈', 'rceil': '⌉',
+    'lbrace': '{', 'rbrace': '}', 'lbrack': '[', 'rbrack': ']', 'backslash': '\\',
+}
+FENCE_CHARS = '()[]|/'
+ESCAPED_DELIMITERS = {'{': '{', '}': '}', '|': '‖'}
+BIG_SIZES = {'big': '1.2em', 'Big': '1.623em', 'bigg': '2.047em', 'Bigg': '2.470em'}
+
+# Limits go above/below in display math (the browser moves them aside inline)
+LARGE_OPERATORS = {
+    'sum': '∑', 'prod': '∏', 'coprod': '∐', 'bigcup': '⋃', 'bigcap': '⋂', 'bigvee': '⋁',
+    'bigwedge': '⋀', 'bigoplus': '⨁', 'bigotimes': '⨂', 'bigodot': '⨀', 'biguplus': '⨄',
+}
+INTEGRALS = {'int': '∫', 'iint': '∬', 'iiint': '∭', 'oint': '∮'}
+
+FUNCTIONS = {
+    'sin', 'cos', 'tan', 'cot', 'sec', 'csc', 'arcsin', 'arccos', 'arctan', 'sinh', 'cosh',
+    'tanh', 'coth', 'log', 'ln', 'lg', 'exp', 'arg', 'deg', 'dim', 'hom', 'ker',
+}
+LIMIT_FUNCTIONS = {
+    'lim': 'lim', 'liminf': 'lim inf', 'limsup': 'lim sup', 'max': 'max', 'min': 'min',
+    'sup': 'sup', 'inf': 'inf', 'det': 'det', 'gcd': 'gcd', 'Pr': 'Pr',
+}
+
+# (character, stretchy, under)
+ACCENTS = {
+    'hat': ('^', False, False), 'widehat': ('^', True, False), 'check': ('ˇ', False, False),
+    'tilde': ('˜', False, False), 'widetilde': ('˜', True, False), 'bar': ('¯', False, False),
+    'overline': ('―', True, False), 'vec': ('→', False, False),
+    'overrightarrow': ('→', True, False), 'overleftarrow': ('←', True, False),
+    'dot': ('˙', False, False), 'ddot': ('¨', False, False), 'breve': ('˘', False, False),
+    'acute': ('´', False, False), 'grave': ('`', False, False),
+    'underline': ('―', True, True),
+}
+BRACES = {'overbrace': ('⏞', 'mover'), 'underbrace': ('⏟', 'munder')}
+
+SPACES = {
+    ',': '0.1667em', ':': '0.2222em', '>': '0.2222em', ';': '0.2778em', '!': '-0.1667em',
+    ' ': '0.25em', '\n': '0.25em', 'thinspace': '0.1667em', 'medspace': '0.2222em',
+    'thickspace': '0.2778em', 'negthinspace': '-0.1667em', 'enspace': '0.5em',
+    'quad': '1em', 'qquad': '2em',
+}
+
+STYLE_SWITCHES = {
+    'displaystyle': 'displaystyle="true" scriptlevel="0"',
+    'textstyle': 'displaystyle="false" scriptlevel="0"',
+    'scriptstyle': 'displaystyle="false" scriptlevel="1"',
+}
+
+TEXT_COMMANDS = {
+    'text': '', 'textrm': '', 'textnormal': '', 'mbox': '', 'textup': '',
+    'textit': ' style="font-style:italic"', 'textbf': ' style="font-weight:bold"',
+    'textsf': ' style="font-family:sans-serif"', 'texttt': ' style="font-family:monospace"',
+}
+TEXT_ESCAPES = {'$': '$', '%': '%', '&': '&', '_': '_', '{': '{', '}': '}', '#': '#',
+                ' ': ' ', '\n': ' ', ',': '\u2009', ';': '\u2005'}
+
+FONTS = {
+    'mathrm': 'normal', 'mathup': 'normal', 'mathbf': 'bold', 'boldsymbol': 'bold',
+    'bm': 'bold', 'mathit': 'italic', 'mathbb': 'double-struck', 'mathcal': 'script',
+    'mathscr': 'script', 'mathfrak': 'fraktur', 'mathsf': 'sans-serif', 'mathtt': 'monospace',
+}
+# Mathematical Alphanumeric Symbols: (A, a, 0) code points and the letters that live elsewhere
+ALPHANUMERICS = {
+    'bold': (0x1D400, 0x1D41A, 0x1D7CE, {}),
+    'italic': (0x1D434, 0x1D44E, None, {'h': 'ℎ'}),
+    'double-struck': (0x1D538, 0x1D552, 0x1D7D8, {
+        'C': 'ℂ', 'H': 'ℍ', 'N': 'ℕ', 'P': 'ℙ', 'Q': 'ℚ', 'R': 'ℝ', 'Z': 'ℤ'}),
+    'script': (0x1D49C, 0x1D4B6, None, {
+        'B': 'ℬ', 'E': 'ℰ', 'F': 'ℱ', 'H': 'ℋ', 'I': 'ℐ', 'L': 'ℒ', 'M': 'ℳ', 'R': 'ℛ',
+        'e': 'ℯ', 'g': 'ℊ', 'o': 'ℴ'}),
+    'fraktur': (0x1D504, 0x1D51E, None, {'C': 'ℭ', 'H': 'ℌ', 'I': 'ℑ', 'R': 'ℜ', 'Z': 'ℨ'}),
+    'sans-serif': (0x1D5A0, 0x1D5BA, 0x1D7E2, {}),
+    'monospace': (0x1D670, 0x1D68A, 0x1D7F6, {}),
+}
+
+NEGATIONS = {'=': '≠', '<': '≮', '>': '≯', 'in': '∉', 'equiv': '≢', 'subset': '⊄',
+             'subseteq': '⊈', 'sim': '≁', 'approx': '≉', 'mid': '∤', 'parallel': '∦'}
+
+# Environment -> (column alignments, repeated across the row; opening and closing fence)
+ENVIRONMENTS = {
+    'matrix': (['center'], '', ''), 'pmatrix': (['center'], '(', ')'),
+    'bmatrix': (['center'], '[', ']'), 'Bmatrix': (['center'], '{', '}'),
+    'vmatrix': (['center'], '|', '|'), 'Vmatrix': (['center'], '‖', '‖'),
+    'cases': (['left'], '{', ''),
+    'aligned': (['right', 'left'], '', ''), 'align': (['right', 'left'], '', ''),
+    'align*': (['right', 'left'], '', ''), 'split': (['right', 'left'], '', ''),
+    'gathered': (['center'], '', ''), 'gather': (['center'], '', ''),
+    'gather*': (['center'], '', ''),
+}
+ALIGNED = {'aligned', 'align', 'align*', 'split'}
+
+ROW_END = {('char', '}'), ('cmd', 'right'), ('cmd', 'end'), ('char', '&'), ('sym', '\\')}
+
+_Base = namedtuple('_Base', 'markup limits apply', defaults=(False, False))
+
+
+def _escape(text):
+    return html.escape(text, quote=False)
+
+
+def _row(nodes):
+    """One MathML element for a list of them"""
+    return nodes[0] if len(nodes) == 1 else f"<mrow>{''.join(nodes)}</mrow>"
+
+
+def _mo(char, stretchy=None, attrs=''):
+    if stretchy is not None:
+        attrs += f' stretchy="{str(stretchy).lower()}"'
+    return f'<mo{attrs}>{_escape(char)}</mo>'
+
+
+def _fence(char):
+    return _mo(char, True, ' fence="true" symmetric="true"') if char else ''
+
+
+def _styled(char, variant):
+    """char in one of the Unicode math alphabets, e.g. R -> ℝ for double-struck"""
+    upper, lower, digits, holes = ALPHANUMERICS[variant]
+    if char in holes:
+        return holes[char]
+    if 'A' <= char <= 'Z':
+        return chr(upper + ord(char) - ord('A'))
+    if 'a' <= char <= 'z':
+        return chr(lower + ord(char) - ord('a'))
+    if '0' <= char <= '9' and digits:
+        return chr(digits + ord(char) - ord('0'))
+    return char
+
+
+def _describe(token):
+    kind, value = token
+    if kind is None:
+        return 'end of expression'
+    return '\\' + value if kind in ('cmd', 'sym') else repr(value)
+
+
+class _Parser:
+    """Recursive-descent parser for the TeX math subset the slides use"""
+
+    def __init__(self, tex):
+        self.tokens = []
+        for command, symbol, number, space, char in TOKEN_RE.findall(tex):
+            if command:
+                self.tokens.append(('cmd', command))
+            elif symbol:
+                self.tokens.append(('sym', symbol))
+            elif number:
+                self.tokens.append(('num', number))
+            elif space:
+                self.tokens.append(('space', ' '))
+            else:
+                self.tokens.append(('char', char))
+        self.pos = 0
+        self.font = None
+
+    # ---- Tokens --------------------------------------------------------------
+
+    def peek(self):
+        while self.pos < len(self.tokens) and self.tokens[self.pos][0] == 'space':
+            self.pos += 1
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def next(self):
+        token = self.peek()
+        if token[0] is None:
+            raise TexError("unexpected end of expression")
+        self.pos += 1
+        return token
+
+    def expect(self, token):
+        found = self.next()
+        if found != token:
+            raise TexError(f"expected {_describe(token)}, found {_describe(found)}")
+
+    def text_argument(self):
+        """Raw text of a {…} argument, for \\text, \\operatorname and environment names"""
+        self.expect(('char', '{'))
+        text, depth = [], 0
+        while True:
+            if self.pos >= len(self.tokens):
+                raise TexError("unterminated text argument")
+            kind, value = self.tokens[self.pos]
+            self.pos += 1
+            if kind == 'char' and value == '}':
+                if depth == 0:
+                    return ''.join(text)
+                depth -= 1
+            elif kind == 'char' and value == '{':
+                depth += 1
+            elif kind == 'sym' and value in TEXT_ESCAPES:
+                text.append(TEXT_ESCAPES[value])
+            elif kind == 'char' and value == '~':
+                text.append('\xa0')
+            elif kind in ('cmd', 'sym'):
+                raise TexError(f"{_describe((kind, value))} inside text")
+            else:
+                text.append(value)
+
+    # ---- Grammar -------------------------------------------------------------
+
+    def row(self, close=None):
+        """Atoms up to the end of the current group, cell or optional argument"""
+        nodes = []
+        while True:
+            token = self.peek()
+            if token[0] is None or token in ROW_END or token == ('char', close):
+                return nodes
+            if token[0] == 'cmd' and token[1] in STYLE_SWITCHES:
+                self.pos += 1
+                rest = _row(self.row(close))
+                nodes.append(f'<mstyle {STYLE_SWITCHES[token[1]]}>{rest}</mstyle>')
+                return nodes
+            nodes.append(self.atom())
+
+    def atom(self):
+        """A base with any sub/superscripts and primes"""
+        if self.peek() in (('char', '^'), ('char', '_')):
+            base = _Base('<mrow></mrow>')
+        else:
+            base = self.base()
+
+        sub = sup = None
+        primes = ''
+        while True:
+            token = self.peek()
+            if token == ('char', "'"):
+                self.pos += 1
+                primes += '′'
+            elif token in (('char', '^'), ('char', '_')):
+                self.pos += 1
+                argument = self.argument()
+                if token[1] == '^':
+                    if sup is not None:
+                        raise TexError("double superscript")
+                    sup = argument
+                else:
+                    if sub is not None:
+                        raise TexError("double subscript")
+                    sub = argument
+            elif token in (('cmd', 'limits'), ('cmd', 'nolimits')):
+                self.pos += 1
+                base = base._replace(limits=token[1] == 'limits')
+            else:
+                break
+
+        if primes:
+            sup = _mo(primes) if sup is None else f'<mrow>{_mo(primes)}{sup}</mrow>'
+        markup = base.markup
+        if sub is not None or sup is not None:
+            under, over, both = ('munder', 'mover', 'munderover') if base.limits else ('msub', 'msup', 'msubsup')
+            if sup is None:
+                markup = f'<{under}>{markup}{sub}</{under}>'
+            elif sub is None:
+                markup = f'<{over}>{markup}{sup}</{over}>'
+            else:
+                markup = f'<{both}>{markup}{sub}{sup}</{both}>'
+        if base.apply:
+            markup += '<mo>&#x2061;</mo>'
+        return markup
+
+    def argument(self):
+        """A {group} or a single token, as one MathML element"""
+        kind, value = self.peek()
+        if kind == 'num' and len(value) > 1:
+            # x^23 is x² followed by 3
+            self.tokens[self.pos] = ('num', value[1:])
+            return self.number(value[0])
+        if kind is None or (kind, value) in ROW_END or (kind == 'char' and value in '^_'):
+            raise TexError(f"missing argument before {_describe((kind, value))}")
+        return self.base().markup
+
+    def group(self):
+        nodes = self.row()
+        self.expect(('char', '}'))
+        return _row(nodes) if nodes else '<mrow></mrow>'
+
+    def number(self, digits):
+        if self.font in ALPHANUMERICS:
+            digits = ''.join(_styled(c, self.font) for c in digits)
+        return f'<mn>{digits}</mn>'
+
+    def identifier(self, char, upright=False):
+        if self.font in ALPHANUMERICS and char.isascii():
+            return f'<mi>{_styled(char, self.font)}</mi>'
+        if upright or self.font == 'normal':
+            return f'<mi mathvariant="normal">{_escape(char)}</mi>'
+        return f'<mi>{_escape(char)}</mi>'
+
+    def base(self):
+        kind, value = self.next()
+        if kind == 'char':
+            return self.char(value)
+        if kind == 'num':
+            return _Base(self.number(value))
+        if kind == 'sym':
+            return self.symbol(value)
+        return self.command(value)
+
+    def char(self, char):
+        if char == '{':
+            return _Base(self.group())
+        if char.isalpha():
+            return _Base(self.identifier(char))
+        if char in FENCE_CHARS:
+            return _Base(_mo(char, False))
+        if char == '-':
+            return _Base(_mo('−'))
+        if char == '*':
+            return _Base(_mo('∗'))
+        if char == '~':
+            return _Base('<mtext>&#xA0;</mtext>')
+        if char == "'":
+            return _Base(_mo('′'))
+        if char in '+=<>,;:!.?@':
+            return _Base(_mo(char))
+        if char in '}&#%$^_\\':
+            raise TexError(f"unexpected {char!r}")
+        return _Base(_mo(char))
+
+    def symbol(self, char):
+        if char in SPACES:
+            return _Base(f'<mspace width="{SPACES[char]}"/>')
+        if char in ESCAPED_DELIMITERS:
+            return _Base(_mo(ESCAPED_DELIMITERS[char], False))
+        if char in '$%&_#':
+            return _Base(_mo(char))
+        raise TexError(f"unsupported command \\{char}")
+
+    def delimiter(self):
+        """The delimiter after \\left, \\right, \\middle or \\big; '' for the null delimiter '.'"""
+        kind, value = self.next()
+        if kind == 'char' and value == '.':
+            return ''
+        if kind == 'char' and value in FENCE_CHARS:
+            return value
+        if kind == 'char' and value in '<>':
+            return '⟨' if value == '<' else '⟩'
+        if kind == 'sym' and value in ESCAPED_DELIMITERS:
+            return ESCAPED_DELIMITERS[value]
+        if kind == 'cmd' and value in DELIMITERS:
+            return DELIMITERS[value]
+        if kind == 'cmd' and value in ('uparrow', 'downarrow'):
+            return OPERATORS[value]
+        raise TexError(f"{_describe((kind, value))} is not a delimiter")
+
+    def command(self, name):
+        if name in GREEK:
+            return _Base(self.identifier(GREEK[name]))
+        if name in GREEK_UPPER:
+            return _Base(self.identifier(GREEK_UPPER[name], upright=True))
+        if name in IDENTIFIERS:
+            return _Base(self.identifier(IDENTIFIERS[name]))
+        if name in DELIMITERS:
+            return _Base(_mo(DELIMITERS[name], False))
+        if name in OPERATORS:
+            return _Base(_mo(OPERATORS[name]))
+        if name in LARGE_OPERATORS:
+            return _Base(_mo(LARGE_OPERATORS[name]), limits=True)
+        if name in INTEGRALS:
+            return _Base(_mo(INTEGRALS[name]))
+        if name in FUNCTIONS:
+            return _Base(f'<mi>{name}</mi>', apply=True)
+        if name in LIMIT_FUNCTIONS:
+            return _Base(self.limit_operator(LIMIT_FUNCTIONS[name]), limits=True, apply=True)
+        if name in SPACES:
+            return _Base(f'<mspace width="{SPACES[name]}"/>')
+
+        if name in ('operatorname', 'operatorname*'):
+            text = self.text_argument().strip()
+            if name.endswith('*'):
+                return _Base(self.limit_operator(text), limits=True, apply=True)
+            variant = ' mathvariant="normal"' if len(text) == 1 else ''
+            return _Base(f'<mi{variant}>{_escape(text)}</mi>', apply=True)
+        if name in TEXT_COMMANDS:
+            return _Base(f'<mtext{TEXT_COMMANDS[name]}>{_escape(self.text_argument())}</mtext>')
+        if name in FONTS:
+            outer, self.font = self.font, FONTS[name]
+            try:
+                return _Base(self.argument())
+            finally:
+                self.font = outer
+
+        if name in ('frac', 'dfrac', 'tfrac', 'cfrac'):
+            fraction = f'<mfrac>{self.argument()}{self.argument()}</mfrac>'
+            if name in ('dfrac', 'cfrac'):
+                fraction = f'<mstyle displaystyle="true" scriptlevel="0">{fraction}</mstyle>'
+            elif name == 'tfrac':
+                fraction = f'<mstyle displaystyle="false" scriptlevel="0">{fraction}</mstyle>'
+            return _Base(fraction)
+        if name in ('binom', 'dbinom', 'tbinom'):
+            stack = f'<mfrac linethickness="0">{self.argument()}{self.argument()}</mfrac>'
+            return _Base(f'<mrow>{_fence("(")}{stack}{_fence(")")}</mrow>')
+        if name == 'sqrt':
+            if self.peek() == ('char', '['):
+                self.pos += 1
+                index = _row(self.row(close=']') or ['<mrow></mrow>'])
+                self.expect(('char', ']'))
+                return _Base(f'<mroot>{self.argument()}{index}</mroot>')
+            return _Base(f'<msqrt>{self.argument()}</msqrt>')
+        if name in ACCENTS:
+            char, stretchy, under = ACCENTS[name]
+            accent = _mo(char, stretchy)
+            if under:
+                return _Base(f'<munder accentunder="true">{self.argument()}{accent}</munder>')
+            return _Base(f'<mover accent="true">{self.argument()}{accent}</mover>')
+        if name in BRACES:
+            char, tag = BRACES[name]
+            return _Base(f'<{tag}>{self.argument()}{_mo(char, True)}</{tag}>', limits=True)
+        if name in ('overset', 'stackrel', 'underset'):
+            script, body = self.argument(), self.argument()
+            tag = 'munder' if name == 'underset' else 'mover'
+            return _Base(f'<{tag}>{body}{script}</{tag}>')
+
+        if name == 'left':
+            opening = self.delimiter()
+            inner = self.row()
+            self.expect(('cmd', 'right'))
+            closing = self.delimiter()
+            return _Base(f"<mrow>{_fence(opening)}{''.join(inner)}{_fence(closing)}</mrow>")
+        if name == 'middle':
+            return _Base(_mo(self.delimiter(), True, ' symmetric="true"'))
+        size = BIG_SIZES.get(name.rstrip('lrm'))
+        if size:
+            char = self.delimiter()
+            return _Base(_mo(char, True, f' symmetric="true" minsize="{size}" maxsize="{size}"'))
+
+        if name == 'not':
+            kind, value = self.next()
+            if value in NEGATIONS and kind in ('char', 'cmd'):
+                return _Base(_mo(NEGATIONS[value]))
+            raise TexError(f"cannot negate {_describe((kind, value))}")
+        if name == 'bmod':
+            return _Base(_mo('mod', None, ' lspace="0.2778em" rspace="0.2778em"'))
+        if name == 'pmod':
+            modulus = self.argument()
+            return _Base(f'<mrow><mspace width="1em"/>{_mo("(", False)}<mi>mod</mi>'
+                         f'<mspace width="0.3333em"/>{modulus}{_mo(")", False)}</mrow>')
+        if name == 'mod':
+            return _Base('<mrow><mspace width="1em"/><mi>mod</mi><mspace width="0.3333em"/></mrow>')
+        if name == 'begin':
+            return _Base(self.environment())
+        raise TexError(f"unsupported command \\{name}")
+
+    def limit_operator(self, text):
+        return f'<mo movablelimits="true" lspace="0" rspace="0">{_escape(text)}</mo>'
+
+    def environment(self):
+        """\\begin{name} … \\end{name} as an <mtable>, with fences for the matrix variants"""
+        name = self.text_argument()
+        if name == 'array':
+            spec = self.text_argument()
+            try:
+                aligns = [{'l': 'left', 'c': 'center', 'r': 'right'}[c] for c in spec if c not in '| ']
+            except KeyError:
+                raise TexError(f"unsupported array columns {spec!r}") from None
+            opening = closing = ''
+        elif name in ENVIRONMENTS:
+            aligns, opening, closing = ENVIRONMENTS[name]
+        else:
+            raise TexError(f"unsupported environment {name}")
+
+        rows = []
+        while True:
+            cells = [self.row()]
+            while self.peek() == ('char', '&'):
+                self.pos += 1
+                cells.append(self.row())
+            rows.append(cells)
+
+            token = self.next()
+            if token == ('sym', '\\'):
+                # Optional extra row spacing, e.g. \\[4pt]
+                if self.peek() == ('char', '['):
+                    while self.next() != ('char', ']'):
+                        pass
+                continue
+            if token == ('cmd', 'end'):
+                if self.text_argument() != name:
+                    raise TexError(f"\\begin{{{name}}} closed by a different \\end")
+                break
+            raise TexError(f"unexpected {_describe(token)} in {name}")
+
+        # A trailing \\ leaves an empty last row
+        if rows and rows[-1] == [[]]:
+            rows.pop()
+
+        markup = []
+        for cells in rows:
+            markup.append('<mtr>')
+            for column, cell in enumerate(cells):
+                align = aligns[column % len(aligns)]
+                style = ''
+                if name in ALIGNED:
+                    # Pairs of right/left columns meet at the relation, like TeX's align
+                    pad = '0' if align == 'left' or column == 0 else '1em'
+                    style = f' style="text-align:{align};padding-left:{pad};padding-right:0"'
+                elif align != 'center':
+                    style = f' style="text-align:{align}"'
+                markup.append(f"<mtd{style}>{_row(cell) if cell else ''}</mtd>")
+            markup.append('</mtr>')
+        display = ' displaystyle="true"' if name in ALIGNED else ''
+        table = f"<mtable{display}>{''.join(markup)}</mtable>"
+        if opening or closing:
+            return f'<mrow>{_fence(opening)}{table}{_fence(closing)}</mrow>'
+        return table
+
+
+def tex_to_mathml(tex, display=False):
+    """MathML for one TeX expression; raises TexError for anything unsupported"""
+    parser = _Parser(tex)
+    nodes = parser.row()
+    token = parser.peek()
+    if token[0] is not None:
+        raise TexError(f"unexpected {_describe(token)}")
+    body = _row(nodes) if nodes else '<mrow></mrow>'
+    block = ' display="block"' if display else ''
+    return (f'<math{block}><semantics>{body}'
+            f'<annotation encoding="application/x-tex">{_escape(tex.strip())}</annotation>'
+            f'</semantics></math>')
+
+
+class MathConverter:
+    """Replaces the TeX in slide HTML with MathML, caching each expression by content hash"""
+
+    def __init__(self, config, cache_dir=None, progress=print):
+        self.mode = config['build'].get('math', 'mathml')
+        if self.mode not in MODES:
+            raise ValueError(f"build.math must be one of {', '.join(MODES)}, not {self.mode!r}")
+        self.cache = TranscodeCache(cache_dir) if cache_dir is not None else None
+        self.log = progress
+        # (tex, display) -> MathML, or None when the expression is left for MathJax
+        self._converted = {}
+
+    def convert_html(self, content, slide=None):
+        """Slide HTML with its math as MathML; returns (html, converted, left for MathJax)"""
+        if self.mode != 'mathml':
+            return content, 0, 0
+
+        counts = [0, 0]
+        parts = []
+        last = 0
+        for skipped in SKIP_RE.finditer(content):
+            parts.append(self._convert_text(content[last:skipped.start()], slide, counts))
+            parts.append(skipped.group(0))
+            last = skipped.end()
+        parts.append(self._convert_text(content[last:], slide, counts))
+        return ''.join(parts), counts[0], counts[1]
+
+    def needs_runtime(self, slides_content):
+        """True when the deck has to load MathJax"""
+        return self.mode == 'mathjax' or any(slide.get('math_fallbacks') for slide in slides_content)
+
+    def expression(self, tex, display=False, slide=None):
+        """MathML for one expression, or None if it has to be left for MathJax"""
+        key = (tex, display)
+        if key not in self._converted:
+            try:
+                self._converted[key] = self._convert_cached(tex, display)
+            except TexError as error:
+                self._converted[key] = None
+                shown = ' '.join(tex.split())
+                shown = shown if len(shown) <= 40 else shown[:37] + '...'
+                self.log(f"   ⚠️ {slide or 'Slide'}: {shown} left for MathJax ({error})")
+        return self._converted[key]
+
+    def _convert_cached(self, tex, display):
+        if self.cache is None:
+            return tex_to_mathml(tex, display)
+        key = self.cache.key(tex.encode('utf-8'), display=display, version=CONVERTER_VERSION)
+        data, _ = self.cache.get_or_create(
+            key, lambda: tex_to_mathml(tex, display).encode('utf-8'), suffix='.mml')
+        return data.decode('utf-8')
+
+    def _convert_text(self, text, slide, counts):
+        if '$' not in text and '\\' not in text:
+            return text
+
+        def replace(match):
+            source = html.unescape(match.group(match.lastgroup))
+            mathml = self.expression(source, match.lastgroup in DISPLAY_GROUPS, slide)
+            if mathml is None:
+                counts[1] += 1
+                return match.group(0)
+            counts[0] += 1
+            return mathml
+
+        parts = []
+        last = 0
+        for match in MATH_RE.finditer(text):
+            # \$ is a literal dollar; the span keeps MathJax from pairing it if it loads
+            parts.append(text[last:match.start()].replace('\\$', '<span>$</span>'))
+            parts.append(replace(match))
+            last = match.end()
+        parts.append(text[last:].replace('\\$', '<span>$</span>'))
+        return ''.join(parts)
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Tile Pack for Presentation Build System
+Packs map tiles from a local MBTiles file or z/x/y directory as WebP for offline Leaflet layers
+"""
+
+import io
+import os
+import json
+import math
+import sqlite3
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+
+# Web Mercator stops here; latitudes beyond it have no tiles
+MAX_LATITUDE = 85.0511287798
+
+# Suffixes looked up in a z/x/y directory, in order
+TILE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.webp')
+
+# Where the bundle keeps the tiles, relative to presentation_bundle/index.html
+TILE_URL = "tiles/{z}/{x}/{y}.webp"
+
+# Every tile ends up in the single file, so a pack this large is almost certainly a mistake
+DEFAULT_MAX_TILES = 4096
+
+
+class TilePackError(ValueError):
+    """Raised for a tile source the build cannot read or a pack that is too large"""
+
+
+def tile_x(lon, zoom):
+    """Tile column containing a longitude"""
+    n = 1 << zoom
+    return min(n - 1, max(0, int((lon + 180.0) / 360.0 * n)))
+
+
+def tile_y(lat, zoom):
+    """Tile row (XYZ, north at 0) containing a latitude"""
+    n = 1 << zoom
+    lat = math.radians(max(-MAX_LATITUDE, min(MAX_LATITUDE, lat)))
+    return min(n - 1, max(0, int((1 - math.asinh(math.tan(lat)) / math.pi) / 2 * n)))
+
+
+def tile_ranges(bounds, zoom):
+    """(column ranges, row range) covering [west, south, east, north] at a zoom
+
+    A box with west > east crosses the antimeridian, e.g. [150, -50, -150, 30] for the
+    Pacific, and covers two runs of columns.
+    """
+    west, south, east, north = bounds
+    rows = range(tile_y(north, zoom), tile_y(south, zoom) + 1)
+    first, last = tile_x(west, zoom), tile_x(east, zoom)
+    if west <= east:
+        return [range(first, last + 1)], rows
+    if first <= last + 1:
+        # At low zooms the two runs meet, i.e. the box spans every column
+        return [range(0, 1 << zoom)], rows
+    return [range(first, 1 << zoom), range(0, last + 1)], rows
+
+
+def tile_count(bounds, zooms):
+    """Tiles in a bounding box over an inclusive (first, last) zoom range"""
+    count = 0
+    for zoom in range(zooms[0], zooms[1] + 1):
+        column_runs, rows = tile_ranges(bounds, zoom)
+        count += sum(len(columns) for columns in column_runs) * len(rows)
+    return count
+
+
+class MBTilesSource:
+    """Tiles from an MBTiles (SQLite) file; rows are stored TMS-style, south at 0"""
+
+    def __init__(self, path):
+        try:
+            self.db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            self.metadata = dict(self.db.execute("SELECT name, value FROM metadata"))
+        except sqlite3.Error as e:
+            raise TilePackError(f"Could not read MBTiles {path}: {e}") from e
+
+    def tiles(self, zoom, columns, rows):
+        """(x, y, bytes) for the tiles present in a block, with XYZ rows"""
+        flip = (1 << zoom) - 1
+        query = ("SELECT tile_column, tile_row, tile_data FROM tiles WHERE zoom_level = ? "
+                 "AND tile_column BETWEEN ? AND ? AND tile_row BETWEEN ? AND ?")
+        for x, tms_row, data in self.db.execute(query, (zoom, columns[0], columns[-1],
+                                                        flip - rows[-1], flip - rows[0])):
+            yield x, flip - tms_row, bytes(data)
+
+    def close(self):
+        self.db.close()
+
+
+class DirectorySource:
+    """Tiles from a {z}/{x}/{y}.png directory tree, with optional metadata.json"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        metadata = self.path / "metadata.json"
+        self.metadata = json.loads(metadata.read_text()) if metadata.is_file() else {}
+
+    def tiles(self, zoom, columns, rows):
+        for x in columns:
+            column = self.path / str(zoom) / str(x)
+            if not column.is_dir():
+                continue
+            for y in rows:
+                for suffix in TILE_SUFFIXES:
+                    tile = column / f"{y}{suffix}"
+                    if tile.is_file():
+                        yield x, y, tile.read_bytes()
+                        break
+
+    def close(self):
+        pass
+
+
+def open_source(path):
+    """MBTilesSource or DirectorySource for a path"""
+    path = Path(path)
+    if path.is_dir():
+        return DirectorySource(path)
+    if path.is_file():
+        return MBTilesSource(path)
+    raise TilePackError(f"Tile source {path} not found")
+
+
+class TilePack:
+    """WebP tiles keyed by (z, x, y), in the order they were packed"""
+
+    def __init__(self, keys, tiles, bounds, zooms, attribution=None):
+        self.keys = keys
+        self.tiles = tiles
+        self.bounds = bounds
+        self.zooms = zooms
+        self.attribution = attribution
+
+    @property
+    def size(self):
+        return sum(len(tile) for tile in self.tiles)
+
+    def index(self):
+        """Index for window.TILE_PACK: "z/x/y" names in pack order"""
+        index = {
+            'format': 'webp',
+            'minZoom': self.zooms[0],
+            'maxZoom': self.zooms[1],
+            'bounds': list(self.bounds),
+            'tiles': [f"{z}/{x}/{y}" for z, x, y in self.keys],
+        }
+        if self.attribution:
+            index['attribution'] = self.attribution
+        return index
+
+    def blob(self):
+        """(all tiles concatenated, offsets) - tile i is blob[offsets[i]:offsets[i + 1]]"""
+        offsets = [0]
+        for tile in self.tiles:
+            offsets.append(offsets[-1] + len(tile))
+        return b''.join(self.tiles), offsets
+
+    def files(self):
+        """(relative path, bytes) of each tile as laid out under TILE_URL"""
+        for (z, x, y), tile in zip(self.keys, self.tiles):
+            yield TILE_URL.format(z=z, x=x, y=y), tile
+
+
+class TilePacker:
+    """Reads build.tile_pack's source once per build and transcodes its tiles to WebP"""
+
+    def __init__(self, config, root=Path("."), transcode_cache=None, progress=print):
+        build_config = config.get('build', {})
+        self.pack_config = build_config.get('tile_pack')
+        self.quality = (self.pack_config or {}).get('quality', build_config.get('webp_quality', 90))
+        self.root = Path(root)
+        self.transcode_cache = transcode_cache
+        self.workers = min(8, os.cpu_count() or 1)
+        self.log = progress
+        self._pack = None
+
+    def pack(self):
+        """The deck's TilePack, or None when build.tile_pack is not set or its source is missing"""
+        if not self.pack_config:
+            return None
+        if self._pack is None:
+            self._pack = self._build()
+        return self._pack or None
+
+    def _build(self):
+        source_path = self.root / self.pack_config['source']
+        if not source_path.exists():
+            self.log(f"   ⚠️  Tile source {source_path} not found - the GIS demo streams OpenStreetMap tiles")
+            return False
+
+        bounds = tuple(self.pack_config.get('bounds') or (-180, -MAX_LATITUDE, 180, MAX_LATITUDE))
+        zooms = tuple(self.pack_config.get('zoom') or (0, 3))
+        max_tiles = self.pack_config.get('max_tiles', DEFAULT_MAX_TILES)
+
+        wanted = tile_count(bounds, zooms)
+        if wanted > max_tiles:
+            raise TilePackError(f"Tile pack would hold up to {wanted} tiles (max_tiles is {max_tiles}); "
+                                f"shrink build.tile_pack bounds or zoom")
+
+        source = open_source(source_path)
+        try:
+            found = []
+            for zoom in range(zooms[0], zooms[1] + 1):
+                column_runs, rows = tile_ranges(bounds, zoom)
+                for columns in column_runs:
+                    found.extend(((zoom, x, y), data) for x, y, data in source.tiles(zoom, columns, rows))
+            attribution = self.pack_config.get('attribution', source.metadata.get('attribution'))
+        finally:
+            source.close()
+
+        # Pillow releases the GIL while encoding, so threads transcode in parallel
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            results = list(pool.map(lambda item: self._transcode(item[1]), found))
+
+        keys = [key for key, _ in found]
+        tiles = [tile for tile, _ in results]
+        cached = sum(1 for _, hit in results if hit)
+        pack = TilePack(keys, tiles, bounds, zooms, attribution)
+        self.log(f"   🗺️  Packed {len(keys)} of {wanted} map tiles (z{zooms[0]}-{zooms[1]}) from "
+                 f"{self.pack_config['source']} as WebP, {pack.size:,} bytes ({cached} cached)")
+        return pack
+
+    def _transcode(self, data):
+        """(WebP bytes, cache hit) for one tile"""
+        if self.transcode_cache is None:
+            return self._to_webp(data), False
+        key = self.transcode_cache.key(data, tile_webp_quality=self.quality)
+        return self.transcode_cache.get_or_create(key, lambda: self._to_webp(data))
+
+    def _to_webp(self, data):
+        with Image.open(io.BytesIO(data)) as img:
+            # Keep alpha only for tiles that have it, e.g. transparent overlay layers
+            has_alpha = img.mode in ('RGBA', 'LA') or 'transparency' in img.info
+            out = io.BytesIO()
+            img.convert('RGBA' if has_alpha else 'RGB').save(out, 'WEBP', quality=self.quality, method=6)
+            return out.getvalue()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Transcode Cache for Presentation Build System
+Content-addressed cache of converted images, shared by every deck, process or thread
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+
+
+def _cache_key(data, settings):
+    """Hash the source bytes together with the settings that affect the output"""
+    h = hashlib.sha256(data)
+    h.update(json.dumps(settings, sort_keys=True).encode('utf-8'))
+    return h.hexdigest()
+
+
+class TranscodeCache:
+    """On-disk cache that stores each transcoded image once, safe across processes"""
+
+    # A lock older than this is assumed to belong to a crashed worker
+    STALE_LOCK_SECONDS = 300
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, data, **settings):
+        return _cache_key(data, settings)
+
+    def get_or_create(self, key, produce, suffix='.webp'):
+        """Return (bytes, hit), calling produce() to create the entry if it is missing
+
+        When several processes ask for the same key at once, one of them encodes
+        while the others wait for its result.
+        """
+        entry = self.cache_dir / key[:2] / (key + suffix)
+        if entry.exists():
+            self.hits += 1
+            return entry.read_bytes(), True
+
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        lock = entry.with_name(entry.name + '.lock')
+        while not entry.exists():
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                self._wait_for(entry, lock)
+                continue
+
+            os.close(fd)
+            try:
+                data = produce()
+                tmp = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+                tmp.write_bytes(data)
+                os.replace(tmp, entry)
+            finally:
+                lock.unlink(missing_ok=True)
+            self.misses += 1
+            return data, False
+
+        self.hits += 1
+        return entry.read_bytes(), True
+
+    def _wait_for(self, entry, lock):
+        """Block while another process holds the lock for this entry"""
+        while lock.exists() and not entry.exists():
+            try:
+                if time.time() - lock.stat().st_mtime > self.STALE_LOCK_SECONDS:
+                    lock.unlink(missing_ok=True)
+                    return
+            except FileNotFoundError:
+                return
+            time.sleep(0.05)
+
+
+class MemoryTranscodeCache:
+    """In-memory LRU cache with the same interface, safe to share between threads"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def key(self, data, **settings):
+        return _cache_key(data, settings)
+
+    def get_or_create(self, key, produce, suffix='.webp'):
+        """Return (bytes, hit); concurrent requests for one key encode it only once"""
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return self.entries[key], True
+
+            data = produce()
+
+            with self._lock:
+                self.entries[key] = data
+                self.misses += 1
+                while len(self.entries) > self.max_entries:
+                    evicted, _ = self.entries.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+                return data, False
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Timezone Tables for Presentation Build System
+UTC-offset transition tables from zoneinfo, embedded in decks and used for batch conversion
+"""
+
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, available_timezones
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Years covered by the tables; outside them js/timezones.js falls back to Intl
+DEFAULT_YEARS = (1970, 2050)
+
+# Status of each local time resolved by local_to_utc()
+VALID, FOLD, GAP = 0, 1, 2
+
+# Offsets are sampled once a day and each change is then bisected to the second
+SCAN_STEP = 86400
+
+# Area/Location names as written in slide markup and scripts, e.g. "Australia/Sydney"
+ZONE_NAME_RE = re.compile(
+    r'\b(?:Africa|America|Antarctica|Asia|Atlantic|Australia|Europe|Indian|Pacific|Etc)'
+    r'/[A-Za-z0-9_+\-]+(?:/[A-Za-z_]+)?')
+
+
+@lru_cache(maxsize=None)
+def _known_zones():
+    return frozenset(available_timezones())
+
+
+def zones_in(text):
+    """Sorted IANA zone names mentioned in a chunk of HTML or JavaScript"""
+    return sorted(set(ZONE_NAME_RE.findall(text)) & _known_zones())
+
+
+def _offset(zone, seconds):
+    return int(datetime.fromtimestamp(seconds, zone).utcoffset().total_seconds())
+
+
+def _year_start(year):
+    return int(datetime(year, 1, 1, tzinfo=timezone.utc).timestamp())
+
+
+def extract_transitions(name, years=DEFAULT_YEARS):
+    """(transitions, offsets) for a zone from zoneinfo, offline
+
+    transitions are the UTC seconds where the offset changes; offsets has one more entry,
+    the offset in seconds before, between and after them.
+    """
+    zone = ZoneInfo(name)
+    start, end = _year_start(years[0]), _year_start(years[1] + 1)
+    transitions = []
+    offsets = [_offset(zone, start)]
+
+    t = start
+    while t < end:
+        step_end = min(t + SCAN_STEP, end)
+        if _offset(zone, step_end) == offsets[-1]:
+            t = step_end
+            continue
+        # The offset at low is still the current one, at high it has changed
+        low, high = t, step_end
+        while high - low > 1:
+            mid = (low + high) // 2
+            if _offset(zone, mid) == offsets[-1]:
+                low = mid
+            else:
+                high = mid
+        transitions.append(high)
+        offsets.append(_offset(zone, high))
+        t = high
+    return transitions, offsets
+
+
+class ZoneTable:
+    """Sorted UTC-offset transitions for one zone, with vectorized offset lookups
+
+    transitions[i] is the UTC second where offsets[i] gives way to offsets[i + 1]. Every
+    lookup is a binary search (np.searchsorted), so resolving n timestamps is O(n log t)
+    with no per-element Python or zoneinfo calls.
+    """
+
+    __slots__ = ('name', 'transitions', 'offsets', 'start', 'end')
+
+    def __init__(self, name, transitions, offsets, start, end):
+        self.name = name
+        self.transitions = np.asarray(transitions, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int32)
+        self.start, self.end = start, end
+
+    @classmethod
+    def from_zoneinfo(cls, name, years=DEFAULT_YEARS):
+        transitions, offsets = extract_transitions(name, years)
+        return cls(name, transitions, offsets, _year_start(years[0]), _year_start(years[1] + 1))
+
+    def offset_at(self, utc):
+        """UTC offset in seconds at UTC instants given in epoch seconds"""
+        utc = np.floor(np.asarray(utc, dtype=np.float64)).astype(np.int64)
+        return self.offsets[np.searchsorted(self.transitions, utc, side='right')]
+
+    def local_offset(self, local, fold=0):
+        """(offset, status) for local wall-clock times given as seconds since the local epoch
+
+        A local time in a fold (the repeated hour when clocks go back) gets the offset of
+        the earlier instant, or of the later one with fold=1, as datetime's fold attribute.
+        A local time in a gap (skipped when clocks go forward) gets the offset from before
+        the transition, which moves it forward by the length of the gap (fold=1 moves it
+        back instead). Both match datetime's PEP 495 semantics.
+        Assumes transitions are more than a day apart, as in every zone since 1970.
+        """
+        local = np.floor(np.asarray(local, dtype=np.float64)).astype(np.int64)
+        before = self.offset_at(local - SCAN_STEP)
+        after = self.offset_at(local + SCAN_STEP)
+        early_ok = self.offset_at(local - before) == before
+        late_ok = self.offset_at(local - after) == after
+
+        ambiguous = early_ok & late_ok & (before != after)
+        skipped = ~(early_ok | late_ok)
+        use_late = (late_ok & ~early_ok) | ((ambiguous | skipped) & bool(fold))
+        offset = np.where(use_late, after, before)
+        status = np.where(ambiguous, FOLD, np.where(skipped, GAP, VALID))
+        return offset, status
+
+    def buffers(self):
+        """Typed arrays embedded in the deck as window.DEMO_BUFFERS['tz:<zone>']"""
+        return {
+            'transitions': self.transitions.astype(np.float64),
+            'offsets': self.offsets,
+            'range': np.array([self.start, self.end], dtype=np.float64),
+        }
+
+
+@lru_cache(maxsize=None)
+def zone_table(name, years=DEFAULT_YEARS):
+    """Cached ZoneTable for a zone over the given (first, last) years"""
+    return ZoneTable.from_zoneinfo(name, tuple(years))
+
+
+def deck_tables(zones, years=DEFAULT_YEARS):
+    """Buffers for pack_buffers(), keyed as window.DEMO_BUFFERS['tz:<zone>']"""
+    return {f"tz:{name}": zone_table(name, tuple(years)).buffers() for name in zones}
+
+
+def _split(timestamps):
+    """(values, epoch seconds, to_delta): datetime64 keeps its unit, numbers are seconds"""
+    values = np.asarray(timestamps)
+    if np.issubdtype(values.dtype, np.datetime64):
+        seconds = values.astype('datetime64[s]').astype(np.int64)
+        return values, seconds, lambda offset: offset.astype('timedelta64[s]')
+    values = values.astype(np.float64) if not np.issubdtype(values.dtype, np.number) else values
+    return values, values, lambda offset: offset
+
+
+def utc_to_local(timestamps, zone, years=DEFAULT_YEARS):
+    """Local wall-clock times for UTC timestamps (datetime64 arrays or epoch seconds)"""
+    values, seconds, to_delta = _split(timestamps)
+    return values + to_delta(zone_table(zone, tuple(years)).offset_at(seconds))
+
+
+def local_to_utc(timestamps, zone, fold=0, years=DEFAULT_YEARS):
+    """(UTC timestamps, status) for local wall-clock times; status is VALID, FOLD or GAP"""
+    values, seconds, to_delta = _split(timestamps)
+    offset, status = zone_table(zone, tuple(years)).local_offset(seconds, fold)
+    return values - to_delta(offset), status
+
+
+def convert(timestamps, from_zone, to_zone, fold=0, years=DEFAULT_YEARS):
+    """Wall-clock times in from_zone as wall-clock times in to_zone
+
+    E.g. departure times on Sydney clocks as San Francisco clock times, for a whole
+    flight log at once. Returns (converted, status of each source time).
+    """
+    utc, status = local_to_utc(timestamps, from_zone, fold, years)
+    return utc_to_local(utc, to_zone, years), status